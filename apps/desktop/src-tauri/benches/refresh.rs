@@ -0,0 +1,196 @@
+//! Refresh-path benchmarks over synthetic project trees.
+//!
+//! Run with `cargo bench --features bench`. Save a baseline before a change
+//! with `-- --save-baseline main` and compare against it afterwards with
+//! `-- --baseline main`; criterion reports any regression per benchmark.
+
+mod support;
+
+use criterion::{criterion_group, criterion_main, BenchmarkId, Criterion, Throughput};
+use organizeme_lib::bench_support::{
+    determine_project_status, enrich_projects_with_git_info, get_git_status_sync, scan_directory,
+    summarize, GitInfoData, Project, ScanOptions, StatusMode,
+};
+use support::{isolate_home, Workspace, WorkspaceSpec};
+use tokio::runtime::Runtime;
+
+/// Repository counts each workspace-sized benchmark runs at.
+const SIZES: &[usize] = &[25, 100];
+
+fn runtime() -> Runtime {
+    tokio::runtime::Builder::new_multi_thread()
+        .enable_all()
+        .build()
+        .expect("failed to build runtime")
+}
+
+fn workspace(repos: usize) -> Workspace {
+    Workspace::generate(&WorkspaceSpec {
+        repos,
+        plain_dirs: repos / 5,
+        ..WorkspaceSpec::default()
+    })
+}
+
+fn bench_scan_directory(c: &mut Criterion) {
+    isolate_home();
+    let rt = runtime();
+    let mut group = c.benchmark_group("scan_directory");
+
+    for &repos in SIZES {
+        let workspace = workspace(repos);
+        group.bench_with_input(BenchmarkId::from_parameter(repos), &workspace, |b, ws| {
+            b.iter(|| rt.block_on(scan_directory(ws.root(), &ScanOptions::default())))
+        });
+    }
+    group.finish();
+}
+
+fn bench_git_status(c: &mut Criterion) {
+    isolate_home();
+    let mut group = c.benchmark_group("get_git_status_sync");
+
+    for commits in [1, 100] {
+        let workspace = Workspace::generate(&WorkspaceSpec {
+            repos: 1,
+            commits,
+            files: 200,
+            dirty_fraction: 1.0,
+            plain_dirs: 0,
+        });
+        let repo = workspace.project_paths().remove(0);
+
+        let modes = [
+            ("full", StatusMode::Full),
+            (
+                "quick",
+                StatusMode::Quick {
+                    include_untracked: true,
+                },
+            ),
+        ];
+        for (name, mode) in modes {
+            group.bench_with_input(BenchmarkId::new(name, commits), &repo, |b, repo| {
+                b.iter(|| get_git_status_sync(repo, mode))
+            });
+        }
+    }
+    group.finish();
+}
+
+fn bench_enrich(c: &mut Criterion) {
+    isolate_home();
+    let rt = runtime();
+    let mut group = c.benchmark_group("enrich_projects_with_git_info");
+    group.sample_size(10);
+
+    for &repos in SIZES {
+        let workspace = workspace(repos);
+        let projects = rt
+            .block_on(scan_directory(workspace.root(), &ScanOptions::default()))
+            .expect("failed to scan workspace");
+
+        for (name, use_cache) in [("cold", false), ("cached", true)] {
+            group.bench_with_input(BenchmarkId::new(name, repos), &projects, |b, projects| {
+                b.iter(|| {
+                    let mut projects = projects.clone();
+                    rt.block_on(enrich_projects_with_git_info(&mut projects, use_cache));
+                    projects
+                })
+            });
+        }
+    }
+    group.finish();
+}
+
+fn bench_determine_status(c: &mut Criterion) {
+    let now = chrono::Utc::now();
+    let recent = (now - chrono::Duration::days(2)).to_rfc3339();
+    let old = (now - chrono::Duration::days(120)).to_rfc3339();
+    let git_info = |is_dirty: bool| GitInfoData {
+        branch: "main".to_string(),
+        is_dirty,
+        uncommitted_changes: if is_dirty { 3 } else { 0 },
+        ahead_by: 0,
+        behind_by: 0,
+        last_commit_date: Some(recent.clone()),
+        last_commit_message: Some("Commit".to_string()),
+        partial: false,
+    };
+    let clean = git_info(false);
+    let dirty = git_info(true);
+
+    let mut group = c.benchmark_group("determine_project_status");
+    group.bench_function("no_git", |b| {
+        b.iter(|| determine_project_status(None, &old))
+    });
+    group.bench_function("clean", |b| {
+        b.iter(|| determine_project_status(Some(&clean), &recent))
+    });
+    group.bench_function("dirty", |b| {
+        b.iter(|| determine_project_status(Some(&dirty), &old))
+    });
+    group.finish();
+}
+
+/// Projects in the IPC payload benchmarks, a large portfolio.
+const IPC_PROJECTS: usize = 10_000;
+
+/// Builds scanned-looking projects without touching the filesystem.
+fn synthetic_projects(count: usize) -> Vec<Project> {
+    let modified = chrono::Utc::now().to_rfc3339();
+    let statuses = ["active", "stale", "clean", "dirty"];
+    let branches = ["main", "develop", "feature/ipc"];
+
+    (0..count)
+        .map(|i| Project {
+            id: format!("group-{}-project-{}", i % 50, i),
+            name: format!("project-{}", i),
+            path: format!("/home/user/Projects/group-{}/project-{}", i % 50, i),
+            description: (i % 3 == 0).then(|| format!("Synthetic project number {}", i)),
+            status: statuses[i % statuses.len()].to_string(),
+            last_modified: modified.clone(),
+            git_info: (i % 5 != 0).then(|| GitInfoData {
+                branch: branches[i % branches.len()].to_string(),
+                is_dirty: i % 4 == 3,
+                uncommitted_changes: if i % 4 == 3 { i % 17 + 1 } else { 0 },
+                ahead_by: i % 3,
+                behind_by: 0,
+                last_commit_date: Some(modified.clone()),
+                last_commit_message: Some("Commit".to_string()),
+                partial: false,
+            }),
+            has_package_json: i % 2 == 0,
+            has_readme: i % 3 != 1,
+            readme_content: None,
+            git_remote_url: None,
+            tags: (i % 4 == 0).then(|| vec!["work".to_string(), "client".to_string()]),
+        })
+        .collect()
+}
+
+/// Encodes the dashboard payloads the way the IPC commands send them: the
+/// compact summary list against the full project list.
+fn bench_ipc_encode(c: &mut Criterion) {
+    let projects = synthetic_projects(IPC_PROJECTS);
+    let roots = vec!["/home/user/Projects".to_string()];
+    let summaries = summarize(&projects, &roots, None);
+
+    let mut group = c.benchmark_group("ipc_encode");
+    group.throughput(Throughput::Elements(IPC_PROJECTS as u64));
+    group.bench_function("summaries", |b| {
+        b.iter(|| serde_json::to_string(&summaries))
+    });
+    group.bench_function("projects", |b| b.iter(|| serde_json::to_string(&projects)));
+    group.finish();
+}
+
+criterion_group!(
+    benches,
+    bench_scan_directory,
+    bench_git_status,
+    bench_enrich,
+    bench_determine_status,
+    bench_ipc_encode
+);
+criterion_main!(benches);
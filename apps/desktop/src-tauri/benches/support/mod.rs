@@ -0,0 +1,161 @@
+//! Synthetic project trees for the benches.
+
+use git2::{IndexAddOption, Repository, Signature};
+use std::fs;
+use std::path::{Path, PathBuf};
+use std::sync::Once;
+use tempfile::TempDir;
+
+/// Shape of a generated projects root.
+#[derive(Debug, Clone)]
+pub struct WorkspaceSpec {
+    /// Git repositories to create.
+    pub repos: usize,
+    /// Commits in each repository's history.
+    pub commits: usize,
+    /// Tracked files in each repository.
+    pub files: usize,
+    /// Share of repositories left with uncommitted changes, from 0.0 to 1.0.
+    pub dirty_fraction: f64,
+    /// Project folders without a git repository.
+    pub plain_dirs: usize,
+}
+
+impl Default for WorkspaceSpec {
+    fn default() -> Self {
+        Self {
+            repos: 50,
+            commits: 10,
+            files: 20,
+            dirty_fraction: 0.2,
+            plain_dirs: 10,
+        }
+    }
+}
+
+/// A generated projects root, deleted when dropped.
+pub struct Workspace {
+    dir: TempDir,
+}
+
+impl Workspace {
+    /// Builds a projects root matching `spec`.
+    pub fn generate(spec: &WorkspaceSpec) -> Self {
+        let dir = tempfile::Builder::new()
+            .prefix("organizeme-bench-")
+            .tempdir()
+            .expect("failed to create workspace directory");
+
+        let dirty = (spec.repos as f64 * spec.dirty_fraction).round() as usize;
+        for i in 0..spec.repos {
+            create_repo(&dir.path().join(format!("repo-{:04}", i)), spec, i < dirty);
+        }
+        for i in 0..spec.plain_dirs {
+            let path = dir.path().join(format!("plain-{:04}", i));
+            write_project_files(&path, i, spec.files);
+        }
+
+        Self { dir }
+    }
+
+    /// Path of the projects root.
+    pub fn root(&self) -> &str {
+        self.dir
+            .path()
+            .to_str()
+            .expect("temp dir path is not UTF-8")
+    }
+
+    /// Paths of every project folder in the root.
+    pub fn project_paths(&self) -> Vec<String> {
+        let mut paths: Vec<String> = fs::read_dir(self.dir.path())
+            .expect("failed to list workspace")
+            .filter_map(|entry| entry.ok())
+            .map(|entry| entry.path().to_string_lossy().to_string())
+            .collect();
+        paths.sort();
+        paths
+    }
+}
+
+/// Points the config directory at a throwaway home so benches never read
+/// or write the real ~/.organizeme.
+pub fn isolate_home() {
+    static ISOLATE: Once = Once::new();
+    ISOLATE.call_once(|| {
+        let home: PathBuf = tempfile::Builder::new()
+            .prefix("organizeme-bench-home-")
+            .tempdir()
+            .expect("failed to create bench home")
+            .keep();
+        std::env::set_var("HOME", home);
+    });
+}
+
+fn write_project_files(path: &Path, seed: usize, files: usize) {
+    fs::create_dir_all(path.join("src")).expect("failed to create project");
+    fs::write(
+        path.join("package.json"),
+        format!(
+            r#"{{"name": "bench-project-{}", "description": "Synthetic project {}"}}"#,
+            seed, seed
+        ),
+    )
+    .expect("failed to write package.json");
+    fs::write(path.join("README.md"), format!("# Project {}\n", seed))
+        .expect("failed to write README");
+    for file in 0..files {
+        fs::write(
+            path.join("src").join(format!("file-{:03}.txt", file)),
+            format!("file {} of project {}\n", file, seed),
+        )
+        .expect("failed to write source file");
+    }
+}
+
+fn commit_all(repo: &Repository, message: &str) {
+    let mut index = repo.index().expect("failed to open index");
+    index
+        .add_all(["*"].iter(), IndexAddOption::DEFAULT, None)
+        .expect("failed to stage files");
+    index.write().expect("failed to write index");
+
+    let tree = repo
+        .find_tree(index.write_tree().expect("failed to write tree"))
+        .expect("failed to find tree");
+    let signature = Signature::now("Bench", "bench@example.com").expect("invalid signature");
+    let parent = repo.head().ok().and_then(|head| head.peel_to_commit().ok());
+    let parents: Vec<_> = parent.iter().collect();
+
+    repo.commit(
+        Some("HEAD"),
+        &signature,
+        &signature,
+        message,
+        &tree,
+        &parents,
+    )
+    .expect("failed to commit");
+}
+
+fn create_repo(path: &Path, spec: &WorkspaceSpec, dirty: bool) {
+    write_project_files(path, 0, spec.files);
+    let repo = Repository::init(path).expect("failed to init repository");
+    commit_all(&repo, "Initial commit");
+
+    // Each later commit rewrites one file so history depth costs real objects
+    for commit in 1..spec.commits {
+        let file = commit % spec.files.max(1);
+        fs::write(
+            path.join("src").join(format!("file-{:03}.txt", file)),
+            format!("revision {}\n", commit),
+        )
+        .expect("failed to update file");
+        commit_all(&repo, &format!("Commit {}", commit));
+    }
+
+    if dirty {
+        fs::write(path.join("README.md"), "# Uncommitted edit\n").expect("failed to dirty repo");
+        fs::write(path.join("untracked.txt"), "new\n").expect("failed to add untracked file");
+    }
+}
@@ -0,0 +1,441 @@
+use crate::config;
+use crate::diagnostics::{self, Counter};
+use crate::scanner::IGNORED_DIRECTORIES;
+use anyhow::Result;
+use ignore::gitignore::Gitignore;
+use serde::{Deserialize, Serialize};
+use std::collections::HashMap;
+use std::path::{Path, PathBuf};
+use std::sync::atomic::{AtomicBool, AtomicI64, Ordering};
+use std::sync::{Arc, Condvar, Mutex, MutexGuard, OnceLock};
+use std::time::{Duration, Instant};
+use tokio::fs;
+
+/// Bumped whenever the cache layout changes.
+const ACTIVITY_CACHE_VERSION: u32 = 1;
+
+/// Deepest folder level below a project that is walked.
+const MAX_DEPTH: usize = 12;
+
+/// Most folders walked per project, so one huge tree cannot stall a scan.
+const MAX_DIRS: usize = 5000;
+
+/// Most threads walking one project.
+const MAX_WALK_THREADS: usize = 4;
+
+/// How long a folder's cached listing is trusted while its mtime is unchanged.
+///
+/// Editing a file in place leaves its folder's mtime alone, so cached
+/// folders are listed again after this long regardless.
+const RELIST_AFTER_MS: i64 = 6 * 60 * 60 * 1000;
+
+/// A walk this recent is reused as-is, e.g. when a scan stamps and then probes a project.
+const REUSE_WALK: Duration = Duration::from_secs(5);
+
+/// How long changes are held before the cache is written, so the walks of a
+/// scan or a burst of watcher batches coalesce into a single write.
+const SAVE_DELAY: Duration = Duration::from_secs(2);
+
+/// What a folder held when it was last listed.
+#[derive(Debug, Clone, PartialEq, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+struct DirActivity {
+    mtime_ms: i64,
+    /// Newest mtime among the folder's own files.
+    newest_file_ms: i64,
+    /// Subfolders to descend into, after ignore rules.
+    subdirs: Vec<String>,
+    has_gitignore: bool,
+    listed_at_ms: i64,
+}
+
+#[derive(Debug, Default, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+struct ProjectActivity {
+    /// Folders keyed by path relative to the project; "" is the project itself.
+    dirs: HashMap<String, DirActivity>,
+    last_activity_ms: Option<i64>,
+    #[serde(skip)]
+    walked_at: Option<Instant>,
+}
+
+/// Activity cache persisted to ~/.organizeme/activity-cache.json.
+#[derive(Debug, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+struct ActivityCache {
+    version: u32,
+    /// Keyed by absolute project path.
+    projects: HashMap<String, ProjectActivity>,
+    /// Whether anything changed since the cache was last written.
+    #[serde(skip)]
+    dirty: bool,
+}
+
+static ACTIVITY_CACHE: OnceLock<Mutex<ActivityCache>> = OnceLock::new();
+
+static SAVE_SCHEDULED: AtomicBool = AtomicBool::new(false);
+
+/// Serializes file writes so a newer snapshot is never overwritten by an older one.
+static SAVE_LOCK: OnceLock<tokio::sync::Mutex<()>> = OnceLock::new();
+
+/// Returns the path to the activity cache file.
+fn get_activity_cache_file() -> PathBuf {
+    config::get_config_dir().join("activity-cache.json")
+}
+
+/// Locks the process-wide activity cache, loading it from disk on first use.
+fn activity_cache() -> MutexGuard<'static, ActivityCache> {
+    ACTIVITY_CACHE
+        .get_or_init(|| {
+            let cache = std::fs::read_to_string(get_activity_cache_file())
+                .ok()
+                .and_then(|content| serde_json::from_str::<ActivityCache>(&content).ok())
+                .filter(|cache| cache.version == ACTIVITY_CACHE_VERSION)
+                .unwrap_or_else(|| ActivityCache {
+                    version: ACTIVITY_CACHE_VERSION,
+                    projects: HashMap::new(),
+                    dirty: false,
+                });
+            Mutex::new(cache)
+        })
+        .lock()
+        .unwrap_or_else(|e| e.into_inner())
+}
+
+/// Writes the activity cache to a temporary file and renames it into place,
+/// unless nothing changed since the last write.
+pub async fn save_cache() -> Result<()> {
+    let _save = SAVE_LOCK
+        .get_or_init(|| tokio::sync::Mutex::new(()))
+        .lock()
+        .await;
+    let content = {
+        let mut cache = activity_cache();
+        if !cache.dirty {
+            return Ok(());
+        }
+        cache.dirty = false;
+        serde_json::to_vec(&*cache)?
+    };
+    let cache_file = get_activity_cache_file();
+    fs::create_dir_all(config::get_config_dir()).await?;
+
+    let tmp_file = cache_file.with_extension("json.tmp");
+    fs::write(&tmp_file, content).await?;
+    fs::rename(&tmp_file, &cache_file).await?;
+    Ok(())
+}
+
+/// Schedules a write of the activity cache unless one is already pending.
+///
+/// Changes are written behind: walks finished within `SAVE_DELAY` of each
+/// other share a single write, and walks that changed nothing write nothing.
+pub fn schedule_save() {
+    if SAVE_SCHEDULED.swap(true, Ordering::AcqRel) {
+        return;
+    }
+
+    tauri::async_runtime::spawn(async {
+        tokio::time::sleep(SAVE_DELAY).await;
+        SAVE_SCHEDULED.store(false, Ordering::Release);
+        // Best effort: a lost cache only means the next walk lists every folder
+        if save_cache().await.is_err() {
+            activity_cache().dirty = true;
+        }
+    });
+}
+
+/// Drops the cached walk of a project, e.g. once it is removed.
+pub fn forget(project_path: &str) {
+    let mut cache = activity_cache();
+    if cache.projects.remove(project_path).is_some() {
+        cache.dirty = true;
+        drop(cache);
+        schedule_save();
+    }
+}
+
+fn mtime_ms(meta: &std::fs::Metadata) -> i64 {
+    meta.modified()
+        .ok()
+        .and_then(|t| t.duration_since(std::time::UNIX_EPOCH).ok())
+        .map(|d| d.as_millis() as i64)
+        .unwrap_or(0)
+}
+
+/// Reads the .gitignore in a folder, if it has a usable one.
+fn load_gitignore(dir: &Path) -> Option<Gitignore> {
+    diagnostics::count(Counter::FileReads, 1);
+    let (gitignore, error) = Gitignore::new(dir.join(".gitignore"));
+    (error.is_none() || !gitignore.is_empty()).then_some(gitignore)
+}
+
+/// A folder waiting to be visited.
+struct Task {
+    rel: String,
+    path: PathBuf,
+    depth: usize,
+    /// .gitignore rules of the folder's ancestors, outermost first.
+    ignores: Arc<Vec<Gitignore>>,
+}
+
+struct Queue {
+    tasks: Vec<Task>,
+    /// Folders being visited right now.
+    active: usize,
+    /// Folders queued so far, capped at `MAX_DIRS`.
+    queued: usize,
+}
+
+/// One parallel walk of a project, reusing the listings of unchanged folders.
+struct Walk<'a> {
+    previous: &'a HashMap<String, DirActivity>,
+    now_ms: i64,
+    queue: Mutex<Queue>,
+    ready: Condvar,
+    dirs: Mutex<HashMap<String, DirActivity>>,
+    newest: AtomicI64,
+}
+
+impl<'a> Walk<'a> {
+    fn new(previous: &'a HashMap<String, DirActivity>, root: &Path) -> Self {
+        let root = Task {
+            rel: String::new(),
+            path: root.to_path_buf(),
+            depth: 0,
+            ignores: Arc::new(Vec::new()),
+        };
+        Self {
+            previous,
+            now_ms: chrono::Utc::now().timestamp_millis(),
+            queue: Mutex::new(Queue {
+                tasks: vec![root],
+                active: 0,
+                queued: 1,
+            }),
+            ready: Condvar::new(),
+            dirs: Mutex::new(HashMap::new()),
+            newest: AtomicI64::new(i64::MIN),
+        }
+    }
+
+    fn lock(&self) -> MutexGuard<'_, Queue> {
+        self.queue.lock().unwrap_or_else(|e| e.into_inner())
+    }
+
+    /// Visits folders until none are queued or being visited.
+    fn work(&self) {
+        while let Some(task) = self.next() {
+            let children = self.visit(task);
+
+            let mut queue = self.lock();
+            for child in children {
+                if queue.queued >= MAX_DIRS {
+                    break;
+                }
+                queue.queued += 1;
+                queue.tasks.push(child);
+            }
+            queue.active -= 1;
+            drop(queue);
+            self.ready.notify_all();
+        }
+    }
+
+    fn next(&self) -> Option<Task> {
+        let mut queue = self.lock();
+        loop {
+            if let Some(task) = queue.tasks.pop() {
+                queue.active += 1;
+                return Some(task);
+            }
+            // Nothing queued and nobody visiting means nothing more will be queued
+            if queue.active == 0 {
+                return None;
+            }
+            queue = self.ready.wait(queue).unwrap_or_else(|e| e.into_inner());
+        }
+    }
+
+    /// Records one folder's activity and returns its subfolders to visit.
+    fn visit(&self, task: Task) -> Vec<Task> {
+        diagnostics::count(Counter::Stats, 1);
+        let Ok(meta) = std::fs::metadata(&task.path) else {
+            return Vec::new();
+        };
+        let mtime = mtime_ms(&meta);
+
+        let cached = self.previous.get(&task.rel).filter(|dir| {
+            dir.mtime_ms == mtime && self.now_ms - dir.listed_at_ms < RELIST_AFTER_MS
+        });
+        let (dir, own_ignore) = match cached {
+            Some(dir) => {
+                let own_ignore = if dir.has_gitignore {
+                    load_gitignore(&task.path)
+                } else {
+                    None
+                };
+                (dir.clone(), own_ignore)
+            }
+            None => self.list(&task, mtime),
+        };
+
+        // The folder's own mtime counts too: adding or deleting files is activity
+        self.newest
+            .fetch_max(dir.newest_file_ms.max(mtime), Ordering::Relaxed);
+
+        let mut children = Vec::new();
+        if task.depth < MAX_DEPTH {
+            let ignores = match own_ignore {
+                Some(own) => {
+                    let mut ignores = task.ignores.as_ref().clone();
+                    ignores.push(own);
+                    Arc::new(ignores)
+                }
+                None => Arc::clone(&task.ignores),
+            };
+            children = dir
+                .subdirs
+                .iter()
+                .map(|name| Task {
+                    rel: if task.rel.is_empty() {
+                        name.clone()
+                    } else {
+                        format!("{}/{}", task.rel, name)
+                    },
+                    path: task.path.join(name),
+                    depth: task.depth + 1,
+                    ignores: Arc::clone(&ignores),
+                })
+                .collect();
+        }
+
+        self.dirs
+            .lock()
+            .unwrap_or_else(|e| e.into_inner())
+            .insert(task.rel, dir);
+        children
+    }
+
+    /// Lists a folder whose cached listing is missing or out of date.
+    fn list(&self, task: &Task, mtime: i64) -> (DirActivity, Option<Gitignore>) {
+        let mut dir = DirActivity {
+            mtime_ms: mtime,
+            newest_file_ms: i64::MIN,
+            subdirs: Vec::new(),
+            has_gitignore: false,
+            listed_at_ms: self.now_ms,
+        };
+
+        diagnostics::count(Counter::DirReads, 1);
+        let entries: Vec<std::fs::DirEntry> = match std::fs::read_dir(&task.path) {
+            Ok(entries) => entries.filter_map(|entry| entry.ok()).collect(),
+            Err(_) => return (dir, None),
+        };
+
+        dir.has_gitignore = entries
+            .iter()
+            .any(|entry| entry.file_name() == ".gitignore");
+        let own_ignore = if dir.has_gitignore {
+            load_gitignore(&task.path)
+        } else {
+            None
+        };
+        // The nearest .gitignore decides, as in git
+        let is_ignored = |path: &Path, is_dir: bool| {
+            own_ignore
+                .iter()
+                .chain(task.ignores.iter().rev())
+                .map(|gitignore| gitignore.matched(path, is_dir))
+                .find(|matched| !matched.is_none())
+                .is_some_and(|matched| matched.is_ignore())
+        };
+
+        for entry in entries {
+            let Ok(file_type) = entry.file_type() else {
+                continue;
+            };
+            let name = entry.file_name().to_string_lossy().to_string();
+            let path = entry.path();
+
+            if file_type.is_dir() {
+                if !IGNORED_DIRECTORIES.contains(&name.as_str()) && !is_ignored(&path, true) {
+                    dir.subdirs.push(name);
+                }
+            } else if file_type.is_file() && !is_ignored(&path, false) {
+                diagnostics::count(Counter::Stats, 1);
+                if let Ok(meta) = entry.metadata() {
+                    dir.newest_file_ms = dir.newest_file_ms.max(mtime_ms(&meta));
+                }
+            }
+        }
+
+        (dir, own_ignore)
+    }
+}
+
+/// Returns the newest modification time, in milliseconds since the epoch,
+/// across a project's files and folders, or None if it can't be read.
+///
+/// Skips ignored and gitignored folders and walks at most `MAX_DIRS` folders
+/// `MAX_DEPTH` deep on a few threads. Each folder's listing is cached by its
+/// mtime, so a later walk lists only folders whose entries changed and
+/// merely stats the rest.
+pub fn last_activity_ms(project_path: &Path) -> Option<i64> {
+    let key = project_path.to_string_lossy().to_string();
+    let previous = {
+        let mut cache = activity_cache();
+        if let Some(project) = cache.projects.get(&key) {
+            if project
+                .walked_at
+                .is_some_and(|at| at.elapsed() < REUSE_WALK)
+            {
+                return project.last_activity_ms;
+            }
+        }
+        cache
+            .projects
+            .remove(&key)
+            .map(|project| project.dirs)
+            .unwrap_or_default()
+    };
+
+    let walk = Walk::new(&previous, project_path);
+    let threads = std::thread::available_parallelism()
+        .map_or(1, |n| n.get())
+        .min(MAX_WALK_THREADS);
+    std::thread::scope(|scope| {
+        for _ in 1..threads {
+            scope.spawn(|| walk.work());
+        }
+        walk.work();
+    });
+
+    let newest = walk.newest.load(Ordering::Relaxed);
+    let last_activity_ms = (newest != i64::MIN).then_some(newest);
+    let dirs = walk.dirs.into_inner().unwrap_or_else(|e| e.into_inner());
+    // A walk that only stats unchanged folders reproduces the cached listings
+    let changed = dirs != previous;
+    let mut cache = activity_cache();
+    cache.dirty |= changed;
+    cache.projects.insert(
+        key,
+        ProjectActivity {
+            dirs,
+            last_activity_ms,
+            walked_at: Some(Instant::now()),
+        },
+    );
+    last_activity_ms
+}
+
+/// Async wrapper around `last_activity_ms`.
+#[tracing::instrument(skip_all)]
+pub async fn last_activity(project_path: &Path) -> Option<chrono::DateTime<chrono::Utc>> {
+    let path = project_path.to_path_buf();
+    let ms = tokio::task::spawn_blocking(move || last_activity_ms(&path))
+        .await
+        .ok()
+        .flatten()?;
+    chrono::DateTime::from_timestamp_millis(ms)
+}
@@ -0,0 +1,12 @@
+//! Entry points used by the benches in `benches/`.
+//!
+//! Only built with the `bench` feature; nothing in the app depends on it.
+
+pub use crate::git::{determine_project_status, enrich_projects_with_git_info, StatusMode};
+pub use crate::scanner::{scan_directory, GitInfoData, Project, ScanOptions};
+pub use crate::summary::summarize;
+
+/// Reads git status for one repository without the cache or the git pool.
+pub fn get_git_status_sync(project_path: &str, mode: StatusMode) -> Option<GitInfoData> {
+    crate::git::get_git_status_sync(project_path, mode)
+}
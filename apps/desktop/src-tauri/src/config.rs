@@ -1,26 +1,87 @@
 use anyhow::Result;
+use notify::{RecommendedWatcher, RecursiveMode, Watcher};
 use serde::{Deserialize, Serialize};
 use std::path::PathBuf;
+use std::sync::{Arc, Mutex, OnceLock, RwLock};
+use std::time::Duration;
 use tokio::fs;
 
+const CONFIG_FILE_NAME: &str = "config.json";
+
+/// Project discovery depth used when none is configured.
+pub const DEFAULT_SCAN_DEPTH: usize = 1;
+
+/// Deepest project discovery depth accepted from settings.
+pub const MAX_SCAN_DEPTH: usize = 6;
+
+/// Time a repository's git status may take before the dashboard gets a
+/// partial result, when none is configured.
+pub const DEFAULT_GIT_TIME_BUDGET: Duration = Duration::from_secs(3);
+
 /// Application settings persisted to ~/.organizeme/config.json.
-#[derive(Debug, Clone, Serialize, Deserialize)]
+#[derive(Debug, Clone, PartialEq, Serialize, Deserialize)]
 #[serde(rename_all = "camelCase")]
 pub struct AppSettings {
     #[serde(default)]
     pub projects_path: String,
+    /// Maximum number of repositories inspected in parallel. None means auto.
+    #[serde(default)]
+    pub git_concurrency: Option<usize>,
+    /// Skip untracked files when computing dashboard status.
+    #[serde(default)]
+    pub exclude_untracked: bool,
+    /// Milliseconds a repository's git status may take during a scan before
+    /// a partial result is used. None means the default.
+    #[serde(default)]
+    pub git_time_budget_ms: Option<u64>,
+    /// Write a commit-graph for repositories without one, speeding up
+    /// ahead/behind and history walks in large repositories.
+    #[serde(default)]
+    pub write_commit_graphs: bool,
+    /// How many folder levels below the projects root to search for projects.
+    #[serde(default)]
+    pub scan_depth: Option<usize>,
+    /// Roots to scan. When empty, `projects_path` is the only root.
+    #[serde(default)]
+    pub project_roots: Vec<ProjectRoot>,
+}
+
+/// A folder scanned for projects, with its own discovery and git limits.
+#[derive(Debug, Clone, PartialEq, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+pub struct ProjectRoot {
+    pub path: String,
+    /// Prefix for ids of projects under this root. Defaults to the folder name.
+    #[serde(default)]
+    pub label: Option<String>,
+    /// Folder levels searched below this root. Falls back to `scan_depth`.
+    #[serde(default)]
+    pub scan_depth: Option<usize>,
+    /// Glob patterns of folders to skip, e.g. `archive` or `tmp-*`.
+    #[serde(default)]
+    pub exclude: Vec<String>,
+    /// Maximum repositories under this root inspected at once. None means
+    /// only the global git concurrency applies.
+    #[serde(default)]
+    pub git_concurrency: Option<usize>,
 }
 
 impl Default for AppSettings {
     fn default() -> Self {
         Self {
             projects_path: String::new(),
+            git_concurrency: None,
+            exclude_untracked: false,
+            git_time_budget_ms: None,
+            write_commit_graphs: false,
+            scan_depth: None,
+            project_roots: Vec::new(),
         }
     }
 }
 
 /// Returns the path to the organizeMe configuration directory.
-fn get_config_dir() -> PathBuf {
+pub(crate) fn get_config_dir() -> PathBuf {
     dirs::home_dir()
         .unwrap_or_else(|| PathBuf::from("/tmp"))
         .join(".organizeme")
@@ -28,7 +89,7 @@ fn get_config_dir() -> PathBuf {
 
 /// Returns the path to the config.json file.
 fn get_config_file() -> PathBuf {
-    get_config_dir().join("config.json")
+    get_config_dir().join(CONFIG_FILE_NAME)
 }
 
 /// Ensures the configuration directory exists.
@@ -39,10 +100,18 @@ async fn ensure_config_directory() -> Result<()> {
 }
 
 /// Reads app settings from config.json, returning defaults if not found.
-pub async fn get_app_settings() -> Result<AppSettings> {
-    let config_file = get_config_file();
+fn load_app_settings() -> Result<AppSettings> {
+    parse_app_settings(std::fs::read_to_string(get_config_file()))
+}
 
-    match fs::read_to_string(&config_file).await {
+/// Async version of `load_app_settings`, for use on the async runtime.
+async fn load_app_settings_async() -> Result<AppSettings> {
+    parse_app_settings(fs::read_to_string(get_config_file()).await)
+}
+
+/// Parses the result of reading config.json; a missing file means defaults.
+fn parse_app_settings(read: std::io::Result<String>) -> Result<AppSettings> {
+    match read {
         Ok(content) => {
             let settings: AppSettings = serde_json::from_str(&content)?;
             Ok(settings)
@@ -52,27 +121,237 @@ pub async fn get_app_settings() -> Result<AppSettings> {
     }
 }
 
-/// Saves app settings to config.json.
-pub async fn save_app_settings(settings: &AppSettings) -> Result<()> {
+/// Describes why config.json could not be loaded, for display.
+fn describe_load_error(error: &anyhow::Error) -> String {
+    format!(
+        "{} could not be read: {}",
+        get_config_file().display(),
+        error
+    )
+}
+
+/// Writes app settings to a temporary file and renames it into place.
+async fn save_app_settings(settings: &AppSettings) -> Result<()> {
     ensure_config_directory().await?;
     let config_file = get_config_file();
+    let tmp_file = config_file.with_extension("json.tmp");
     let content = serde_json::to_string_pretty(settings)?;
-    fs::write(&config_file, content).await?;
+    fs::write(&tmp_file, content).await?;
+    fs::rename(&tmp_file, &config_file).await?;
     Ok(())
 }
 
-/// Returns the projects directory path: config → env → default.
-pub fn get_projects_path() -> String {
-    // Try reading config synchronously from a blocking context
-    let config_file = get_config_file();
-    if let Ok(content) = std::fs::read_to_string(&config_file) {
-        if let Ok(settings) = serde_json::from_str::<AppSettings>(&content) {
-            if !settings.projects_path.is_empty() {
-                return settings.projects_path;
+struct Inner {
+    settings: RwLock<Arc<AppSettings>>,
+    /// Why config.json could not be loaded, for as long as it can't be.
+    load_error: RwLock<Option<String>>,
+    /// Kept alive for as long as config.json should be watched.
+    watcher: Mutex<Option<RecommendedWatcher>>,
+}
+
+/// Long-lived settings store held in Tauri managed state.
+///
+/// config.json is read once and the parsed settings are served from memory.
+/// Saving through the service replaces them directly; a watch on the config
+/// directory picks up edits made outside the app. While the file does not
+/// parse, defaults are served and saving is refused, so the user's file is
+/// never overwritten.
+#[derive(Clone)]
+pub struct ConfigService {
+    inner: Arc<Inner>,
+}
+
+static SERVICE: OnceLock<ConfigService> = OnceLock::new();
+
+/// Returns the process-wide config service, loading config.json on first use.
+pub fn service() -> &'static ConfigService {
+    SERVICE.get_or_init(|| {
+        // An unreadable config behaves like a fresh install until it is fixed
+        let (settings, load_error) = match load_app_settings() {
+            Ok(settings) => (settings, None),
+            Err(e) => (AppSettings::default(), Some(describe_load_error(&e))),
+        };
+        ConfigService {
+            inner: Arc::new(Inner {
+                settings: RwLock::new(Arc::new(settings)),
+                load_error: RwLock::new(load_error),
+                watcher: Mutex::new(None),
+            }),
+        }
+    })
+}
+
+impl ConfigService {
+    /// Returns the current settings without touching the disk.
+    pub fn settings(&self) -> Arc<AppSettings> {
+        let settings = self
+            .inner
+            .settings
+            .read()
+            .unwrap_or_else(|e| e.into_inner());
+        Arc::clone(&settings)
+    }
+
+    /// Returns why config.json could not be loaded, if it can't.
+    pub fn load_error(&self) -> Option<String> {
+        self.inner
+            .load_error
+            .read()
+            .unwrap_or_else(|e| e.into_inner())
+            .clone()
+    }
+
+    fn set_load_error(&self, error: Option<String>) {
+        *self
+            .inner
+            .load_error
+            .write()
+            .unwrap_or_else(|e| e.into_inner()) = error;
+    }
+
+    /// Replaces the served settings, returning whether they changed.
+    fn replace(&self, settings: AppSettings) -> bool {
+        let mut current = self
+            .inner
+            .settings
+            .write()
+            .unwrap_or_else(|e| e.into_inner());
+        if **current == settings {
+            return false;
+        }
+        *current = Arc::new(settings);
+        true
+    }
+
+    /// Saves settings to config.json and serves them from now on.
+    ///
+    /// Fails without writing if the file on disk does not parse, since the
+    /// served settings would then be defaults rather than the user's.
+    pub async fn save(&self, settings: AppSettings) -> Result<()> {
+        if let Err(e) = load_app_settings_async().await {
+            let message = describe_load_error(&e);
+            self.set_load_error(Some(message.clone()));
+            anyhow::bail!("{}; fix or remove it before changing settings", message);
+        }
+        self.set_load_error(None);
+        save_app_settings(&settings).await?;
+        self.replace(settings);
+        Ok(())
+    }
+
+    /// Re-reads config.json, keeping the current settings if it does not parse.
+    pub fn reload(&self) -> bool {
+        match load_app_settings() {
+            Ok(settings) => {
+                self.set_load_error(None);
+                self.replace(settings)
+            }
+            // Editors can leave the file half-written; wait for the next change
+            Err(e) => {
+                self.set_load_error(Some(describe_load_error(&e)));
+                false
             }
         }
     }
 
+    /// Reloads the settings whenever config.json changes on disk, calling
+    /// `on_change` after each reload that changed them.
+    pub fn watch(&self, on_change: impl Fn(&AppSettings) + Send + 'static) -> Result<()> {
+        let config_dir = get_config_dir();
+        std::fs::create_dir_all(&config_dir)?;
+
+        let service = self.clone();
+        let mut watcher =
+            notify::recommended_watcher(move |res: notify::Result<notify::Event>| {
+                let touches_config = res.is_ok_and(|event| {
+                    event.paths.iter().any(|path| {
+                        path.file_name()
+                            .is_some_and(|name| name == CONFIG_FILE_NAME)
+                    })
+                });
+                if touches_config && service.reload() {
+                    on_change(&service.settings());
+                }
+            })?;
+        // The directory is watched so atomic replaces of the file are seen
+        watcher.watch(&config_dir, RecursiveMode::NonRecursive)?;
+
+        *self.inner.watcher.lock().unwrap_or_else(|e| e.into_inner()) = Some(watcher);
+        Ok(())
+    }
+}
+
+/// Returns the configured git concurrency, if one was set.
+pub fn get_git_concurrency() -> Option<usize> {
+    service().settings().git_concurrency.filter(|n| *n > 0)
+}
+
+/// Returns whether untracked files are excluded from dashboard status.
+pub fn get_exclude_untracked() -> bool {
+    service().settings().exclude_untracked
+}
+
+/// Returns how long one repository's git status may take during a scan.
+pub fn get_git_time_budget() -> Duration {
+    service()
+        .settings()
+        .git_time_budget_ms
+        .filter(|ms| *ms > 0)
+        .map_or(DEFAULT_GIT_TIME_BUDGET, Duration::from_millis)
+}
+
+/// Returns whether missing commit-graphs are written in the background.
+pub fn get_write_commit_graphs() -> bool {
+    service().settings().write_commit_graphs
+}
+
+/// Returns the roots to scan, each with its depth resolved.
+///
+/// Without configured roots this is the single projects path. The first root
+/// is the primary one: its project ids carry no prefix.
+pub fn get_project_roots() -> Vec<ProjectRoot> {
+    let settings = service().settings();
+    let default_depth = settings.scan_depth.unwrap_or(DEFAULT_SCAN_DEPTH);
+
+    let mut roots: Vec<ProjectRoot> = settings
+        .project_roots
+        .iter()
+        .filter(|root| !root.path.is_empty())
+        .cloned()
+        .collect();
+    if roots.is_empty() {
+        roots.push(ProjectRoot {
+            path: projects_path_of(&settings),
+            label: None,
+            scan_depth: None,
+            exclude: Vec::new(),
+            git_concurrency: None,
+        });
+    }
+
+    for root in &mut roots {
+        let depth = root.scan_depth.unwrap_or(default_depth);
+        root.scan_depth = Some(depth.clamp(1, MAX_SCAN_DEPTH));
+        root.git_concurrency = root.git_concurrency.filter(|n| *n > 0);
+    }
+    roots
+}
+
+/// Returns the projects directory path: config → env → default.
+///
+/// With multiple roots configured this is the primary (first) root.
+pub fn get_projects_path() -> String {
+    projects_path_of(&service().settings())
+}
+
+fn projects_path_of(settings: &AppSettings) -> String {
+    if let Some(root) = settings.project_roots.iter().find(|r| !r.path.is_empty()) {
+        return root.path.clone();
+    }
+    if !settings.projects_path.is_empty() {
+        return settings.projects_path.clone();
+    }
+
     // Fall back to env var
     if let Ok(path) = std::env::var("PROJECTS_PATH") {
         return path;
@@ -0,0 +1,119 @@
+use crate::diagnostics::{self, Counter};
+use std::collections::HashMap;
+use std::io;
+use std::path::Path;
+
+/// README file names, in order of preference; matched ignoring case.
+pub const README_FILES: &[&str] = &["README.md", "README.txt", "README"];
+
+/// Recognises one kind of project from the entries at its top level.
+pub struct Detector {
+    pub kind: &'static str,
+    /// The detector matches if any of these entries exists, ignoring case.
+    pub markers: &'static [&'static str],
+}
+
+/// Registered detectors; a directory matched by any of them is a project.
+///
+/// Supporting a new kind of project only takes another entry here.
+pub const DETECTORS: &[Detector] = &[
+    Detector {
+        kind: "git",
+        markers: &[".git"],
+    },
+    Detector {
+        kind: "node",
+        markers: &["package.json"],
+    },
+    Detector {
+        kind: "rust",
+        markers: &["Cargo.toml"],
+    },
+    Detector {
+        kind: "python",
+        markers: &["pyproject.toml"],
+    },
+    Detector {
+        kind: "go",
+        markers: &["go.mod"],
+    },
+    Detector {
+        kind: "java",
+        markers: &["pom.xml", "build.gradle"],
+    },
+    Detector {
+        kind: "make",
+        markers: &["Makefile"],
+    },
+    Detector {
+        kind: "readme",
+        markers: README_FILES,
+    },
+];
+
+/// Entry names of one directory, read with a single `read_dir`.
+///
+/// Detectors and metadata checks match against the listing in memory
+/// instead of stat-ing each candidate file. Names match ignoring case, as
+/// they do on the default macOS and Windows filesystems, so `makefile` or
+/// `ReadMe.md` are found too.
+#[derive(Debug, Default)]
+pub struct DirListing {
+    /// Actual entry names keyed by their lowercased form.
+    names: HashMap<String, String>,
+}
+
+impl DirListing {
+    /// Lists a directory, skipping entries that can't be read.
+    pub fn read(path: &Path) -> io::Result<Self> {
+        diagnostics::count(Counter::DirReads, 1);
+        let names = std::fs::read_dir(path)?
+            .filter_map(|entry| entry.ok())
+            .map(|entry| {
+                let name = entry.file_name().to_string_lossy().into_owned();
+                (name.to_lowercase(), name)
+            })
+            .collect();
+        Ok(Self { names })
+    }
+
+    /// Lists a directory on the blocking thread pool.
+    pub async fn read_async(path: &Path) -> io::Result<Self> {
+        let path = path.to_path_buf();
+        tokio::task::spawn_blocking(move || Self::read(&path))
+            .await
+            .map_err(io::Error::other)?
+    }
+
+    /// Checks whether the directory has an entry with this name, ignoring case.
+    pub fn contains(&self, name: &str) -> bool {
+        self.names.contains_key(&name.to_lowercase())
+    }
+
+    /// Returns the on-disk names of the `candidates` that exist, in the
+    /// given order.
+    pub fn present<'a>(&'a self, candidates: &'a [&'a str]) -> impl Iterator<Item = &'a str> {
+        candidates
+            .iter()
+            .filter_map(move |name| self.names.get(&name.to_lowercase()))
+            .map(String::as_str)
+    }
+
+    /// Returns the kinds of every detector matching the directory.
+    pub fn kinds(&self) -> impl Iterator<Item = &'static str> + '_ {
+        DETECTORS
+            .iter()
+            .filter(move |detector| self.present(detector.markers).next().is_some())
+            .map(|detector| detector.kind)
+    }
+
+    /// Checks whether any registered detector matches the directory.
+    pub fn is_project(&self) -> bool {
+        self.kinds().next().is_some()
+    }
+
+    /// Checks whether the directory has a README file.
+    pub fn has_readme(&self) -> bool {
+        self.present(README_FILES).next().is_some()
+    }
+}
@@ -0,0 +1,508 @@
+use crate::config;
+use anyhow::Result;
+use serde::Serialize;
+use std::collections::{BTreeMap, HashMap};
+use std::fmt;
+use std::path::PathBuf;
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::{Mutex, MutexGuard, OnceLock};
+use std::time::{Duration, Instant};
+use tokio::fs;
+use tracing::field::{Field, Visit};
+use tracing::span;
+use tracing::Subscriber;
+use tracing_subscriber::layer::{Context, Layer};
+use tracing_subscriber::registry::LookupSpan;
+
+/// Histogram buckets; bucket `i` holds durations below 2^i microseconds.
+const BUCKETS: usize = 40;
+
+/// Most trace events kept for one scan, so a huge scan cannot exhaust memory.
+const MAX_TRACE_EVENTS: usize = 200_000;
+
+/// Repositories listed in the slow-repo report.
+const MAX_SLOW_REPOS: usize = 20;
+
+/// Filesystem and git operations counted since startup.
+#[derive(Debug, Clone, Copy)]
+pub enum Counter {
+    /// Directory listings.
+    DirReads,
+    /// Metadata and existence checks.
+    Stats,
+    /// Files opened for reading.
+    FileReads,
+    /// Bytes read from files.
+    BytesRead,
+    /// Repositories opened by libgit2.
+    RepoOpens,
+    /// Working tree status walks.
+    StatusWalks,
+}
+
+static COUNTERS: [AtomicU64; 6] = [
+    AtomicU64::new(0),
+    AtomicU64::new(0),
+    AtomicU64::new(0),
+    AtomicU64::new(0),
+    AtomicU64::new(0),
+    AtomicU64::new(0),
+];
+
+/// Adds `n` to a counter.
+pub fn count(counter: Counter, n: u64) {
+    COUNTERS[counter as usize].fetch_add(n, Ordering::Relaxed);
+}
+
+/// Records the phase timings of a repository's git read for the slow-repo report.
+pub fn record_repo(path: &str, phases: &[(&'static str, Duration)], over_budget: bool) {
+    let total: Duration = phases.iter().map(|(_, elapsed)| *elapsed).sum();
+    let slowest_phase = phases
+        .iter()
+        .max_by_key(|(_, elapsed)| *elapsed)
+        .map(|(name, _)| *name);
+
+    state().repos.insert(
+        path.to_string(),
+        SlowRepo {
+            path: path.to_string(),
+            total_ms: total.as_secs_f64() * 1000.0,
+            slowest_phase,
+            phases: phases
+                .iter()
+                .map(|&(name, elapsed)| RepoPhase {
+                    name,
+                    ms: elapsed.as_secs_f64() * 1000.0,
+                })
+                .collect(),
+            over_budget,
+            recorded_at: chrono::Utc::now().to_rfc3339(),
+        },
+    );
+}
+
+/// Log2-bucketed latency histogram.
+struct Histogram {
+    count: u64,
+    total_us: u64,
+    min_us: u64,
+    max_us: u64,
+    buckets: [u64; BUCKETS],
+}
+
+impl Default for Histogram {
+    fn default() -> Self {
+        Self {
+            count: 0,
+            total_us: 0,
+            min_us: u64::MAX,
+            max_us: 0,
+            buckets: [0; BUCKETS],
+        }
+    }
+}
+
+impl Histogram {
+    fn record(&mut self, us: u64) {
+        let bucket = (u64::BITS - us.leading_zeros()) as usize;
+        self.buckets[bucket.min(BUCKETS - 1)] += 1;
+        self.count += 1;
+        self.total_us += us;
+        self.min_us = self.min_us.min(us);
+        self.max_us = self.max_us.max(us);
+    }
+
+    /// Upper bound of the bucket holding the `q` quantile, capped at the maximum.
+    fn quantile_us(&self, q: f64) -> u64 {
+        let target = ((self.count as f64) * q).ceil().max(1.0) as u64;
+        let mut seen = 0;
+        for (i, count) in self.buckets.iter().enumerate() {
+            seen += count;
+            if seen >= target {
+                return (1u64 << i).min(self.max_us);
+            }
+        }
+        self.max_us
+    }
+}
+
+/// A completed span in Chrome trace event format.
+#[derive(Debug, Clone, Serialize)]
+struct TraceEvent {
+    name: &'static str,
+    cat: &'static str,
+    ph: &'static str,
+    /// Start in microseconds since the scan began.
+    ts: u64,
+    dur: u64,
+    pid: u32,
+    tid: u64,
+    #[serde(skip_serializing_if = "BTreeMap::is_empty")]
+    args: BTreeMap<&'static str, String>,
+}
+
+/// Spans recorded while a scan runs.
+struct Recording {
+    started: Instant,
+    started_at: String,
+    duration: Option<Duration>,
+    events: Vec<TraceEvent>,
+}
+
+#[derive(Default)]
+struct State {
+    /// Keyed by span target (module path) and name.
+    phases: BTreeMap<(&'static str, &'static str), Histogram>,
+    /// Scans currently running; spans are recorded while this is non-zero.
+    active_scans: usize,
+    recording: Option<Recording>,
+    last_scan: Option<Recording>,
+    /// Most recent git read of each repository, keyed by path.
+    repos: HashMap<String, SlowRepo>,
+}
+
+static STATE: OnceLock<Mutex<State>> = OnceLock::new();
+
+fn state() -> MutexGuard<'static, State> {
+    STATE
+        .get_or_init(|| Mutex::new(State::default()))
+        .lock()
+        .unwrap_or_else(|e| e.into_inner())
+}
+
+/// Records every span that closes until dropped, replacing the last scan's trace.
+///
+/// Overlapping scans share one recording, which ends with the last of them.
+pub struct ScanRecording(());
+
+/// Starts recording a scan.
+pub fn record_scan() -> ScanRecording {
+    let mut state = state();
+    state.active_scans += 1;
+    if state.recording.is_none() {
+        state.recording = Some(Recording {
+            started: Instant::now(),
+            started_at: chrono::Utc::now().to_rfc3339(),
+            duration: None,
+            events: Vec::new(),
+        });
+    }
+    ScanRecording(())
+}
+
+impl Drop for ScanRecording {
+    fn drop(&mut self) {
+        let mut state = state();
+        state.active_scans = state.active_scans.saturating_sub(1);
+        if state.active_scans == 0 {
+            if let Some(mut recording) = state.recording.take() {
+                recording.duration = Some(recording.started.elapsed());
+                state.last_scan = Some(recording);
+            }
+        }
+    }
+}
+
+fn thread_id() -> u64 {
+    static NEXT: AtomicU64 = AtomicU64::new(1);
+    thread_local! {
+        static THREAD_ID: u64 = NEXT.fetch_add(1, Ordering::Relaxed);
+    }
+    THREAD_ID.with(|id| *id)
+}
+
+/// Collects span fields as strings for trace event args.
+#[derive(Default)]
+struct FieldVisitor(BTreeMap<&'static str, String>);
+
+impl Visit for FieldVisitor {
+    fn record_str(&mut self, field: &Field, value: &str) {
+        self.0.insert(field.name(), value.to_string());
+    }
+
+    fn record_debug(&mut self, field: &Field, value: &dyn fmt::Debug) {
+        self.0.insert(field.name(), format!("{:?}", value));
+    }
+}
+
+struct SpanTiming {
+    start: Instant,
+    thread: u64,
+    args: BTreeMap<&'static str, String>,
+}
+
+/// Tracing layer that aggregates span durations by name and records the
+/// spans of the current scan.
+#[derive(Default)]
+pub struct DiagnosticsLayer;
+
+impl<S> Layer<S> for DiagnosticsLayer
+where
+    S: Subscriber + for<'a> LookupSpan<'a>,
+{
+    fn on_new_span(&self, attrs: &span::Attributes<'_>, id: &span::Id, ctx: Context<'_, S>) {
+        let Some(span) = ctx.span(id) else {
+            return;
+        };
+        let mut fields = FieldVisitor::default();
+        attrs.record(&mut fields);
+        span.extensions_mut().insert(SpanTiming {
+            start: Instant::now(),
+            thread: thread_id(),
+            args: fields.0,
+        });
+    }
+
+    fn on_close(&self, id: span::Id, ctx: Context<'_, S>) {
+        let Some(span) = ctx.span(&id) else {
+            return;
+        };
+        let extensions = span.extensions();
+        let Some(timing) = extensions.get::<SpanTiming>() else {
+            return;
+        };
+        let metadata = span.metadata();
+        let dur = timing.start.elapsed().as_micros() as u64;
+
+        let mut state = state();
+        state
+            .phases
+            .entry((metadata.target(), metadata.name()))
+            .or_default()
+            .record(dur);
+
+        if let Some(recording) = state.recording.as_mut() {
+            if recording.events.len() < MAX_TRACE_EVENTS {
+                recording.events.push(TraceEvent {
+                    name: metadata.name(),
+                    cat: metadata.target(),
+                    ph: "X",
+                    ts: timing
+                        .start
+                        .saturating_duration_since(recording.started)
+                        .as_micros() as u64,
+                    dur,
+                    pid: 1,
+                    tid: timing.thread,
+                    args: timing.args.clone(),
+                });
+            }
+        }
+    }
+}
+
+/// Installs the diagnostics layer as the global tracing subscriber.
+pub fn init() {
+    use tracing_subscriber::layer::SubscriberExt;
+
+    let subscriber = tracing_subscriber::registry().with(DiagnosticsLayer);
+    // Another subscriber (e.g. in a test harness) just means no diagnostics
+    let _ = tracing::subscriber::set_global_default(subscriber);
+}
+
+/// Aggregated timings of one span name.
+#[derive(Debug, Clone, Serialize)]
+#[serde(rename_all = "camelCase")]
+pub struct PhaseStats {
+    pub target: &'static str,
+    pub name: &'static str,
+    pub count: u64,
+    pub total_ms: f64,
+    pub mean_ms: f64,
+    pub min_ms: f64,
+    pub max_ms: f64,
+    pub p50_ms: f64,
+    pub p95_ms: f64,
+    pub p99_ms: f64,
+}
+
+/// Operation counters since startup.
+#[derive(Debug, Clone, Serialize)]
+#[serde(rename_all = "camelCase")]
+pub struct IoCounters {
+    pub dir_reads: u64,
+    pub stats: u64,
+    pub file_reads: u64,
+    pub bytes_read: u64,
+    pub repo_opens: u64,
+    pub status_walks: u64,
+}
+
+/// Kernel I/O accounting for the whole process (Linux only).
+#[derive(Debug, Clone, Default, Serialize)]
+#[serde(rename_all = "camelCase")]
+pub struct ProcessIo {
+    pub read_syscalls: u64,
+    pub write_syscalls: u64,
+    pub chars_read: u64,
+    pub chars_written: u64,
+    pub bytes_read: u64,
+    pub bytes_written: u64,
+}
+
+/// Summary of the most recent scan.
+#[derive(Debug, Clone, Serialize)]
+#[serde(rename_all = "camelCase")]
+pub struct ScanTraceInfo {
+    pub started_at: String,
+    pub duration_ms: f64,
+    pub events: usize,
+}
+
+/// Time spent in one phase of a repository's git read.
+#[derive(Debug, Clone, Serialize)]
+#[serde(rename_all = "camelCase")]
+pub struct RepoPhase {
+    pub name: &'static str,
+    pub ms: f64,
+}
+
+/// A repository's most recent git read, as listed in the slow-repo report.
+#[derive(Debug, Clone, Serialize)]
+#[serde(rename_all = "camelCase")]
+pub struct SlowRepo {
+    pub path: String,
+    pub total_ms: f64,
+    /// Phase that took longest.
+    pub slowest_phase: Option<&'static str>,
+    pub phases: Vec<RepoPhase>,
+    /// Whether the read overran its time budget and finished in the background.
+    pub over_budget: bool,
+    pub recorded_at: String,
+}
+
+/// Snapshot returned by the `get_diagnostics` command.
+#[derive(Debug, Clone, Serialize)]
+#[serde(rename_all = "camelCase")]
+pub struct Diagnostics {
+    pub phases: Vec<PhaseStats>,
+    pub counters: IoCounters,
+    pub process_io: Option<ProcessIo>,
+    pub last_scan: Option<ScanTraceInfo>,
+    /// Slowest repositories by their most recent git read, slowest first.
+    pub slow_repos: Vec<SlowRepo>,
+}
+
+fn ms(us: u64) -> f64 {
+    us as f64 / 1000.0
+}
+
+#[cfg(target_os = "linux")]
+fn process_io() -> Option<ProcessIo> {
+    let content = std::fs::read_to_string("/proc/self/io").ok()?;
+    let mut io = ProcessIo::default();
+    for line in content.lines() {
+        let Some((key, value)) = line.split_once(':') else {
+            continue;
+        };
+        let value = value.trim().parse().unwrap_or(0);
+        match key {
+            "syscr" => io.read_syscalls = value,
+            "syscw" => io.write_syscalls = value,
+            "rchar" => io.chars_read = value,
+            "wchar" => io.chars_written = value,
+            "read_bytes" => io.bytes_read = value,
+            "write_bytes" => io.bytes_written = value,
+            _ => {}
+        }
+    }
+    Some(io)
+}
+
+#[cfg(not(target_os = "linux"))]
+fn process_io() -> Option<ProcessIo> {
+    None
+}
+
+/// Returns per-phase timings, I/O counters and a summary of the last scan.
+pub fn snapshot() -> Diagnostics {
+    let counter = |c: Counter| COUNTERS[c as usize].load(Ordering::Relaxed);
+    let counters = IoCounters {
+        dir_reads: counter(Counter::DirReads),
+        stats: counter(Counter::Stats),
+        file_reads: counter(Counter::FileReads),
+        bytes_read: counter(Counter::BytesRead),
+        repo_opens: counter(Counter::RepoOpens),
+        status_walks: counter(Counter::StatusWalks),
+    };
+
+    let state = state();
+    let phases = state
+        .phases
+        .iter()
+        .map(|(&(target, name), histogram)| PhaseStats {
+            target,
+            name,
+            count: histogram.count,
+            total_ms: ms(histogram.total_us),
+            mean_ms: ms(histogram.total_us) / histogram.count.max(1) as f64,
+            min_ms: ms(histogram.min_us.min(histogram.max_us)),
+            max_ms: ms(histogram.max_us),
+            p50_ms: ms(histogram.quantile_us(0.5)),
+            p95_ms: ms(histogram.quantile_us(0.95)),
+            p99_ms: ms(histogram.quantile_us(0.99)),
+        })
+        .collect();
+
+    let last_scan = state.last_scan.as_ref().map(|scan| ScanTraceInfo {
+        started_at: scan.started_at.clone(),
+        duration_ms: scan.duration.unwrap_or_default().as_secs_f64() * 1000.0,
+        events: scan.events.len(),
+    });
+
+    let mut slow_repos: Vec<SlowRepo> = state.repos.values().cloned().collect();
+    slow_repos.sort_by(|a, b| b.total_ms.total_cmp(&a.total_ms));
+    slow_repos.truncate(MAX_SLOW_REPOS);
+
+    Diagnostics {
+        phases,
+        counters,
+        process_io: process_io(),
+        last_scan,
+        slow_repos,
+    }
+}
+
+/// Serializes the last scan as Chrome trace JSON, loadable in chrome://tracing
+/// or Perfetto. Returns None if no scan finished yet.
+pub fn last_scan_trace() -> Option<Vec<u8>> {
+    #[derive(Serialize)]
+    #[serde(rename_all = "camelCase")]
+    struct ChromeTrace<'a> {
+        trace_events: &'a [TraceEvent],
+        display_time_unit: &'static str,
+    }
+
+    let state = state();
+    let scan = state.last_scan.as_ref()?;
+    serde_json::to_vec(&ChromeTrace {
+        trace_events: &scan.events,
+        display_time_unit: "ms",
+    })
+    .ok()
+}
+
+/// Returns the directory holding dumped scan traces.
+fn get_traces_dir() -> PathBuf {
+    config::get_config_dir().join("traces")
+}
+
+/// Writes the last scan's Chrome trace to `path`, or to a timestamped file in
+/// ~/.organizeme/traces, returning where it was written. None if no scan
+/// finished yet.
+pub async fn save_last_scan_trace(path: Option<PathBuf>) -> Result<Option<PathBuf>> {
+    let Some(trace) = last_scan_trace() else {
+        return Ok(None);
+    };
+
+    let path = match path {
+        Some(path) => path,
+        None => {
+            fs::create_dir_all(get_traces_dir()).await?;
+            let stamp = chrono::Utc::now().format("%Y%m%d-%H%M%S");
+            get_traces_dir().join(format!("scan-{}.json", stamp))
+        }
+    };
+    fs::write(&path, trace).await?;
+    Ok(Some(path))
+}
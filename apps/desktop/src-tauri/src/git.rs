@@ -1,5 +1,22 @@
+use crate::config;
+use crate::diagnostics::{self, Counter};
+use crate::git_pool::{self, GitPriority, JobOutcome};
+use crate::repo_pool;
 use crate::scanner::{GitInfoData, Project};
-use git2::Repository;
+use anyhow::Result;
+use futures::stream::{FuturesUnordered, StreamExt};
+use git2::{Repository, StatusOptions};
+use serde::{Deserialize, Serialize};
+use std::collections::{HashMap, HashSet};
+use std::path::{Path, PathBuf};
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::{Arc, Mutex, MutexGuard, OnceLock};
+use std::time::{Duration, Instant};
+use tokio::fs;
+use tokio::sync::{oneshot, Semaphore};
+
+/// Bumped whenever the cache layout or the fingerprint definition changes.
+const GIT_CACHE_VERSION: u32 = 2;
 
 /// Converts a git remote URL (SSH or HTTPS) to an HTTPS URL for browser opening.
 fn convert_remote_url(url: &str) -> String {
@@ -43,6 +60,11 @@ pub fn determine_project_status(git_info: Option<&GitInfoData>, last_modified: &
             }
         }
 
+        // A partial read never finished the status walk, so it can't vouch
+        // for a clean working tree
+        if info.partial {
+            return "unknown".to_string();
+        }
         return "clean".to_string();
     }
 
@@ -59,48 +81,531 @@ pub fn determine_project_status(git_info: Option<&GitInfoData>, last_modified: &
     "unknown".to_string()
 }
 
+/// Returns the mtime (ms) and size of a file as a fingerprint fragment.
+fn stat_stamp(path: &Path) -> String {
+    diagnostics::count(Counter::Stats, 1);
+    match std::fs::metadata(path) {
+        Ok(meta) => {
+            let mtime = meta
+                .modified()
+                .ok()
+                .and_then(|t| t.duration_since(std::time::UNIX_EPOCH).ok())
+                .map(|d| d.as_millis())
+                .unwrap_or(0);
+            format!("{}:{}", mtime, meta.len())
+        }
+        Err(_) => "-".to_string(),
+    }
+}
+
+/// Computes a cheap fingerprint of a repository's git state without opening it.
+///
+/// Covers HEAD, the index, the current branch ref and its origin counterpart,
+/// packed-refs and FETCH_HEAD. Returns None when the directory has no `.git`.
+#[tracing::instrument(skip_all)]
+pub fn git_fingerprint(project_path: &str) -> Option<String> {
+    let git_dir = Path::new(project_path).join(".git");
+    diagnostics::count(Counter::Stats, 1);
+    let meta = std::fs::metadata(&git_dir).ok()?;
+
+    // Worktrees and submodules use a `.git` file; fingerprint the file itself
+    if !meta.is_dir() {
+        return Some(format!("gitfile={}", stat_stamp(&git_dir)));
+    }
+
+    let head = std::fs::read_to_string(git_dir.join("HEAD")).unwrap_or_default();
+    let head = head.trim();
+    let mut parts = vec![format!("HEAD={}", head)];
+
+    if let Some(branch) = head.strip_prefix("ref: refs/heads/") {
+        parts.push(format!(
+            "branch={}",
+            stat_stamp(&git_dir.join("refs/heads").join(branch))
+        ));
+        parts.push(format!(
+            "upstream={}",
+            stat_stamp(&git_dir.join("refs/remotes/origin").join(branch))
+        ));
+    }
+
+    for name in ["index", "packed-refs", "FETCH_HEAD"] {
+        parts.push(format!("{}={}", name, stat_stamp(&git_dir.join(name))));
+    }
+
+    Some(parts.join(";"))
+}
+
+/// How thoroughly the working tree is examined when computing status.
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Serialize, Deserialize)]
+pub enum StatusMode {
+    /// Dashboard mode: untracked directories count as one entry and are not
+    /// descended into; untracked files can be skipped entirely.
+    Quick { include_untracked: bool },
+    /// Detail mode: every changed and untracked file is counted.
+    Full,
+}
+
+/// Builds explicit status options for a mode; ignored files are never evaluated.
+fn status_options(mode: StatusMode) -> StatusOptions {
+    let mut opts = StatusOptions::new();
+    opts.include_ignored(false)
+        .recurse_ignored_dirs(false)
+        .exclude_submodules(true)
+        .renames_head_to_index(false)
+        .renames_index_to_workdir(false);
+
+    match mode {
+        StatusMode::Quick { include_untracked } => {
+            opts.include_untracked(include_untracked)
+                .recurse_untracked_dirs(false);
+        }
+        StatusMode::Full => {
+            opts.include_untracked(true).recurse_untracked_dirs(true);
+        }
+    }
+    opts
+}
+
+/// Called with the path of a repository whose read finished after its time budget ran out.
+static LATE_RESULT_HOOK: OnceLock<Box<dyn Fn(&str) + Send + Sync>> = OnceLock::new();
+
+/// Registers the callback told when a repository that overran its time
+/// budget finishes, so its full git info can replace the partial one.
+pub fn on_late_result(hook: impl Fn(&str) + Send + Sync + 'static) {
+    let _ = LATE_RESULT_HOOK.set(Box::new(hook));
+}
+
+/// Progress of one repository's git read, shared with the caller waiting on it.
+///
+/// Fields are published as each phase completes, so a caller whose time
+/// budget runs out can take what is ready while the read carries on.
+#[derive(Default)]
+struct GitProgress {
+    state: Mutex<ProgressState>,
+    finished: AtomicBool,
+    /// Set once the waiting caller stopped waiting.
+    abandoned: AtomicBool,
+}
+
+#[derive(Default)]
+struct ProgressState {
+    info: Option<GitInfoData>,
+    /// Whether `info` includes the status walk's dirty state.
+    status_read: bool,
+    phases: Vec<(&'static str, Duration)>,
+}
+
+impl GitProgress {
+    fn lock(&self) -> MutexGuard<'_, ProgressState> {
+        self.state.lock().unwrap_or_else(|e| e.into_inner())
+    }
+
+    /// Runs one phase of the read, recording how long it took.
+    fn phase<T>(&self, name: &'static str, f: impl FnOnce() -> T) -> T {
+        let started = Instant::now();
+        let result = f();
+        self.lock().phases.push((name, started.elapsed()));
+        result
+    }
+
+    /// Publishes the fields read so far.
+    fn publish(&self, info: &GitInfoData) {
+        self.lock().info = Some(info.clone());
+    }
+
+    /// Publishes the fields including the status walk's result.
+    fn publish_status(&self, info: &GitInfoData) {
+        let mut state = self.lock();
+        state.info = Some(info.clone());
+        state.status_read = true;
+    }
+
+    /// Returns the fields read so far, marked partial unless the status
+    /// walk already finished.
+    fn partial(&self) -> Option<GitInfoData> {
+        let state = self.lock();
+        let mut info = state.info.clone()?;
+        info.partial = !state.status_read;
+        Some(info)
+    }
+
+    /// Marks the read finished and reports its timings. A read its caller
+    /// gave up on announces itself through the late result hook.
+    fn finish(&self, project_path: &str) {
+        self.finished.store(true, Ordering::SeqCst);
+        let abandoned = self.abandoned.load(Ordering::SeqCst);
+        {
+            // A cache hit only ran the fingerprint and says nothing about speed
+            let state = self.lock();
+            if abandoned || state.phases.len() > 1 {
+                diagnostics::record_repo(project_path, &state.phases, abandoned);
+            }
+        }
+
+        if abandoned {
+            if let Some(hook) = LATE_RESULT_HOOK.get() {
+                hook(project_path);
+            }
+        }
+    }
+
+    /// Stops waiting for the read. Returns false if it already finished, in
+    /// which case the caller should take the full result after all.
+    fn abandon(&self) -> bool {
+        self.abandoned.store(true, Ordering::SeqCst);
+        !self.finished.load(Ordering::SeqCst)
+    }
+}
+
 /// Gets git status for a project directory asynchronously.
 pub async fn get_git_status(project_path: &str) -> Option<GitInfoData> {
     let path = project_path.to_string();
 
     // Run git2 operations in a blocking task since git2 is synchronous
-    tokio::task::spawn_blocking(move || get_git_status_sync(&path))
+    tokio::task::spawn_blocking(move || get_git_status_sync(&path, StatusMode::Full))
         .await
         .ok()
         .flatten()
 }
 
 /// Synchronous implementation of git status retrieval using libgit2.
-fn get_git_status_sync(project_path: &str) -> Option<GitInfoData> {
-    let repo = Repository::open(project_path).ok()?;
+pub(crate) fn get_git_status_sync(project_path: &str, mode: StatusMode) -> Option<GitInfoData> {
+    repo_pool::with_repo(project_path, |repo| {
+        read_git_status(repo, mode, &GitProgress::default())
+    })
+    .flatten()
+}
+
+/// Identity of a repository's state; an unchanged fingerprint means cached
+/// git info is still valid.
+#[derive(Debug, Clone, PartialEq, Eq, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+struct RepoFingerprint {
+    mode: StatusMode,
+    head_ref: Option<String>,
+    head_oid: Option<String>,
+    upstream_oid: Option<String>,
+    index_mtime_ms: i64,
+    index_size: u64,
+    /// FNV-1a hash of the names and mtimes of the working tree's top-level
+    /// entries; unlike `DefaultHasher` it is the same on every build.
+    workdir_hash: u64,
+}
+
+#[derive(Debug, Clone, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+struct CachedGitInfo {
+    fingerprint: RepoFingerprint,
+    info: GitInfoData,
+}
+
+/// Git info cache persisted to ~/.organizeme/git-cache.json.
+#[derive(Debug, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+struct GitInfoCache {
+    version: u32,
+    entries: HashMap<String, CachedGitInfo>,
+}
+
+static GIT_CACHE: OnceLock<Mutex<GitInfoCache>> = OnceLock::new();
+
+/// Returns the path to the git cache file.
+fn get_git_cache_file() -> PathBuf {
+    config::get_config_dir().join("git-cache.json")
+}
+
+/// Locks the process-wide git cache, loading it from disk on first use.
+fn git_cache() -> MutexGuard<'static, GitInfoCache> {
+    GIT_CACHE
+        .get_or_init(|| {
+            let cache = std::fs::read_to_string(get_git_cache_file())
+                .ok()
+                .and_then(|content| serde_json::from_str::<GitInfoCache>(&content).ok())
+                .filter(|cache| cache.version == GIT_CACHE_VERSION)
+                .unwrap_or_else(|| GitInfoCache {
+                    version: GIT_CACHE_VERSION,
+                    entries: HashMap::new(),
+                });
+            Mutex::new(cache)
+        })
+        .lock()
+        .unwrap_or_else(|e| e.into_inner())
+}
+
+/// Writes the git cache to a temporary file and renames it into place.
+async fn save_git_cache() -> Result<()> {
+    let content = serde_json::to_vec(&*git_cache())?;
+    let cache_file = get_git_cache_file();
+    fs::create_dir_all(config::get_config_dir()).await?;
+
+    let tmp_file = cache_file.with_extension("json.tmp");
+    fs::write(&tmp_file, content).await?;
+    fs::rename(&tmp_file, &cache_file).await?;
+    Ok(())
+}
 
+/// Drops the cached git info of a repository, e.g. once it is removed.
+pub fn forget(project_path: &str) {
+    git_cache().entries.remove(project_path);
+}
+
+pub(crate) const FNV_OFFSET_BASIS: u64 = 0xcbf2_9ce4_8422_2325;
+const FNV_PRIME: u64 = 0x0000_0100_0000_01b3;
+
+/// Folds bytes into a 64-bit FNV-1a hash, which is the same on every build
+/// and so safe for anything persisted.
+pub(crate) fn fnv1a(hash: u64, bytes: &[u8]) -> u64 {
+    bytes.iter().fold(hash, |hash, &byte| {
+        (hash ^ byte as u64).wrapping_mul(FNV_PRIME)
+    })
+}
+
+/// Returns a file's mtime in milliseconds since the epoch.
+fn mtime_ms(meta: &std::fs::Metadata) -> i64 {
+    meta.modified()
+        .ok()
+        .and_then(|t| t.duration_since(std::time::UNIX_EPOCH).ok())
+        .map(|d| d.as_millis() as i64)
+        .unwrap_or(0)
+}
+
+/// Computes the fingerprint of an open repository without walking its status.
+#[tracing::instrument(skip_all)]
+fn repo_fingerprint(repo: &Repository, mode: StatusMode) -> RepoFingerprint {
+    let head = repo.head().ok();
+    let head_ref = head.as_ref().and_then(|h| h.name()).map(str::to_string);
+    let head_oid = head
+        .as_ref()
+        .and_then(|h| h.target())
+        .map(|o| o.to_string());
+    let upstream_oid = head
+        .as_ref()
+        .and_then(|h| h.shorthand())
+        .and_then(|b| {
+            repo.refname_to_id(&format!("refs/remotes/origin/{}", b))
+                .ok()
+        })
+        .map(|o| o.to_string());
+
+    diagnostics::count(Counter::Stats, 1);
+    diagnostics::count(Counter::DirReads, 1);
+    let (index_mtime_ms, index_size) = std::fs::metadata(repo.path().join("index"))
+        .map(|meta| (mtime_ms(&meta), meta.len()))
+        .unwrap_or((0, 0));
+
+    let mut workdir_hash = FNV_OFFSET_BASIS;
+    if let Some(Ok(entries)) = repo.workdir().map(std::fs::read_dir) {
+        let mut stamps: Vec<(String, i64)> = entries
+            .filter_map(|entry| entry.ok())
+            .filter(|entry| entry.file_name() != ".git")
+            .filter_map(|entry| {
+                let meta = entry.metadata().ok()?;
+                Some((
+                    entry.file_name().to_string_lossy().to_string(),
+                    mtime_ms(&meta),
+                ))
+            })
+            .collect();
+        stamps.sort();
+        for (name, mtime) in &stamps {
+            // File names never contain NUL, so it separates them unambiguously
+            workdir_hash = fnv1a(workdir_hash, name.as_bytes());
+            workdir_hash = fnv1a(workdir_hash, &[0]);
+            workdir_hash = fnv1a(workdir_hash, &mtime.to_le_bytes());
+        }
+    }
+
+    RepoFingerprint {
+        mode,
+        head_ref,
+        head_oid,
+        upstream_oid,
+        index_mtime_ms,
+        index_size,
+        workdir_hash,
+    }
+}
+
+/// Gets git status, reusing the cached result when the repository's
+/// fingerprint is unchanged. `use_cache` false forces a fresh status walk.
+#[tracing::instrument(skip_all, fields(path = project_path))]
+fn get_git_status_cached(
+    project_path: &str,
+    mode: StatusMode,
+    use_cache: bool,
+    progress: &GitProgress,
+) -> Option<GitInfoData> {
+    repo_pool::with_repo(project_path, |repo| {
+        let fingerprint = progress.phase("fingerprint", || repo_fingerprint(repo, mode));
+
+        if use_cache {
+            if let Some(cached) = git_cache().entries.get(project_path) {
+                if cached.fingerprint == fingerprint {
+                    return Some(cached.info.clone());
+                }
+            }
+        }
+
+        let info = read_git_status(repo, mode, progress)?;
+        git_cache().entries.insert(
+            project_path.to_string(),
+            CachedGitInfo {
+                fingerprint,
+                info: info.clone(),
+            },
+        );
+        Some(info)
+    })
+    .flatten()
+}
+
+/// Reads branch, status, ahead/behind and last commit from an open repository.
+///
+/// Cheap phases run first and are published to `progress` as they finish,
+/// so a read that overruns its budget still has them.
+#[tracing::instrument(skip_all)]
+fn read_git_status(
+    repo: &Repository,
+    mode: StatusMode,
+    progress: &GitProgress,
+) -> Option<GitInfoData> {
     // Get current branch
     let head = repo.head().ok()?;
-    let branch = head.shorthand().unwrap_or("HEAD").to_string();
+    let mut info = GitInfoData {
+        branch: head.shorthand().unwrap_or("HEAD").to_string(),
+        is_dirty: false,
+        uncommitted_changes: 0,
+        ahead_by: 0,
+        behind_by: 0,
+        last_commit_date: None,
+        last_commit_message: None,
+        partial: false,
+    };
 
-    // Get status
-    let statuses = repo.statuses(None).ok()?;
-    let uncommitted_changes = statuses.len();
-    let is_dirty = uncommitted_changes > 0;
+    // Get last commit
+    (info.last_commit_date, info.last_commit_message) =
+        progress.phase("lastCommit", || get_last_commit_info(repo));
+    progress.publish(&info);
 
     // Get ahead/behind
-    let (ahead_by, behind_by) = get_ahead_behind(&repo, &head);
+    (info.ahead_by, info.behind_by) =
+        progress.phase("aheadBehind", || get_ahead_behind(repo, &head));
+    progress.publish(&info);
 
-    // Get last commit
-    let (last_commit_date, last_commit_message) = get_last_commit_info(&repo);
-
-    Some(GitInfoData {
-        branch,
-        is_dirty,
-        uncommitted_changes,
-        ahead_by,
-        behind_by,
-        last_commit_date,
-        last_commit_message,
-    })
+    // Get status
+    diagnostics::count(Counter::StatusWalks, 1);
+    let statuses = progress
+        .phase("status", || {
+            tracing::info_span!("status_walk")
+                .in_scope(|| repo.statuses(Some(&mut status_options(mode))))
+        })
+        .ok()?;
+    info.uncommitted_changes = statuses.len();
+    info.is_dirty = info.uncommitted_changes > 0;
+    progress.publish_status(&info);
+
+    Some(info)
+}
+
+/// Most (local, upstream) commit pairs whose ahead/behind counts are remembered.
+const AHEAD_BEHIND_MEMO_CAPACITY: usize = 4096;
+
+/// Ahead/behind counts keyed by (local oid, upstream oid). Commits never
+/// change, so an entry never goes stale, and forks share entries for
+/// history they share.
+static AHEAD_BEHIND_MEMO: OnceLock<Mutex<HashMap<(git2::Oid, git2::Oid), (usize, usize)>>> =
+    OnceLock::new();
+
+/// Sends git dirs to the background commit-graph writer.
+static COMMIT_GRAPH_WRITER: OnceLock<Mutex<std::sync::mpsc::Sender<PathBuf>>> = OnceLock::new();
+
+/// Git dirs a commit-graph write was queued for this session.
+static COMMIT_GRAPH_QUEUED: OnceLock<Mutex<HashSet<PathBuf>>> = OnceLock::new();
+
+/// Checks whether a repository has a commit-graph, whose generation numbers
+/// libgit2 uses to cut short ahead/behind and merge-base walks.
+fn has_commit_graph(repo: &Repository) -> bool {
+    let info = repo.commondir().join("objects").join("info");
+    info.join("commit-graph").exists()
+        || info
+            .join("commit-graphs")
+            .join("commit-graph-chain")
+            .exists()
+}
+
+/// Queues a commit-graph write for a repository without one, if the
+/// writeCommitGraphs setting is on.
+///
+/// libgit2 can only read commit-graphs, so they are written with the git
+/// CLI, one repository at a time on a background thread.
+pub(crate) fn ensure_commit_graph(repo: &Repository) {
+    if !config::get_write_commit_graphs() || has_commit_graph(repo) {
+        return;
+    }
+    let git_dir = repo.commondir().to_path_buf();
+    let newly_queued = COMMIT_GRAPH_QUEUED
+        .get_or_init(Default::default)
+        .lock()
+        .unwrap_or_else(|e| e.into_inner())
+        .insert(git_dir.clone());
+    if !newly_queued {
+        return;
+    }
+
+    let writer = COMMIT_GRAPH_WRITER.get_or_init(|| {
+        let (tx, rx) = std::sync::mpsc::channel::<PathBuf>();
+        std::thread::spawn(move || {
+            for git_dir in rx {
+                let _span = tracing::info_span!("write_commit_graph").entered();
+                // Best effort: without a graph the walks are just slower
+                let _ = std::process::Command::new("git")
+                    .arg("--git-dir")
+                    .arg(&git_dir)
+                    .args(["commit-graph", "write", "--reachable"])
+                    .stdout(std::process::Stdio::null())
+                    .stderr(std::process::Stdio::null())
+                    .status();
+            }
+        });
+        Mutex::new(tx)
+    });
+    let _ = writer
+        .lock()
+        .unwrap_or_else(|e| e.into_inner())
+        .send(git_dir);
+}
+
+/// Counts commits on `local` but not `upstream` and vice versa, memoized by
+/// the pair.
+fn graph_ahead_behind(
+    repo: &Repository,
+    local: git2::Oid,
+    upstream: git2::Oid,
+) -> Option<(usize, usize)> {
+    let memo = AHEAD_BEHIND_MEMO.get_or_init(Default::default);
+    if let Some(counts) = memo
+        .lock()
+        .unwrap_or_else(|e| e.into_inner())
+        .get(&(local, upstream))
+    {
+        return Some(*counts);
+    }
+
+    ensure_commit_graph(repo);
+    let counts = repo.graph_ahead_behind(local, upstream).ok()?;
+
+    let mut memo = memo.lock().unwrap_or_else(|e| e.into_inner());
+    if memo.len() >= AHEAD_BEHIND_MEMO_CAPACITY {
+        if let Some(evicted) = memo.keys().next().copied() {
+            memo.remove(&evicted);
+        }
+    }
+    memo.insert((local, upstream), counts);
+    Some(counts)
 }
 
 /// Gets the ahead/behind count relative to the upstream branch.
+#[tracing::instrument(skip_all)]
 fn get_ahead_behind(repo: &Repository, head: &git2::Reference) -> (usize, usize) {
     let head_oid = match head.target() {
         Some(oid) => oid,
@@ -119,11 +624,11 @@ fn get_ahead_behind(repo: &Repository, head: &git2::Reference) -> (usize, usize)
         Err(_) => return (0, 0),
     };
 
-    repo.graph_ahead_behind(head_oid, upstream_oid)
-        .unwrap_or((0, 0))
+    graph_ahead_behind(repo, head_oid, upstream_oid).unwrap_or((0, 0))
 }
 
 /// Gets the last commit date and message from the repository.
+#[tracing::instrument(skip_all)]
 fn get_last_commit_info(repo: &Repository) -> (Option<String>, Option<String>) {
     let head = match repo.head() {
         Ok(h) => h,
@@ -144,29 +649,117 @@ fn get_last_commit_info(repo: &Repository) -> (Option<String>, Option<String>) {
     (date, message)
 }
 
-/// Enriches a list of projects with git information concurrently.
-pub async fn enrich_projects_with_git_info(projects: &mut Vec<Project>) {
-    let futures: Vec<_> = projects
+/// Projects whose git info was not complete when enrichment returned.
+#[derive(Debug, Default)]
+pub struct Unfinished {
+    /// Paths whose job was cancelled before it ran.
+    pub cancelled: HashSet<String>,
+    /// Paths whose read overran the time budget and is finishing in the background.
+    pub partial: HashSet<String>,
+}
+
+/// Enriches a list of projects with git information on the git pool.
+///
+/// Repositories whose fingerprint is unchanged are served from the git cache
+/// unless `use_cache` is false. A repository still being read when the
+/// configured time budget runs out gets whatever fields are ready, marked
+/// partial; its read finishes in the background and is announced through the
+/// late result hook.
+pub async fn enrich_projects_with_git_info(
+    projects: &mut Vec<Project>,
+    use_cache: bool,
+) -> Unfinished {
+    enrich_projects_streaming(projects, &[], use_cache, &|_| {}).await
+}
+
+/// Like `enrich_projects_with_git_info`, but calls `on_done` with each
+/// project as soon as its git job finishes.
+///
+/// `limits` optionally holds, per project, a semaphore capping concurrent
+/// git work for the project's root.
+#[tracing::instrument(skip_all, fields(projects = projects.len()))]
+pub async fn enrich_projects_streaming(
+    projects: &mut Vec<Project>,
+    limits: &[Option<Arc<Semaphore>>],
+    use_cache: bool,
+    on_done: &(dyn Fn(&Project) + Send + Sync),
+) -> Unfinished {
+    let pool = git_pool::global();
+    let mode = StatusMode::Quick {
+        include_untracked: !config::get_exclude_untracked(),
+    };
+    let budget = config::get_git_time_budget();
+    let mut pending: FuturesUnordered<_> = projects
         .iter()
-        .map(|p| {
+        .enumerate()
+        .map(|(i, p)| {
+            let id = p.id.clone();
             let path = p.path.clone();
-            let last_modified = p.last_modified.clone();
+            let priority = GitPriority::for_status(&p.status);
+            let limit = limits.get(i).cloned().flatten();
             async move {
-                let git_info = get_git_status(&path).await;
-                let status = determine_project_status(git_info.as_ref(), &last_modified);
-                (git_info, status)
+                // Held until the job finishes, even in the background; a
+                // closed semaphore just means no cap
+                let permit = match limit {
+                    Some(limit) => limit.acquire_owned().await.ok(),
+                    None => None,
+                };
+                let progress = Arc::new(GitProgress::default());
+                let job_progress = Arc::clone(&progress);
+                let (started_tx, started_rx) = oneshot::channel();
+                let job = pool.run(&id, priority, move || {
+                    let _permit = permit;
+                    let _ = started_tx.send(());
+                    let info = get_git_status_cached(&path, mode, use_cache, &job_progress);
+                    job_progress.finish(&path);
+                    info
+                });
+                tokio::pin!(job);
+
+                // The budget starts once the job leaves the queue
+                let outcome = tokio::select! {
+                    outcome = &mut job => outcome,
+                    _ = started_rx => match tokio::time::timeout(budget, &mut job).await {
+                        Ok(outcome) => outcome,
+                        Err(_) => {
+                            if progress.abandon() {
+                                let info = progress.partial();
+                                let partial = info.as_ref().map_or(true, |info| info.partial);
+                                return (i, JobOutcome::Done(info), partial);
+                            }
+                            // Finished right at the deadline; take the full result
+                            job.await
+                        }
+                    },
+                };
+                (i, outcome, false)
             }
         })
         .collect();
 
-    let results: Vec<_> = futures::future::join_all(futures).await;
-
-    for (project, (git_info, status)) in projects.iter_mut().zip(results) {
-        if git_info.is_some() {
-            project.git_info = git_info;
-            project.status = status;
+    let mut unfinished = Unfinished::default();
+    while let Some((i, outcome, partial)) = pending.next().await {
+        let project = &mut projects[i];
+        if partial {
+            unfinished.partial.insert(project.path.clone());
+        }
+        match outcome {
+            JobOutcome::Done(Some(git_info)) => {
+                project.status = determine_project_status(Some(&git_info), &project.last_modified);
+                project.git_info = Some(git_info);
+            }
+            JobOutcome::Done(None) => {}
+            JobOutcome::Cancelled => {
+                unfinished.cancelled.insert(project.path.clone());
+                continue;
+            }
         }
+        on_done(project);
     }
+
+    // The cache only saves work; a failed write just means a slower next refresh
+    let _ = save_git_cache().await;
+    unfinished
 }
 
 /// Gets the git remote URL for a project directory asynchronously.
@@ -179,9 +772,42 @@ pub async fn get_git_remote_url(project_path: &str) -> Option<String> {
         .flatten()
 }
 
+/// Gets git status and remote URL for the detail view from one repository handle.
+///
+/// Uses the full status walk so the detail page shows an exact change count.
+///
+/// Runs at visible priority so an open detail page jumps any queued scan work.
+#[tracing::instrument(skip_all)]
+pub async fn get_git_details(
+    project_id: &str,
+    project_path: &str,
+) -> Option<(GitInfoData, Option<String>)> {
+    let path = project_path.to_string();
+    let job = git_pool::detail_job(project_id);
+
+    let outcome = git_pool::global()
+        .run(&job, GitPriority::Visible, move || {
+            repo_pool::with_repo(&path, |repo| {
+                let git_info = read_git_status(repo, StatusMode::Full, &GitProgress::default())?;
+                Some((git_info, read_remote_url(repo)))
+            })
+            .flatten()
+        })
+        .await;
+
+    match outcome {
+        JobOutcome::Done(details) => details,
+        JobOutcome::Cancelled => None,
+    }
+}
+
 /// Synchronous implementation of git remote URL retrieval.
 fn get_git_remote_url_sync(project_path: &str) -> Option<String> {
-    let repo = Repository::open(project_path).ok()?;
+    repo_pool::with_repo(project_path, read_remote_url).flatten()
+}
+
+/// Reads the origin remote URL from an open repository.
+fn read_remote_url(repo: &Repository) -> Option<String> {
     let remote = repo.find_remote("origin").ok()?;
     let url = remote.url()?.to_string();
 
@@ -0,0 +1,292 @@
+use crate::config;
+use std::cmp::Ordering;
+use std::collections::{BinaryHeap, HashSet};
+use std::sync::{Arc, Condvar, Mutex, MutexGuard, OnceLock};
+use tokio::sync::oneshot;
+
+/// Scheduling priority of a git job; earlier variants run first.
+#[derive(Debug, Clone, Copy, PartialEq, Eq, PartialOrd, Ord)]
+pub enum GitPriority {
+    Visible,
+    Favorite,
+    Recent,
+    Normal,
+    Stale,
+}
+
+impl GitPriority {
+    /// Derives a base priority from a project's preliminary status.
+    pub fn for_status(status: &str) -> Self {
+        match status {
+            "active" | "dirty" => GitPriority::Recent,
+            "stale" => GitPriority::Stale,
+            _ => GitPriority::Normal,
+        }
+    }
+}
+
+/// Result of a pooled job.
+pub enum JobOutcome<T> {
+    Done(T),
+    Cancelled,
+}
+
+struct Job {
+    project_id: String,
+    base: GitPriority,
+    priority: GitPriority,
+    seq: u64,
+    /// Runs the job, or reports cancellation when called with `true`.
+    run: Box<dyn FnOnce(bool) + Send>,
+}
+
+impl PartialEq for Job {
+    fn eq(&self, other: &Self) -> bool {
+        self.priority == other.priority && self.seq == other.seq
+    }
+}
+
+impl Eq for Job {}
+
+impl PartialOrd for Job {
+    fn partial_cmp(&self, other: &Self) -> Option<Ordering> {
+        Some(self.cmp(other))
+    }
+}
+
+impl Ord for Job {
+    // BinaryHeap is a max-heap: the highest priority and oldest job compares greatest
+    fn cmp(&self, other: &Self) -> Ordering {
+        other
+            .priority
+            .cmp(&self.priority)
+            .then_with(|| other.seq.cmp(&self.seq))
+    }
+}
+
+struct Queue {
+    jobs: BinaryHeap<Job>,
+    next_seq: u64,
+    visible: HashSet<String>,
+    favorites: HashSet<String>,
+    target_workers: usize,
+    live_workers: usize,
+}
+
+impl Queue {
+    fn effective_priority(&self, project_id: &str, base: GitPriority) -> GitPriority {
+        if self.visible.contains(project_id) {
+            GitPriority::Visible
+        } else if self.favorites.contains(project_id) {
+            base.min(GitPriority::Favorite)
+        } else {
+            base
+        }
+    }
+}
+
+struct Shared {
+    queue: Mutex<Queue>,
+    ready: Condvar,
+}
+
+impl Shared {
+    fn lock(&self) -> MutexGuard<'_, Queue> {
+        self.queue.lock().unwrap_or_else(|e| e.into_inner())
+    }
+}
+
+/// Dedicated worker pool for libgit2 work.
+///
+/// Keeps git I/O off tokio's blocking pool, caps how many repositories are
+/// walked at once, and runs jobs for visible, favorite and recently active
+/// projects ahead of stale ones.
+pub struct GitPool {
+    shared: Arc<Shared>,
+}
+
+static GLOBAL_POOL: OnceLock<GitPool> = OnceLock::new();
+
+/// Returns the process-wide git pool, sized from settings on first use.
+pub fn global() -> &'static GitPool {
+    GLOBAL_POOL.get_or_init(|| {
+        let concurrency = config::get_git_concurrency()
+            .unwrap_or_else(|| default_concurrency(&config::get_projects_path()));
+        GitPool::new(concurrency)
+    })
+}
+
+/// Queue key for a project's detail-page jobs, so leaving the page cancels
+/// them without dropping the project's scan work.
+pub fn detail_job(project_id: &str) -> String {
+    format!("{project_id}#detail")
+}
+
+/// Queue key for a project's share of the portfolio tally, which outlives
+/// the dashboard page the project was listed on.
+pub fn portfolio_job(project_id: &str) -> String {
+    format!("{project_id}#portfolio")
+}
+
+/// Picks a worker count from the core count and the disk behind the projects root.
+pub fn default_concurrency(projects_path: &str) -> usize {
+    if is_rotational(projects_path) {
+        // Parallel status walks on a spinning disk only add seeks
+        return 2;
+    }
+
+    std::thread::available_parallelism()
+        .map(|n| n.get())
+        .unwrap_or(4)
+        .clamp(2, 8)
+}
+
+/// Checks whether the path lives on a rotational disk (Linux only).
+#[cfg(target_os = "linux")]
+fn is_rotational(path: &str) -> bool {
+    use std::os::unix::fs::MetadataExt;
+
+    let dev = match std::fs::metadata(path) {
+        Ok(meta) => meta.dev(),
+        Err(_) => return false,
+    };
+    let major = ((dev >> 32) & 0xffff_f000) | ((dev >> 8) & 0x0000_0fff);
+    let minor = ((dev >> 12) & 0xffff_ff00) | (dev & 0x0000_00ff);
+    let device = format!("/sys/dev/block/{}:{}", major, minor);
+
+    // Partitions keep the queue attributes on their parent device
+    ["queue/rotational", "../queue/rotational"]
+        .iter()
+        .find_map(|rel| std::fs::read_to_string(format!("{}/{}", device, rel)).ok())
+        .is_some_and(|value| value.trim() == "1")
+}
+
+#[cfg(not(target_os = "linux"))]
+fn is_rotational(_path: &str) -> bool {
+    false
+}
+
+fn worker(shared: Arc<Shared>) {
+    loop {
+        let job = {
+            let mut queue = shared.lock();
+            loop {
+                if queue.live_workers > queue.target_workers {
+                    queue.live_workers -= 1;
+                    return;
+                }
+                if let Some(job) = queue.jobs.pop() {
+                    break job;
+                }
+                queue = shared.ready.wait(queue).unwrap_or_else(|e| e.into_inner());
+            }
+        };
+        (job.run)(false);
+    }
+}
+
+impl GitPool {
+    /// Creates a pool with the given number of worker threads.
+    pub fn new(concurrency: usize) -> Self {
+        let pool = Self {
+            shared: Arc::new(Shared {
+                queue: Mutex::new(Queue {
+                    jobs: BinaryHeap::new(),
+                    next_seq: 0,
+                    visible: HashSet::new(),
+                    favorites: HashSet::new(),
+                    target_workers: 0,
+                    live_workers: 0,
+                }),
+                ready: Condvar::new(),
+            }),
+        };
+        pool.set_concurrency(concurrency);
+        pool
+    }
+
+    /// Grows or shrinks the worker count; surplus workers exit once idle.
+    pub fn set_concurrency(&self, concurrency: usize) {
+        let mut queue = self.shared.lock();
+        queue.target_workers = concurrency.max(1);
+
+        while queue.live_workers < queue.target_workers {
+            queue.live_workers += 1;
+            let shared = Arc::clone(&self.shared);
+            std::thread::Builder::new()
+                .name("git-pool".to_string())
+                .spawn(move || worker(shared))
+                .expect("failed to spawn git pool worker");
+        }
+
+        self.shared.ready.notify_all();
+    }
+
+    /// Runs a job on the pool and waits for its result.
+    pub async fn run<T, F>(&self, project_id: &str, base: GitPriority, f: F) -> JobOutcome<T>
+    where
+        T: Send + 'static,
+        F: FnOnce() -> T + Send + 'static,
+    {
+        let (tx, rx) = oneshot::channel();
+        let run = Box::new(move |cancelled: bool| {
+            let outcome = if cancelled {
+                JobOutcome::Cancelled
+            } else {
+                JobOutcome::Done(f())
+            };
+            let _ = tx.send(outcome);
+        });
+
+        {
+            let mut queue = self.shared.lock();
+            let seq = queue.next_seq;
+            queue.next_seq += 1;
+            let priority = queue.effective_priority(project_id, base);
+            queue.jobs.push(Job {
+                project_id: project_id.to_string(),
+                base,
+                priority,
+                seq,
+                run,
+            });
+        }
+        self.shared.ready.notify_one();
+
+        rx.await.unwrap_or(JobOutcome::Cancelled)
+    }
+
+    /// Updates the visible and favorite projects and reorders queued jobs.
+    ///
+    /// Projects that scrolled out of view drop back to their base priority.
+    pub fn set_priorities(&self, visible: Vec<String>, favorites: Vec<String>) {
+        let mut queue = self.shared.lock();
+        queue.visible = visible.into_iter().collect();
+        queue.favorites = favorites.into_iter().collect();
+
+        let mut jobs = std::mem::take(&mut queue.jobs).into_vec();
+        for job in &mut jobs {
+            job.priority = queue.effective_priority(&job.project_id, job.base);
+        }
+        queue.jobs = jobs.into();
+    }
+
+    /// Cancels queued jobs for the given projects. Running jobs finish normally.
+    pub fn cancel(&self, project_ids: &[String]) -> usize {
+        let cancelled: Vec<Job> = {
+            let mut queue = self.shared.lock();
+            let (cancelled, kept): (Vec<Job>, Vec<Job>) = std::mem::take(&mut queue.jobs)
+                .into_vec()
+                .into_iter()
+                .partition(|job| project_ids.contains(&job.project_id));
+            queue.jobs = kept.into();
+            cancelled
+        };
+
+        let count = cancelled.len();
+        for job in cancelled {
+            (job.run)(true);
+        }
+        count
+    }
+}
@@ -0,0 +1,331 @@
+use crate::config;
+use crate::git;
+use crate::git_pool::{self, GitPriority, JobOutcome};
+use crate::repo_pool;
+use anyhow::Result;
+use futures::stream::{FuturesUnordered, StreamExt};
+use git2::{Oid, Repository, Sort};
+use serde::{Deserialize, Serialize};
+use std::collections::{BTreeMap, HashMap};
+use std::path::PathBuf;
+use std::sync::{Mutex, MutexGuard, OnceLock};
+use tokio::fs;
+
+/// Bumped whenever the cache layout changes.
+const HISTORY_CACHE_VERSION: u32 = 1;
+
+/// Weeks of commit counts reported, the current week included.
+const WEEKS: i64 = 52;
+
+/// Authors listed per repository and across the portfolio.
+const TOP_AUTHORS: usize = 5;
+
+const SECS_PER_DAY: i64 = 24 * 60 * 60;
+
+/// Commits by one author, keyed in tallies by lowercased email.
+#[derive(Debug, Clone, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+pub struct AuthorCommits {
+    /// Name on the author's most recently counted commit.
+    pub name: String,
+    pub email: String,
+    pub commits: u64,
+}
+
+/// Running totals of a repository's HEAD history as of `tip`.
+#[derive(Debug, Clone, Default, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+struct HistoryTally {
+    tip: String,
+    total_commits: u64,
+    first_commit_secs: Option<i64>,
+    /// Commits per day, keyed by days since the Unix epoch (UTC). Days
+    /// before the reported window are dropped.
+    daily: BTreeMap<i64, u32>,
+    authors: HashMap<String, AuthorCommits>,
+}
+
+/// History cache persisted to ~/.organizeme/history-cache.json.
+#[derive(Debug, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+struct HistoryCache {
+    version: u32,
+    /// Keyed by absolute repository path.
+    repos: HashMap<String, HistoryTally>,
+}
+
+/// Commit activity of one repository's current branch.
+#[derive(Debug, Clone, Serialize)]
+#[serde(rename_all = "camelCase")]
+pub struct CommitActivity {
+    /// Monday the first week starts on, as YYYY-MM-DD (UTC).
+    pub start_date: String,
+    /// Commits per week, oldest first; the last entry is the current week.
+    pub weekly_commits: Vec<u32>,
+    pub top_authors: Vec<AuthorCommits>,
+    pub first_commit_date: Option<String>,
+    pub total_commits: u64,
+}
+
+/// Commit activity summed across every repository, for the portfolio heatmap.
+#[derive(Debug, Clone, Serialize)]
+#[serde(rename_all = "camelCase")]
+pub struct PortfolioActivity {
+    /// Monday the first day falls on, as YYYY-MM-DD (UTC).
+    pub start_date: String,
+    /// Commits per day from `start_date` through today.
+    pub daily_commits: Vec<u32>,
+    pub top_authors: Vec<AuthorCommits>,
+    pub total_commits: u64,
+    /// Repositories whose history was read.
+    pub repositories: usize,
+}
+
+static HISTORY_CACHE: OnceLock<Mutex<HistoryCache>> = OnceLock::new();
+
+/// Returns the path to the history cache file.
+fn get_history_cache_file() -> PathBuf {
+    config::get_config_dir().join("history-cache.json")
+}
+
+/// Locks the process-wide history cache, loading it from disk on first use.
+fn history_cache() -> MutexGuard<'static, HistoryCache> {
+    HISTORY_CACHE
+        .get_or_init(|| {
+            let cache = std::fs::read_to_string(get_history_cache_file())
+                .ok()
+                .and_then(|content| serde_json::from_str::<HistoryCache>(&content).ok())
+                .filter(|cache| cache.version == HISTORY_CACHE_VERSION)
+                .unwrap_or_else(|| HistoryCache {
+                    version: HISTORY_CACHE_VERSION,
+                    repos: HashMap::new(),
+                });
+            Mutex::new(cache)
+        })
+        .lock()
+        .unwrap_or_else(|e| e.into_inner())
+}
+
+/// Writes the history cache to a temporary file and renames it into place.
+async fn save_history_cache() -> Result<()> {
+    let content = serde_json::to_vec(&*history_cache())?;
+    let cache_file = get_history_cache_file();
+    fs::create_dir_all(config::get_config_dir()).await?;
+
+    let tmp_file = cache_file.with_extension("json.tmp");
+    fs::write(&tmp_file, content).await?;
+    fs::rename(&tmp_file, &cache_file).await?;
+    Ok(())
+}
+
+/// Drops the cached history of a repository, e.g. once it is removed.
+pub fn forget(path: &str) {
+    history_cache().repos.remove(path);
+}
+
+/// Returns the first day of the reported window: the Monday `WEEKS - 1`
+/// weeks before the current week's.
+fn window_start_day() -> i64 {
+    let today = chrono::Utc::now().timestamp().div_euclid(SECS_PER_DAY);
+    // Day 0 (1970-01-01) was a Thursday
+    let monday = today - (today + 3).rem_euclid(7);
+    monday - 7 * (WEEKS - 1)
+}
+
+fn format_day(day: i64) -> String {
+    chrono::DateTime::from_timestamp(day * SECS_PER_DAY, 0)
+        .map(|d| d.format("%Y-%m-%d").to_string())
+        .unwrap_or_default()
+}
+
+/// Sorts authors by commit count and keeps the first `TOP_AUTHORS`.
+fn top_authors(authors: impl Iterator<Item = AuthorCommits>) -> Vec<AuthorCommits> {
+    let mut authors: Vec<AuthorCommits> = authors.collect();
+    authors.sort_by(|a, b| b.commits.cmp(&a.commits).then_with(|| a.name.cmp(&b.name)));
+    authors.truncate(TOP_AUTHORS);
+    authors
+}
+
+impl HistoryTally {
+    /// Counts one commit by its author date.
+    fn add(&mut self, commit: &git2::Commit, start_day: i64) {
+        let author = commit.author();
+        let secs = author.when().seconds();
+
+        self.total_commits += 1;
+        self.first_commit_secs = Some(self.first_commit_secs.map_or(secs, |first| first.min(secs)));
+
+        let day = secs.div_euclid(SECS_PER_DAY);
+        if day >= start_day {
+            *self.daily.entry(day).or_default() += 1;
+        }
+
+        let name = author.name().unwrap_or("Unknown").to_string();
+        let email = author.email().unwrap_or_default().to_lowercase();
+        let key = if email.is_empty() {
+            name.clone()
+        } else {
+            email.clone()
+        };
+        let entry = self.authors.entry(key).or_insert_with(|| AuthorCommits {
+            name: String::new(),
+            email,
+            commits: 0,
+        });
+        entry.commits += 1;
+        // Commits are counted oldest first, so the last name seen is the latest
+        entry.name = name;
+    }
+
+    fn activity(&self, start_day: i64) -> CommitActivity {
+        let mut weekly_commits = vec![0u32; WEEKS as usize];
+        for (&day, &commits) in self.daily.range(start_day..) {
+            if let Some(week) = weekly_commits.get_mut(((day - start_day) / 7) as usize) {
+                *week += commits;
+            }
+        }
+
+        CommitActivity {
+            start_date: format_day(start_day),
+            weekly_commits,
+            top_authors: top_authors(self.authors.values().cloned()),
+            first_commit_date: self
+                .first_commit_secs
+                .and_then(|secs| chrono::DateTime::from_timestamp(secs, 0))
+                .map(|d| d.to_rfc3339()),
+            total_commits: self.total_commits,
+        }
+    }
+}
+
+/// Brings a tally up to HEAD, walking only commits since the cached tip when
+/// HEAD still descends from it. Returns None for repositories without commits.
+#[tracing::instrument(skip_all)]
+fn tally_history(
+    repo: &Repository,
+    cached: Option<HistoryTally>,
+    start_day: i64,
+) -> Option<HistoryTally> {
+    let tip = repo.head().ok()?.peel_to_commit().ok()?.id();
+
+    let cached_tip = cached
+        .as_ref()
+        .and_then(|tally| Oid::from_str(&tally.tip).ok());
+    if cached_tip != Some(tip) {
+        git::ensure_commit_graph(repo);
+    }
+    let (mut tally, hide) = match (cached, cached_tip) {
+        (Some(tally), Some(old)) if old == tip => (tally, None),
+        // A rewritten or switched branch drops commits, so it starts over
+        (Some(tally), Some(old)) if repo.graph_descendant_of(tip, old).unwrap_or(false) => {
+            (tally, Some(old))
+        }
+        _ => (HistoryTally::default(), None),
+    };
+
+    if tally.tip != tip.to_string() {
+        let mut walk = repo.revwalk().ok()?;
+        walk.set_sorting(Sort::TIME | Sort::REVERSE).ok()?;
+        walk.push(tip).ok()?;
+        if let Some(old) = hide {
+            walk.hide(old).ok()?;
+        }
+        for oid in walk.filter_map(|oid| oid.ok()) {
+            if let Ok(commit) = repo.find_commit(oid) {
+                tally.add(&commit, start_day);
+            }
+        }
+        tally.tip = tip.to_string();
+    }
+
+    // The window slides forward each week
+    tally.daily = tally.daily.split_off(&start_day);
+    Some(tally)
+}
+
+/// Reads a repository's history tally, updating the cache.
+fn read_tally(path: &str, start_day: i64) -> Option<HistoryTally> {
+    let cached = history_cache().repos.remove(path);
+    let tally =
+        repo_pool::with_repo(path, |repo| tally_history(repo, cached, start_day)).flatten()?;
+    history_cache()
+        .repos
+        .insert(path.to_string(), tally.clone());
+    Some(tally)
+}
+
+/// Gets commit activity for the detail view.
+///
+/// Runs at visible priority so an open detail page jumps any queued scan work.
+#[tracing::instrument(skip_all)]
+pub async fn get_commit_activity(project_id: &str, project_path: &str) -> Option<CommitActivity> {
+    let path = project_path.to_string();
+    let start_day = window_start_day();
+    let job = git_pool::detail_job(project_id);
+
+    let outcome = git_pool::global()
+        .run(&job, GitPriority::Visible, move || {
+            read_tally(&path, start_day).map(|tally| tally.activity(start_day))
+        })
+        .await;
+
+    // The cache only saves work; a failed write just means a longer next walk
+    let _ = save_history_cache().await;
+    match outcome {
+        JobOutcome::Done(activity) => activity,
+        JobOutcome::Cancelled => None,
+    }
+}
+
+/// Sums commit activity across repositories, given as (project id, path) pairs.
+#[tracing::instrument(skip_all, fields(repos = repos.len()))]
+pub async fn get_portfolio_activity(repos: Vec<(String, String)>) -> PortfolioActivity {
+    let start_day = window_start_day();
+    let pool = git_pool::global();
+
+    let mut jobs: FuturesUnordered<_> = repos
+        .into_iter()
+        .map(|(id, path)| async move {
+            let job = git_pool::portfolio_job(&id);
+            pool.run(&job, GitPriority::Normal, move || {
+                read_tally(&path, start_day)
+            })
+            .await
+        })
+        .collect();
+
+    let today = chrono::Utc::now().timestamp().div_euclid(SECS_PER_DAY);
+    let mut daily_commits = vec![0u32; (today - start_day + 1) as usize];
+    let mut authors: HashMap<String, AuthorCommits> = HashMap::new();
+    let mut total_commits = 0;
+    let mut repositories = 0;
+
+    while let Some(outcome) = jobs.next().await {
+        let JobOutcome::Done(Some(tally)) = outcome else {
+            continue;
+        };
+        repositories += 1;
+        total_commits += tally.total_commits;
+        for (&day, &commits) in &tally.daily {
+            if let Some(slot) = daily_commits.get_mut((day - start_day) as usize) {
+                *slot += commits;
+            }
+        }
+        for (key, author) in tally.authors {
+            authors
+                .entry(key)
+                .and_modify(|total| total.commits += author.commits)
+                .or_insert(author);
+        }
+    }
+
+    // The cache only saves work; a failed write just means a longer next walk
+    let _ = save_history_cache().await;
+    PortfolioActivity {
+        start_date: format_day(start_day),
+        daily_commits,
+        top_authors: top_authors(authors.into_values()),
+        total_commits,
+        repositories,
+    }
+}
@@ -0,0 +1,383 @@
+use crate::activity;
+use crate::config;
+use crate::diagnostics::{self, Counter};
+use crate::git;
+use crate::scanner::{self, Project, ProjectDir, ScanRoot};
+use anyhow::Result;
+use serde::{Deserialize, Serialize};
+use std::collections::{HashMap, HashSet};
+use std::path::PathBuf;
+use tokio::fs;
+
+/// Bumped whenever the on-disk layout or the meaning of a fingerprint changes.
+const INDEX_VERSION: u32 = 3;
+
+/// Identity of a project directory at the time it was probed.
+#[derive(Debug, Clone, PartialEq, Eq, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+pub struct DirStamp {
+    pub mtime_ms: i64,
+    pub inode: u64,
+    /// Newest mtime anywhere in the project tree, see `activity::last_activity_ms`.
+    pub activity_ms: Option<i64>,
+}
+
+/// A cached project record together with the fingerprints it was computed from.
+#[derive(Debug, Clone, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+pub struct IndexEntry {
+    pub project: Project,
+    pub is_project: bool,
+    pub dir_stamp: DirStamp,
+    pub git_fingerprint: Option<String>,
+    /// When the directory was probed, in milliseconds since the epoch. Of two
+    /// records written concurrently, the one probed later wins.
+    #[serde(default)]
+    pub probed_at_ms: i64,
+}
+
+/// Freshly probed records, not yet stored in an index.
+pub struct Probed {
+    /// Entries to store; cancelled reads are left out.
+    pub entries: Vec<IndexEntry>,
+    /// Every probed project, including those left out of `entries`.
+    pub projects: Vec<Project>,
+}
+
+/// What `ScanIndex::merge_live` kept from the live index.
+#[derive(Default)]
+pub struct Merged {
+    /// Records written by other writers after the scan probed them.
+    pub newer: HashMap<String, Project>,
+    /// Paths removed from the live index while the scan ran.
+    pub removed: HashSet<String>,
+}
+
+/// Persistent scan index stored in ~/.organizeme/scan-index.json.
+#[derive(Debug, Clone, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+pub struct ScanIndex {
+    pub version: u32,
+    /// Paths of the roots the index was built from, in configured order.
+    pub roots: Vec<String>,
+    pub scanned_at: Option<String>,
+    /// Entries keyed by absolute project path.
+    pub entries: HashMap<String, IndexEntry>,
+}
+
+/// Progress notifications emitted while a scan runs.
+pub enum ScanEvent<'a> {
+    /// The root was listed; `pending_git` directories need git enrichment.
+    Listed { total: usize, pending_git: usize },
+    /// Filesystem records, possibly still awaiting git info.
+    Records(&'a [Project]),
+    /// A project's git enrichment finished.
+    GitDone(&'a Project),
+}
+
+/// Returns the path to the scan index file.
+fn get_index_file() -> PathBuf {
+    config::get_config_dir().join("scan-index.json")
+}
+
+/// Builds a directory stamp from filesystem metadata and the tree's last activity.
+fn dir_stamp(meta: &std::fs::Metadata, activity_ms: Option<i64>) -> DirStamp {
+    let mtime_ms = meta
+        .modified()
+        .ok()
+        .and_then(|t| t.duration_since(std::time::UNIX_EPOCH).ok())
+        .map(|d| d.as_millis() as i64)
+        .unwrap_or(0);
+
+    #[cfg(unix)]
+    let inode = {
+        use std::os::unix::fs::MetadataExt;
+        meta.ino()
+    };
+    #[cfg(not(unix))]
+    let inode = 0;
+
+    DirStamp {
+        mtime_ms,
+        inode,
+        activity_ms,
+    }
+}
+
+/// Stats each candidate directory, walks it for its last activity and
+/// fingerprints its git state.
+#[tracing::instrument(skip_all, fields(dirs = dirs.len()))]
+async fn stamp_dirs(dirs: Vec<ProjectDir>) -> Vec<(ProjectDir, DirStamp, Option<String>)> {
+    let span = tracing::Span::current();
+    tokio::task::spawn_blocking(move || {
+        let _span = span.enter();
+        dirs.into_iter()
+            .filter_map(|dir| {
+                diagnostics::count(Counter::Stats, 1);
+                let meta = std::fs::metadata(&dir.path).ok()?;
+                let stamp = dir_stamp(&meta, activity::last_activity_ms(&dir.path));
+                let fingerprint = git::git_fingerprint(&dir.path.to_string_lossy());
+                Some((dir, stamp, fingerprint))
+            })
+            .collect()
+    })
+    .await
+    .unwrap_or_default()
+}
+
+/// Probes stamped directories and enriches them with git info.
+#[tracing::instrument(name = "probe_stamped", skip_all, fields(dirs = stamped.len()))]
+async fn probe(
+    stamped: Vec<(ProjectDir, DirStamp, Option<String>)>,
+    use_git_cache: bool,
+    observer: &(dyn Fn(ScanEvent<'_>) + Send + Sync),
+) -> Probed {
+    let mut probed = Vec::new();
+    let mut stamps = Vec::new();
+    let mut limits = Vec::new();
+    for (dir, stamp, fingerprint) in stamped {
+        let probed_at_ms = chrono::Utc::now().timestamp_millis();
+        if let Ok((project, is_project)) = scanner::probe_project(&dir).await {
+            probed.push(project);
+            stamps.push((is_project, stamp, fingerprint, probed_at_ms));
+            limits.push(dir.git_limit);
+        }
+    }
+
+    activity::schedule_save();
+
+    observer(ScanEvent::Records(&probed));
+
+    let on_git_done = |project: &Project| observer(ScanEvent::GitDone(project));
+    let unfinished =
+        git::enrich_projects_streaming(&mut probed, &limits, use_git_cache, &on_git_done).await;
+
+    let mut result = Probed {
+        entries: Vec::new(),
+        projects: Vec::new(),
+    };
+    for (project, (is_project, dir_stamp, git_fingerprint, probed_at_ms)) in
+        probed.into_iter().zip(stamps)
+    {
+        let mut entry = IndexEntry {
+            project,
+            is_project,
+            dir_stamp,
+            git_fingerprint,
+            probed_at_ms,
+        };
+        result.projects.push(entry.to_project());
+
+        // Cancelled git work leaves the record incomplete; keep it out of
+        // the index so the next scan probes it again
+        if unfinished.cancelled.contains(&entry.project.path) {
+            continue;
+        }
+        // A partial record is served until its read finishes, but without
+        // a fingerprint so the next scan does not trust it
+        if unfinished.partial.contains(&entry.project.path) {
+            entry.git_fingerprint = None;
+        }
+        result.entries.push(entry);
+    }
+    result
+}
+
+impl IndexEntry {
+    /// Returns the cached project with its time-relative status recomputed.
+    fn to_project(&self) -> Project {
+        let mut project = self.project.clone();
+        project.status = match &project.git_info {
+            Some(info) => git::determine_project_status(Some(info), &project.last_modified),
+            None => scanner::initial_status(&project.last_modified, self.is_project),
+        };
+        project
+    }
+}
+
+impl ScanIndex {
+    /// Creates an empty index for the given projects roots.
+    pub fn new(roots: &[String]) -> Self {
+        Self {
+            version: INDEX_VERSION,
+            roots: roots.to_vec(),
+            scanned_at: None,
+            entries: HashMap::new(),
+        }
+    }
+
+    /// Loads the index from disk, discarding it if it is unreadable, from an
+    /// older version, or was built for a different set of roots.
+    #[tracing::instrument(name = "load_index", skip_all)]
+    pub async fn load(roots: &[String]) -> Self {
+        let index = match fs::read_to_string(get_index_file()).await {
+            Ok(content) => serde_json::from_str::<ScanIndex>(&content).ok(),
+            Err(_) => None,
+        };
+
+        match index {
+            Some(index) if index.version == INDEX_VERSION && index.roots == roots => index,
+            _ => Self::new(roots),
+        }
+    }
+
+    /// Writes the index to a temporary file and renames it into place.
+    #[tracing::instrument(name = "save_index", skip_all)]
+    pub async fn save(&self) -> Result<()> {
+        let index_file = get_index_file();
+        fs::create_dir_all(config::get_config_dir()).await?;
+
+        let tmp_file = index_file.with_extension("json.tmp");
+        let content = serde_json::to_vec(self)?;
+        fs::write(&tmp_file, content).await?;
+        fs::rename(&tmp_file, &index_file).await?;
+        Ok(())
+    }
+
+    /// Returns all cached projects without touching the filesystem.
+    pub fn projects(&self) -> Vec<Project> {
+        self.entries.values().map(IndexEntry::to_project).collect()
+    }
+
+    /// Probes stamped directories and stores the resulting entries.
+    async fn probe_stamped(
+        &mut self,
+        stamped: Vec<(ProjectDir, DirStamp, Option<String>)>,
+        use_git_cache: bool,
+        observer: &(dyn Fn(ScanEvent<'_>) + Send + Sync),
+    ) -> Vec<Project> {
+        let probed = probe(stamped, use_git_cache, observer).await;
+        for entry in probed.entries {
+            self.entries.insert(entry.project.path.clone(), entry);
+        }
+        probed.projects
+    }
+
+    /// Re-probes the given directories unconditionally, returning their fresh records.
+    ///
+    /// With `use_git_cache` false the git status is walked even when the
+    /// repository's fingerprint is unchanged.
+    pub async fn refresh_dirs(
+        &mut self,
+        dirs: Vec<ProjectDir>,
+        use_git_cache: bool,
+    ) -> Vec<Project> {
+        let stamped = stamp_dirs(dirs).await;
+        self.probe_stamped(stamped, use_git_cache, &|_| {}).await
+    }
+
+    /// Re-probes directories like `refresh_dirs`, but without an index, so
+    /// the caller need not hold one while the probes run. Store the result
+    /// with `insert_newer`.
+    pub async fn probe_dirs(dirs: Vec<ProjectDir>, use_git_cache: bool) -> Probed {
+        let stamped = stamp_dirs(dirs).await;
+        probe(stamped, use_git_cache, &|_| {}).await
+    }
+
+    /// Stores probed entries, except where the index already holds a record
+    /// probed later.
+    pub fn insert_newer(&mut self, entries: Vec<IndexEntry>) {
+        for entry in entries {
+            let newer = self
+                .entries
+                .get(&entry.project.path)
+                .is_some_and(|current| current.probed_at_ms > entry.probed_at_ms);
+            if !newer {
+                self.entries.insert(entry.project.path.clone(), entry);
+            }
+        }
+    }
+
+    /// Folds writes made to the live index while a scan ran on a copy of it.
+    ///
+    /// `snapshot` holds the paths the copy started with and `started_ms` when
+    /// the scan began. Records the live index probed after the scan did are
+    /// kept, as are ones added since the scan began; paths removed from the
+    /// live index meanwhile stay removed.
+    pub fn merge_live(
+        &mut self,
+        live: &ScanIndex,
+        snapshot: &HashSet<String>,
+        started_ms: i64,
+    ) -> Merged {
+        let mut merged = Merged::default();
+
+        for path in snapshot {
+            if !live.entries.contains_key(path) && self.entries.remove(path).is_some() {
+                merged.removed.insert(path.clone());
+            }
+        }
+
+        for (path, entry) in &live.entries {
+            let newer = match self.entries.get(path) {
+                Some(scanned) => entry.probed_at_ms > scanned.probed_at_ms,
+                None => entry.probed_at_ms >= started_ms,
+            };
+            if newer {
+                merged.newer.insert(path.clone(), entry.to_project());
+                self.entries.insert(path.clone(), entry.clone());
+            }
+        }
+        merged
+    }
+
+    /// Removes the entry for a project path, returning its project id.
+    pub fn remove_path(&mut self, path: &str) -> Option<String> {
+        self.entries.remove(path).map(|entry| entry.project.id)
+    }
+
+    /// Rescans the projects roots, re-probing only directories whose directory
+    /// stamp or git fingerprint changed since the last scan. With `force` every
+    /// directory is re-probed and the git cache is bypassed.
+    pub async fn rescan(&mut self, roots: &[ScanRoot], force: bool) -> Result<Vec<Project>> {
+        self.rescan_observed(roots, force, &|_| {}).await
+    }
+
+    /// Rescans like `rescan`, reporting records and git results to `observer`
+    /// as they become available.
+    #[tracing::instrument(name = "rescan", skip_all, fields(force = force))]
+    pub async fn rescan_observed(
+        &mut self,
+        roots: &[ScanRoot],
+        force: bool,
+        observer: &(dyn Fn(ScanEvent<'_>) + Send + Sync),
+    ) -> Result<Vec<Project>> {
+        let dirs = scanner::discover_roots(roots).await?.projects;
+        let stamped = stamp_dirs(dirs).await;
+
+        let mut previous = std::mem::take(&mut self.entries);
+        let mut projects = Vec::new();
+        let mut changed = Vec::new();
+
+        for (dir, stamp, fingerprint) in stamped {
+            let key = dir.path.to_string_lossy().to_string();
+            match previous.remove(&key) {
+                Some(entry)
+                    if !force
+                        && entry.dir_stamp == stamp
+                        && entry.git_fingerprint == fingerprint =>
+                {
+                    projects.push(entry.to_project());
+                    self.entries.insert(key, entry);
+                }
+                _ => changed.push((dir, stamp, fingerprint)),
+            }
+        }
+
+        // Directories that are gone take their cached git info with them
+        for path in previous.keys() {
+            git::forget(path);
+        }
+
+        observer(ScanEvent::Listed {
+            total: projects.len() + changed.len(),
+            pending_git: changed.len(),
+        });
+        observer(ScanEvent::Records(&projects));
+
+        projects.extend(self.probe_stamped(changed, !force, observer).await);
+
+        self.scanned_at = Some(chrono::Utc::now().to_rfc3339());
+        Ok(projects)
+    }
+}
@@ -1,11 +1,38 @@
+mod activity;
+#[cfg(feature = "bench")]
+#[doc(hidden)]
+pub mod bench_support;
 mod config;
+mod detect;
+mod diagnostics;
 mod git;
+mod git_pool;
+mod history;
+mod index;
+mod markdown;
+mod registry;
+mod repo_pool;
 mod scanner;
+mod scheduler;
 mod shell;
+mod summary;
 mod tags;
+mod watcher;
 
-use scanner::ScanOptions;
+use config::ConfigService;
+use index::ScanEvent;
+use registry::ProjectRegistry;
+use scanner::ScanRoot;
 use serde::{Deserialize, Serialize};
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::Arc;
+use summary::ProjectSummaryList;
+use tags::TagStore;
+use tauri::ipc::Channel;
+use tauri::{Manager, State};
+
+/// Maximum number of project records sent in one stream message.
+const RECORD_BATCH_SIZE: usize = 200;
 
 #[derive(Debug, Serialize, Deserialize)]
 #[serde(rename_all = "camelCase")]
@@ -15,12 +42,35 @@ pub struct ProjectListResponse {
     pub scanned_at: String,
 }
 
+/// Messages streamed to the frontend while a scan runs.
+#[derive(Debug, Clone, Serialize)]
+#[serde(rename_all = "camelCase", tag = "event", content = "data")]
+pub enum ScanStreamEvent {
+    #[serde(rename_all = "camelCase")]
+    Started { total: usize, pending_git: usize },
+    /// A batch of compact records; each batch carries its own string tables.
+    Records(ProjectSummaryList),
+    #[serde(rename_all = "camelCase")]
+    GitPatch {
+        id: String,
+        status: String,
+        git_info: Option<scanner::GitInfoData>,
+        done: usize,
+        pending: usize,
+    },
+    #[serde(rename_all = "camelCase")]
+    Finished { total: usize, scanned_at: String },
+}
+
 #[derive(Debug, Serialize, Deserialize)]
 #[serde(rename_all = "camelCase")]
 pub struct RefreshResult {
     pub success: bool,
     pub message: String,
     pub project_count: Option<usize>,
+    /// The refreshed projects, so callers need no follow-up fetch.
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub projects: Option<Vec<scanner::Project>>,
 }
 
 #[derive(Debug, Serialize, Deserialize)]
@@ -38,213 +88,539 @@ pub struct TagResult {
     pub tags: Option<Vec<String>>,
 }
 
+/// Attaches tags to each project and sorts by last_modified descending.
+async fn build_list_response(
+    tag_store: &TagStore,
+    mut projects: Vec<scanner::Project>,
+    scanned_at: String,
+) -> ProjectListResponse {
+    tag_store.attach(&mut projects).await;
+
+    // Sort by last_modified descending
+    projects.sort_by(|a, b| b.last_modified.cmp(&a.last_modified));
+
+    let total = projects.len();
+    ProjectListResponse {
+        projects,
+        total,
+        scanned_at,
+    }
+}
+
 #[tauri::command]
-async fn get_projects() -> Result<ProjectListResponse, String> {
-    let projects_path = config::get_projects_path();
-    let options = ScanOptions::default();
-
-    match scanner::scan_directory(&projects_path, &options).await {
-        Ok(mut projects) => {
-            // Enrich with git info
-            git::enrich_projects_with_git_info(&mut projects).await;
-
-            // Load tags for each project
-            for project in &mut projects {
-                if let Ok(project_tags) = tags::get_project_tags(&project.id).await {
-                    project.tags = Some(project_tags);
-                }
-            }
+#[tracing::instrument(skip_all)]
+async fn get_cached_projects(
+    registry: State<'_, ProjectRegistry>,
+    tag_store: State<'_, TagStore>,
+) -> Result<ProjectListResponse, String> {
+    let (projects, scanned_at) = registry.cached().await;
+    Ok(build_list_response(&tag_store, projects, scanned_at.unwrap_or_default()).await)
+}
+
+/// Looks up a project's directory by id.
+///
+/// An unknown id rescans once, since the registry may predate the project,
+/// e.g. on a cold start before the first scan finished.
+async fn find_project_dir(
+    registry: &ProjectRegistry,
+    id: &str,
+) -> Result<Option<scanner::ProjectDir>, String> {
+    if let Some(dir) = registry.dir_for(id).await {
+        return Ok(Some(dir));
+    }
+    registry
+        .rescan(&ScanRoot::configured(), false)
+        .await
+        .map_err(|e| format!("Failed to find project: {}", e))?;
+    Ok(registry.dir_for(id).await)
+}
 
-            // Sort by last_modified descending
-            projects.sort_by(|a, b| b.last_modified.cmp(&a.last_modified));
+/// Returns the paths of the scan roots, longest first so nested roots win
+/// when paths are made relative.
+fn root_paths(roots: &[ScanRoot]) -> Vec<String> {
+    let mut paths: Vec<String> = roots.iter().map(|root| root.path.clone()).collect();
+    paths.sort_by_key(|path| std::cmp::Reverse(path.len()));
+    paths
+}
+
+/// Lists projects in the compact dashboard format.
+///
+/// Without `refresh` this serves the scan index as-is; with it the roots are
+/// rescanned incrementally first. Full records come from `get_project`.
+#[tauri::command]
+#[tracing::instrument(skip_all)]
+async fn get_project_summaries(
+    registry: State<'_, ProjectRegistry>,
+    tag_store: State<'_, TagStore>,
+    refresh: bool,
+) -> Result<ProjectSummaryList, String> {
+    let roots = ScanRoot::configured();
+
+    let (mut projects, scanned_at) = if refresh {
+        let projects = registry
+            .rescan(&roots, false)
+            .await
+            .map_err(|e| format!("Failed to scan projects: {}", e))?;
+        (projects, Some(chrono::Utc::now().to_rfc3339()))
+    } else {
+        registry.cached().await
+    };
+
+    tag_store.attach(&mut projects).await;
+    projects.sort_by(|a, b| b.last_modified.cmp(&a.last_modified));
+
+    Ok(summary::summarize(
+        &projects,
+        &root_paths(&roots),
+        scanned_at.as_deref(),
+    ))
+}
 
-            let total = projects.len();
-            Ok(ProjectListResponse {
-                projects,
-                total,
-                scanned_at: chrono::Utc::now().to_rfc3339(),
-            })
+#[tauri::command]
+#[tracing::instrument(skip_all)]
+async fn get_projects(
+    registry: State<'_, ProjectRegistry>,
+    tag_store: State<'_, TagStore>,
+) -> Result<ProjectListResponse, String> {
+    let roots = ScanRoot::configured();
+
+    match registry.rescan(&roots, false).await {
+        Ok(projects) => {
+            Ok(build_list_response(&tag_store, projects, chrono::Utc::now().to_rfc3339()).await)
         }
         Err(e) => Err(format!("Failed to scan projects: {}", e)),
     }
 }
 
 #[tauri::command]
-async fn get_project(id: String) -> Result<Option<scanner::Project>, String> {
-    let projects_path = config::get_projects_path();
-    let options = ScanOptions::default();
-
-    match scanner::scan_directory(&projects_path, &options).await {
-        Ok(projects) => {
-            if let Some(mut project) = projects.into_iter().find(|p| p.id == id) {
-                // Enrich with git info
-                if let Some(git_info) = git::get_git_status(&project.path).await {
-                    project.status = git::determine_project_status(
-                        Some(&git_info),
-                        &project.last_modified,
-                    );
-                    project.git_info = Some(git_info);
-                }
-
-                // Load tags
-                if let Ok(project_tags) = tags::get_project_tags(&project.id).await {
-                    project.tags = Some(project_tags);
-                }
-
-                // Load README
-                if let Ok(readme) = scanner::get_readme_content(&project.path).await {
-                    project.readme_content = readme;
-                }
-
-                // Get remote URL
-                if let Some(url) = git::get_git_remote_url(&project.path).await {
-                    project.git_remote_url = Some(url);
-                }
-
-                Ok(Some(project))
-            } else {
-                Ok(None)
+#[tracing::instrument(skip_all)]
+async fn stream_projects(
+    registry: State<'_, ProjectRegistry>,
+    tag_store: State<'_, TagStore>,
+    force: bool,
+    on_event: Channel<ScanStreamEvent>,
+) -> Result<(), String> {
+    let roots = ScanRoot::configured();
+    let root_paths = root_paths(&roots);
+    let project_tags = tag_store.tags_by_project().await.unwrap_or_default();
+    let done = AtomicUsize::new(0);
+    let pending = AtomicUsize::new(0);
+
+    // Cheap filesystem records go out first, then one patch per finished repo
+    let observer = |event: ScanEvent<'_>| match event {
+        ScanEvent::Listed { total, pending_git } => {
+            pending.store(pending_git, Ordering::Relaxed);
+            let _ = on_event.send(ScanStreamEvent::Started { total, pending_git });
+        }
+        ScanEvent::Records(projects) => {
+            for batch in projects.chunks(RECORD_BATCH_SIZE) {
+                let projects: Vec<scanner::Project> = batch
+                    .iter()
+                    .cloned()
+                    .map(|mut project| {
+                        project.tags =
+                            Some(project_tags.get(&project.id).cloned().unwrap_or_default());
+                        project
+                    })
+                    .collect();
+                let _ = on_event.send(ScanStreamEvent::Records(summary::summarize(
+                    &projects,
+                    &root_paths,
+                    None,
+                )));
             }
         }
-        Err(e) => Err(format!("Failed to find project: {}", e)),
+        ScanEvent::GitDone(project) => {
+            let _ = on_event.send(ScanStreamEvent::GitPatch {
+                id: project.id.clone(),
+                status: project.status.clone(),
+                git_info: project.git_info.clone(),
+                done: done.fetch_add(1, Ordering::Relaxed) + 1,
+                pending: pending.load(Ordering::Relaxed),
+            });
+        }
+    };
+
+    let projects = registry
+        .rescan_observed(&roots, force, &observer)
+        .await
+        .map_err(|e| format!("Failed to scan projects: {}", e))?;
+
+    let _ = on_event.send(ScanStreamEvent::Finished {
+        total: projects.len(),
+        scanned_at: chrono::Utc::now().to_rfc3339(),
+    });
+    Ok(())
+}
+
+#[tauri::command]
+#[tracing::instrument(skip_all, fields(id = %id))]
+async fn get_project(
+    registry: State<'_, ProjectRegistry>,
+    tag_store: State<'_, TagStore>,
+    id: String,
+) -> Result<Option<scanner::Project>, String> {
+    let Some(dir) = find_project_dir(&registry, &id).await? else {
+        return Ok(None);
+    };
+
+    // One listing serves both the probe and the README lookup
+    let Ok(listing) = dir.listing().await else {
+        return Ok(None);
+    };
+    let dir = scanner::ProjectDir {
+        listing: Some(Arc::clone(&listing)),
+        ..dir
+    };
+
+    let mut project = match scanner::probe_project(&dir).await {
+        Ok((project, _)) => project,
+        Err(_) => return Ok(None),
+    };
+
+    // Enrich with git info and remote URL from a single repository open
+    if let Some((git_info, remote_url)) = git::get_git_details(&project.id, &project.path).await {
+        project.status = git::determine_project_status(Some(&git_info), &project.last_modified);
+        project.git_info = Some(git_info);
+        project.git_remote_url = remote_url;
+    }
+
+    // Load tags
+    if let Ok(project_tags) = tag_store.project_tags(&project.id).await {
+        project.tags = Some(project_tags);
     }
+
+    // Load README
+    if let Ok(readme) = scanner::read_readme(&dir.path, &listing).await {
+        project.readme_content = readme;
+    }
+
+    Ok(Some(project))
+}
+
+/// Returns weekly commits, top authors and the first commit date of a
+/// project's current branch, or None if it has no commits.
+#[tauri::command]
+#[tracing::instrument(skip_all, fields(id = %id))]
+async fn get_commit_activity(
+    registry: State<'_, ProjectRegistry>,
+    id: String,
+) -> Result<Option<history::CommitActivity>, String> {
+    let Some(dir) = find_project_dir(&registry, &id).await? else {
+        return Ok(None);
+    };
+    Ok(history::get_commit_activity(&id, &dir.path.to_string_lossy()).await)
 }
 
+/// Returns daily commits summed across every known repository.
 #[tauri::command]
-async fn refresh_projects() -> RefreshResult {
-    let projects_path = config::get_projects_path();
-    let options = ScanOptions::default();
-
-    match scanner::scan_directory(&projects_path, &options).await {
-        Ok(mut projects) => {
-            git::enrich_projects_with_git_info(&mut projects).await;
-            let count = projects.len();
+#[tracing::instrument(skip_all)]
+async fn get_portfolio_activity(
+    registry: State<'_, ProjectRegistry>,
+) -> Result<history::PortfolioActivity, String> {
+    let (projects, _) = registry.cached().await;
+    let repos = projects
+        .into_iter()
+        .filter(|project| project.git_info.is_some())
+        .map(|project| (project.id, project.path))
+        .collect();
+    Ok(history::get_portfolio_activity(repos).await)
+}
+
+#[tauri::command]
+#[tracing::instrument(skip_all)]
+async fn refresh_projects(
+    registry: State<'_, ProjectRegistry>,
+    tag_store: State<'_, TagStore>,
+) -> Result<RefreshResult, String> {
+    let roots = ScanRoot::configured();
+
+    // An explicit refresh re-probes everything, catching working-tree edits
+    // that leave the directory and git fingerprints untouched
+    let result = match registry.rescan(&roots, true).await {
+        Ok(projects) => {
+            let list = build_list_response(&tag_store, projects, String::new()).await;
             RefreshResult {
                 success: true,
-                message: format!("Successfully refreshed {} projects", count),
-                project_count: Some(count),
+                message: format!("Successfully refreshed {} projects", list.total),
+                project_count: Some(list.total),
+                projects: Some(list.projects),
             }
         }
         Err(e) => RefreshResult {
             success: false,
             message: format!("Failed to refresh: {}", e),
             project_count: None,
+            projects: None,
         },
-    }
+    };
+    Ok(result)
 }
 
 #[tauri::command]
+#[tracing::instrument(skip_all)]
 async fn open_in_finder(path: String) -> AppResult {
     shell::open_in_finder(&path).await
 }
 
 #[tauri::command]
+#[tracing::instrument(skip_all)]
 async fn open_in_terminal(path: String) -> AppResult {
     shell::open_in_terminal(&path).await
 }
 
 #[tauri::command]
+#[tracing::instrument(skip_all)]
 async fn open_in_vscode(path: String) -> AppResult {
     shell::open_in_vscode(&path).await
 }
 
 #[tauri::command]
+#[tracing::instrument(skip_all)]
 async fn open_in_browser(url: String) -> AppResult {
     shell::open_in_browser(&url).await
 }
 
 #[tauri::command]
-async fn add_project_tag(project_id: String, tag: String) -> TagResult {
-    match tags::add_tag_to_project(&project_id, &tag).await {
-        Ok(()) => match tags::get_project_tags(&project_id).await {
-            Ok(updated_tags) => TagResult {
-                success: true,
-                message: format!("Tag \"{}\" added to project", tag),
-                tags: Some(updated_tags),
-            },
-            Err(e) => TagResult {
-                success: true,
-                message: format!("Tag added but failed to get updated tags: {}", e),
-                tags: None,
-            },
+#[tracing::instrument(skip_all)]
+async fn add_project_tag(
+    tag_store: State<'_, TagStore>,
+    project_id: String,
+    tag: String,
+) -> Result<TagResult, String> {
+    Ok(match tag_store.add(&project_id, &tag).await {
+        Ok(updated_tags) => TagResult {
+            success: true,
+            message: format!("Tag \"{}\" added to project", tag),
+            tags: Some(updated_tags),
         },
         Err(e) => TagResult {
             success: false,
             message: format!("Failed to add tag: {}", e),
             tags: None,
         },
-    }
+    })
 }
 
 #[tauri::command]
-async fn remove_project_tag(project_id: String, tag: String) -> TagResult {
-    match tags::remove_tag_from_project(&project_id, &tag).await {
-        Ok(()) => match tags::get_project_tags(&project_id).await {
-            Ok(updated_tags) => TagResult {
-                success: true,
-                message: format!("Tag \"{}\" removed from project", tag),
-                tags: Some(updated_tags),
-            },
-            Err(e) => TagResult {
-                success: true,
-                message: format!("Tag removed but failed to get updated tags: {}", e),
-                tags: None,
-            },
+#[tracing::instrument(skip_all)]
+async fn remove_project_tag(
+    tag_store: State<'_, TagStore>,
+    project_id: String,
+    tag: String,
+) -> Result<TagResult, String> {
+    Ok(match tag_store.remove(&project_id, &tag).await {
+        Ok(updated_tags) => TagResult {
+            success: true,
+            message: format!("Tag \"{}\" removed from project", tag),
+            tags: Some(updated_tags),
         },
         Err(e) => TagResult {
             success: false,
             message: format!("Failed to remove tag: {}", e),
             tags: None,
         },
-    }
+    })
 }
 
 #[tauri::command]
-async fn get_all_tags() -> Result<Vec<String>, String> {
-    tags::get_all_tags().await.map_err(|e| e.to_string())
+#[tracing::instrument(skip_all)]
+async fn get_all_tags(tag_store: State<'_, TagStore>) -> Result<Vec<String>, String> {
+    tag_store.all_tags().await.map_err(|e| e.to_string())
 }
 
 #[tauri::command]
+#[tracing::instrument(skip_all)]
 async fn get_readme_content(project_path: String) -> Result<Option<String>, String> {
     scanner::get_readme_content(&project_path)
         .await
         .map_err(|e| e.to_string())
 }
 
+/// Renders a project's README to sanitized HTML, or `None` if it has none.
+#[tauri::command]
+#[tracing::instrument(skip_all)]
+async fn render_readme(project_path: String) -> Result<Option<String>, String> {
+    let content = match scanner::get_readme_content(&project_path).await {
+        Ok(Some(content)) => content,
+        Ok(None) => return Ok(None),
+        Err(e) => return Err(e.to_string()),
+    };
+    markdown::render_cached(content)
+        .await
+        .map(Some)
+        .map_err(|e| e.to_string())
+}
+
+/// Tells the background refresh scheduler whether the window is visible.
+#[tauri::command]
+#[tracing::instrument(skip_all)]
+fn set_app_visible(scheduler: State<'_, scheduler::RefreshScheduler>, visible: bool) {
+    scheduler.set_visible(visible);
+}
+
+/// Returns per-phase timings, I/O counters and a summary of the last scan.
+#[tauri::command]
+#[tracing::instrument(skip_all)]
+fn get_diagnostics() -> diagnostics::Diagnostics {
+    diagnostics::snapshot()
+}
+
+/// Writes the last scan as Chrome trace JSON and returns the file's path,
+/// or None if no scan has finished yet.
+#[tauri::command]
+#[tracing::instrument(skip_all)]
+async fn dump_scan_trace(path: Option<String>) -> Result<Option<String>, String> {
+    diagnostics::save_last_scan_trace(path.map(std::path::PathBuf::from))
+        .await
+        .map(|path| path.map(|p| p.to_string_lossy().to_string()))
+        .map_err(|e| e.to_string())
+}
+
+/// Returns the stylesheet for highlighted code in rendered READMEs.
+#[tauri::command]
+#[tracing::instrument(skip_all)]
+fn get_markdown_theme_css() -> String {
+    markdown::theme_css().to_string()
+}
+
 #[tauri::command]
+#[tracing::instrument(skip_all)]
 async fn get_git_remote_url(project_path: String) -> Option<String> {
     git::get_git_remote_url(&project_path).await
 }
 
 #[tauri::command]
-async fn get_app_settings() -> Result<config::AppSettings, String> {
-    config::get_app_settings().await.map_err(|e| e.to_string())
+#[tracing::instrument(skip_all)]
+fn get_app_settings(config: State<'_, ConfigService>) -> config::AppSettings {
+    config.settings().as_ref().clone()
 }
 
+/// Returns why config.json could not be loaded, if it can't. Settings are
+/// served as defaults and not saved until it is fixed.
 #[tauri::command]
-async fn update_app_settings(projects_path: Option<String>) -> Result<config::AppSettings, String> {
-    let mut settings = config::get_app_settings()
-        .await
-        .map_err(|e| e.to_string())?;
+#[tracing::instrument(skip_all)]
+fn get_config_error(config: State<'_, ConfigService>) -> Option<String> {
+    config.load_error()
+}
+
+/// Points the watcher and the git pool at freshly changed settings.
+fn apply_settings(watcher: &watcher::ProjectWatcher, settings: &config::AppSettings) {
+    watcher.retarget();
+    git_pool::global().set_concurrency(
+        settings
+            .git_concurrency
+            .unwrap_or_else(|| git_pool::default_concurrency(&config::get_projects_path())),
+    );
+}
+
+#[tauri::command]
+#[tracing::instrument(skip_all)]
+async fn update_app_settings(
+    config: State<'_, ConfigService>,
+    watcher: State<'_, watcher::ProjectWatcher>,
+    projects_path: Option<String>,
+    git_concurrency: Option<usize>,
+    exclude_untracked: Option<bool>,
+    git_time_budget_ms: Option<u64>,
+    write_commit_graphs: Option<bool>,
+    scan_depth: Option<usize>,
+    project_roots: Option<Vec<config::ProjectRoot>>,
+) -> Result<config::AppSettings, String> {
+    let mut settings = config.settings().as_ref().clone();
+
+    if let Some(roots) = project_roots {
+        settings.project_roots = roots;
+    }
 
     if let Some(path) = projects_path {
+        // With explicit roots configured, the projects path is the primary root
+        if let Some(primary) = settings.project_roots.first_mut() {
+            primary.path = path.clone();
+        }
         settings.projects_path = path;
     }
 
-    config::save_app_settings(&settings)
+    // Zero resets the pool to automatic sizing
+    if let Some(concurrency) = git_concurrency {
+        settings.git_concurrency = Some(concurrency).filter(|n| *n > 0);
+    }
+
+    if let Some(exclude) = exclude_untracked {
+        settings.exclude_untracked = exclude;
+    }
+
+    // Zero resets the budget to the default
+    if let Some(budget) = git_time_budget_ms {
+        settings.git_time_budget_ms = Some(budget).filter(|ms| *ms > 0);
+    }
+
+    if let Some(write) = write_commit_graphs {
+        settings.write_commit_graphs = write;
+    }
+
+    if let Some(depth) = scan_depth {
+        settings.scan_depth = Some(depth.clamp(1, config::MAX_SCAN_DEPTH));
+    }
+
+    config
+        .save(settings.clone())
         .await
         .map_err(|e| e.to_string())?;
+    apply_settings(&watcher, &settings);
 
     Ok(settings)
 }
 
+#[tauri::command]
+#[tracing::instrument(skip_all)]
+async fn set_git_priorities(visible_ids: Vec<String>, favorite_ids: Vec<String>) {
+    git_pool::global().set_priorities(visible_ids, favorite_ids);
+}
+
+#[tauri::command]
+#[tracing::instrument(skip_all)]
+async fn cancel_git_jobs(project_ids: Vec<String>) -> usize {
+    git_pool::global().cancel(&project_ids)
+}
+
+/// Cancels the queued git work of a project's detail page, leaving any scan
+/// work for the project in place.
+#[tauri::command]
+#[tracing::instrument(skip_all)]
+async fn cancel_detail_jobs(id: String) -> usize {
+    git_pool::global().cancel(&[git_pool::detail_job(&id)])
+}
+
 pub fn run() {
+    diagnostics::init();
+
     tauri::Builder::default()
         .plugin(tauri_plugin_shell::init())
         .plugin(tauri_plugin_dialog::init())
+        .manage(config::service().clone())
+        .manage(ProjectRegistry::default())
+        .manage(TagStore::default())
+        .setup(|app| {
+            let project_watcher = watcher::ProjectWatcher::spawn(app.handle().clone());
+            app.manage(project_watcher);
+            app.manage(scheduler::RefreshScheduler::spawn(app.handle().clone()));
+
+            let handle = app.handle().clone();
+            // Without the watch, hand edits to config.json apply on the next launch
+            let _ = config::service().watch(move |settings| {
+                apply_settings(&handle.state::<watcher::ProjectWatcher>(), settings);
+            });
+            Ok(())
+        })
         .invoke_handler(tauri::generate_handler![
+            get_cached_projects,
             get_projects,
+            get_project_summaries,
+            stream_projects,
             get_project,
+            get_commit_activity,
+            get_portfolio_activity,
             refresh_projects,
             open_in_finder,
             open_in_terminal,
@@ -254,10 +630,27 @@ pub fn run() {
             remove_project_tag,
             get_all_tags,
             get_readme_content,
+            render_readme,
+            get_markdown_theme_css,
             get_git_remote_url,
             get_app_settings,
+            get_config_error,
             update_app_settings,
+            set_git_priorities,
+            cancel_git_jobs,
+            cancel_detail_jobs,
+            set_app_visible,
+            get_diagnostics,
+            dump_scan_trace,
         ])
-        .run(tauri::generate_context!())
-        .expect("error while running tauri application");
+        .build(tauri::generate_context!())
+        .expect("error while building tauri application")
+        .run(|app, event| {
+            if let tauri::RunEvent::Exit = event {
+                // Don't lose tag edits still waiting for their write-behind flush
+                let _ = tauri::async_runtime::block_on(app.state::<TagStore>().flush());
+                // Nor folder listings still waiting for theirs
+                let _ = tauri::async_runtime::block_on(activity::save_cache());
+            }
+        });
 }
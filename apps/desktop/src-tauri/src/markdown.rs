@@ -0,0 +1,314 @@
+use crate::config;
+use crate::git::{fnv1a, FNV_OFFSET_BASIS};
+use anyhow::Result;
+use pulldown_cmark::{CodeBlockKind, Event, Options, Parser, Tag, TagEnd};
+use std::path::{Path, PathBuf};
+use std::sync::{Once, OnceLock};
+use std::time::{Duration, SystemTime};
+use syntect::highlighting::ThemeSet;
+use syntect::html::{css_for_theme_with_class_style, ClassStyle, ClassedHTMLGenerator};
+use syntect::parsing::{SyntaxReference, SyntaxSet};
+use syntect::util::LinesWithEndings;
+use tokio::fs;
+
+/// Bump when the rendered output changes so stale cache files are not served.
+const RENDER_VERSION: u32 = 3;
+
+/// Prefix ammonia gives every id in rendered HTML, so a README's ids cannot
+/// clash with the app's. In-page links are resolved against it in the webview.
+const ID_PREFIX: &str = "user-content-";
+
+/// Rendered READMEs kept on disk; the least recently written go first.
+const CACHE_CAPACITY: usize = 500;
+
+/// Rendered READMEs not rewritten for this long are deleted.
+const CACHE_MAX_AGE: Duration = Duration::from_secs(30 * 24 * 60 * 60);
+
+/// Highlight classes are prefixed so they cannot collide with app styles.
+const CLASS_PREFIX: &str = "hl-";
+
+/// Classes pulldown-cmark gives footnotes; every other class is stripped.
+const FOOTNOTE_CLASSES: &[&str] = &[
+    "footnote-definition",
+    "footnote-definition-label",
+    "footnote-reference",
+];
+
+const CLASS_STYLE: ClassStyle = ClassStyle::SpacedPrefixed {
+    prefix: CLASS_PREFIX,
+};
+
+/// Theme used for code blocks, close to the github-dark stylesheet of the webview renderer.
+const THEME: &str = "base16-ocean.dark";
+
+/// Returns the directory holding rendered README HTML of every render version.
+fn get_cache_root() -> PathBuf {
+    config::get_config_dir().join("readme-html")
+}
+
+/// Returns the directory holding HTML rendered by this render version.
+fn get_cache_dir() -> PathBuf {
+    get_cache_root().join(format!("v{}", RENDER_VERSION))
+}
+
+fn syntax_set() -> &'static SyntaxSet {
+    static SYNTAXES: OnceLock<SyntaxSet> = OnceLock::new();
+    SYNTAXES.get_or_init(SyntaxSet::load_defaults_newlines)
+}
+
+/// Finds the syntax for a fenced code block's language, falling back to plain text.
+fn find_syntax<'a>(syntaxes: &'a SyntaxSet, lang: &str) -> &'a SyntaxReference {
+    let token = match lang.to_ascii_lowercase().as_str() {
+        "" => return syntaxes.find_syntax_plain_text(),
+        // The bundled syntaxes have no TypeScript or JSX; JavaScript is close enough
+        "ts" | "typescript" | "tsx" | "jsx" | "mjs" | "cjs" => "js".to_string(),
+        other => other.to_string(),
+    };
+    syntaxes
+        .find_syntax_by_token(&token)
+        .unwrap_or_else(|| syntaxes.find_syntax_plain_text())
+}
+
+fn escape_html(text: &str) -> String {
+    let mut escaped = String::with_capacity(text.len());
+    for c in text.chars() {
+        match c {
+            '&' => escaped.push_str("&amp;"),
+            '<' => escaped.push_str("&lt;"),
+            '>' => escaped.push_str("&gt;"),
+            '"' => escaped.push_str("&quot;"),
+            _ => escaped.push(c),
+        }
+    }
+    escaped
+}
+
+/// Renders a code block as classed HTML spans.
+fn highlight(lang: &str, code: &str) -> String {
+    let syntaxes = syntax_set();
+    let syntax = find_syntax(syntaxes, lang);
+    let mut generator = ClassedHTMLGenerator::new_with_class_style(syntax, syntaxes, CLASS_STYLE);
+
+    for line in LinesWithEndings::from(code) {
+        if generator
+            .parse_html_for_line_which_includes_newline(line)
+            .is_err()
+        {
+            return format!(
+                "<pre class=\"hl-code\"><code>{}</code></pre>\n",
+                escape_html(code)
+            );
+        }
+    }
+    format!(
+        "<pre class=\"hl-code\"><code>{}</code></pre>\n",
+        generator.finalize()
+    )
+}
+
+/// Keeps only the highlight and footnote classes of a `class` attribute, so
+/// raw HTML in a README cannot use the app's own utility classes.
+fn filter_classes(value: &str) -> Option<String> {
+    let classes: Vec<&str> = value
+        .split_ascii_whitespace()
+        .filter(|class| class.starts_with(CLASS_PREFIX) || FOOTNOTE_CLASSES.contains(class))
+        .collect();
+    (!classes.is_empty()).then(|| classes.join(" "))
+}
+
+/// Removes scripts, event handlers and unsafe URLs, keeping the markup READMEs use.
+///
+/// Footnote definitions keep their `id` so `#label` references resolve; ids
+/// are prefixed with `ID_PREFIX`. Classes are limited by `filter_classes`.
+fn sanitize(html: &str) -> String {
+    ammonia::Builder::default()
+        .add_tags(&["input"])
+        .add_tag_attributes("input", &["type", "checked", "disabled"])
+        .add_tag_attributes("pre", &["class"])
+        .add_tag_attributes("code", &["class"])
+        .add_tag_attributes("span", &["class"])
+        .add_tag_attributes("div", &["align"])
+        .add_tag_attributes("p", &["align"])
+        .add_tag_attributes("h1", &["align"])
+        .add_tag_attributes("div", &["id", "class"])
+        .add_tag_attributes("sup", &["class"])
+        .attribute_filter(|_, attribute, value| match attribute {
+            "class" => filter_classes(value).map(Into::into),
+            _ => Some(value.into()),
+        })
+        .id_prefix(Some(ID_PREFIX))
+        .link_rel(Some("noopener noreferrer"))
+        .set_tag_attribute_value("a", "target", "_blank")
+        .clean(html)
+        .to_string()
+}
+
+/// Renders GitHub Flavored Markdown to sanitized HTML with highlighted code blocks.
+pub fn render(markdown: &str) -> String {
+    let options = Options::ENABLE_TABLES
+        | Options::ENABLE_STRIKETHROUGH
+        | Options::ENABLE_TASKLISTS
+        | Options::ENABLE_FOOTNOTES
+        | Options::ENABLE_GFM;
+
+    let mut events = Vec::new();
+    let mut code_block: Option<(String, String)> = None;
+
+    for event in Parser::new_ext(markdown, options) {
+        match event {
+            Event::Start(Tag::CodeBlock(kind)) => {
+                let lang = match kind {
+                    CodeBlockKind::Fenced(info) => {
+                        info.split_whitespace().next().unwrap_or("").to_string()
+                    }
+                    CodeBlockKind::Indented => String::new(),
+                };
+                code_block = Some((lang, String::new()));
+            }
+            Event::Text(text) if code_block.is_some() => {
+                if let Some((_, code)) = code_block.as_mut() {
+                    code.push_str(&text);
+                }
+            }
+            Event::End(TagEnd::CodeBlock) => {
+                if let Some((lang, code)) = code_block.take() {
+                    events.push(Event::Html(highlight(&lang, &code).into()));
+                }
+            }
+            event => events.push(event),
+        }
+    }
+
+    let mut html = String::with_capacity(markdown.len() * 3 / 2);
+    pulldown_cmark::html::push_html(&mut html, events.into_iter());
+    sanitize(&html)
+}
+
+/// Returns the stylesheet for the highlight classes emitted by `render`.
+pub fn theme_css() -> &'static str {
+    static CSS: OnceLock<String> = OnceLock::new();
+    CSS.get_or_init(|| {
+        let themes = ThemeSet::load_defaults();
+        themes
+            .themes
+            .get(THEME)
+            .and_then(|theme| css_for_theme_with_class_style(theme, CLASS_STYLE).ok())
+            .unwrap_or_default()
+    })
+}
+
+/// Cache file name for a Markdown document, derived from its content with a
+/// hash that stays the same across builds. The render version is in the
+/// directory name.
+fn cache_key(markdown: &str) -> String {
+    format!("{:016x}.html", fnv1a(FNV_OFFSET_BASIS, markdown.as_bytes()))
+}
+
+/// Deletes HTML rendered by other render versions, then trims this version's
+/// cache to `CACHE_CAPACITY` files no older than `CACHE_MAX_AGE`.
+fn prune_cache() {
+    let current = get_cache_dir();
+    if let Ok(entries) = std::fs::read_dir(get_cache_root()) {
+        for entry in entries.filter_map(|entry| entry.ok()) {
+            let path = entry.path();
+            if path == current {
+                continue;
+            }
+            // Version 1 wrote its files into the root itself
+            let _ = if path.is_dir() {
+                std::fs::remove_dir_all(&path)
+            } else {
+                std::fs::remove_file(&path)
+            };
+        }
+    }
+
+    let Ok(entries) = std::fs::read_dir(&current) else {
+        return;
+    };
+    let mut files: Vec<(SystemTime, PathBuf)> = entries
+        .filter_map(|entry| entry.ok())
+        .filter_map(|entry| Some((entry.metadata().ok()?.modified().ok()?, entry.path())))
+        .collect();
+    files.sort_by(|a, b| b.0.cmp(&a.0));
+
+    let now = SystemTime::now();
+    for (index, (modified, path)) in files.into_iter().enumerate() {
+        let expired = now
+            .duration_since(modified)
+            .is_ok_and(|age| age > CACHE_MAX_AGE);
+        if index >= CACHE_CAPACITY || expired {
+            let _ = std::fs::remove_file(path);
+        }
+    }
+}
+
+/// Writes rendered HTML to a temporary file and renames it into place.
+async fn save_html(path: &Path, html: &str) -> Result<()> {
+    fs::create_dir_all(get_cache_dir()).await?;
+    let tmp_file = path.with_extension("html.tmp");
+    fs::write(&tmp_file, html).await?;
+    fs::rename(&tmp_file, path).await?;
+    Ok(())
+}
+
+/// Renders Markdown like `render`, reusing HTML cached on disk for identical content.
+///
+/// The first call of each run prunes the cache in the background.
+pub async fn render_cached(markdown: String) -> Result<String> {
+    static PRUNE: Once = Once::new();
+    PRUNE.call_once(|| {
+        tokio::task::spawn_blocking(prune_cache);
+    });
+
+    let path = get_cache_dir().join(cache_key(&markdown));
+    if let Ok(html) = fs::read_to_string(&path).await {
+        return Ok(html);
+    }
+
+    let html = tokio::task::spawn_blocking(move || render(&markdown)).await?;
+    // The cache only saves a re-render; a failed write is not an error
+    let _ = save_html(&path, &html).await;
+    Ok(html)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn strips_app_classes_from_raw_html() {
+        let html = render(
+            "<div class=\"fixed inset-0 z-50 bg-background\">overlay</div>\n\n\
+             <span class=\"hl-fake absolute\">x</span> <sup class=\"sr-only\">y</sup>\n",
+        );
+        assert!(!html.contains("fixed"), "{html}");
+        assert!(!html.contains("inset-0"), "{html}");
+        assert!(!html.contains("bg-background"), "{html}");
+        assert!(!html.contains("absolute"), "{html}");
+        assert!(!html.contains("sr-only"), "{html}");
+        assert!(html.contains("overlay"), "{html}");
+    }
+
+    #[test]
+    fn keeps_highlight_and_footnote_classes() {
+        let html = render("Text[^1]\n\n[^1]: Note\n\n```rust\nfn main() {}\n```\n");
+        assert!(html.contains("class=\"hl-code\""), "{html}");
+        assert!(html.contains("class=\"footnote-reference\""), "{html}");
+        assert!(html.contains("class=\"footnote-definition\""), "{html}");
+        assert!(html.contains(&format!("id=\"{}1\"", ID_PREFIX)), "{html}");
+    }
+
+    #[test]
+    fn filter_classes_keeps_allowed_tokens() {
+        assert_eq!(
+            filter_classes("hl-source fixed hl-rust").as_deref(),
+            Some("hl-source hl-rust")
+        );
+        assert_eq!(
+            filter_classes("footnote-reference"),
+            Some("footnote-reference".into())
+        );
+        assert_eq!(filter_classes("fixed inset-0"), None);
+    }
+}
@@ -0,0 +1,373 @@
+use crate::activity;
+use crate::config;
+use crate::diagnostics;
+use crate::git;
+use crate::git_pool;
+use crate::history;
+use crate::index::{ScanEvent, ScanIndex};
+use crate::repo_pool;
+use crate::scanner::{self, Project, ProjectDir, ScanRoot};
+use crate::watcher::ProjectsChangedEvent;
+use anyhow::Result;
+use std::collections::{HashMap, HashSet};
+use std::path::{Path, PathBuf};
+use std::sync::Arc;
+use tokio::sync::{watch, MappedMutexGuard, Mutex, MutexGuard};
+
+/// Result of a scan, shared with every caller waiting on it.
+type ScanOutcome = Result<Arc<Vec<Project>>, String>;
+
+/// Scan index plus an id → path lookup table.
+struct Registry {
+    index: ScanIndex,
+    ids: HashMap<String, String>,
+}
+
+impl Registry {
+    fn new(index: ScanIndex) -> Self {
+        let ids = index
+            .entries
+            .iter()
+            .map(|(path, entry)| (entry.project.id.clone(), path.clone()))
+            .collect();
+        Self { index, ids }
+    }
+}
+
+/// The scan currently running on behalf of one or more callers.
+struct Flight {
+    generation: u64,
+    force: bool,
+    done: watch::Receiver<Option<ScanOutcome>>,
+}
+
+#[derive(Default)]
+struct Flights {
+    current: Option<Flight>,
+    next_generation: u64,
+}
+
+/// What a caller does about a requested scan.
+enum Role {
+    /// Runs the scan and publishes its result.
+    Lead {
+        generation: u64,
+        done: watch::Sender<Option<ScanOutcome>>,
+        superseded: bool,
+    },
+    /// Waits for the scan already in flight.
+    Follow(watch::Receiver<Option<ScanOutcome>>),
+}
+
+/// In-memory project registry held in Tauri managed state.
+///
+/// Seeded from the on-disk scan index on first use and repopulated by every
+/// scan, so single-project lookups never need to walk the projects root.
+/// Concurrent rescans are coalesced into one.
+#[derive(Default)]
+pub struct ProjectRegistry {
+    state: Mutex<Option<Registry>>,
+    flights: std::sync::Mutex<Flights>,
+}
+
+impl ProjectRegistry {
+    /// Locks the registry, (re)loading it if the projects roots have changed.
+    async fn lock_loaded(&self) -> MappedMutexGuard<'_, Registry> {
+        let roots: Vec<String> = config::get_project_roots()
+            .into_iter()
+            .map(|root| root.path)
+            .collect();
+        let mut guard = self.state.lock().await;
+
+        let stale = guard.as_ref().map_or(true, |r| r.index.roots != roots);
+        if stale {
+            *guard = Some(Registry::new(ScanIndex::load(&roots).await));
+        }
+
+        MutexGuard::map(guard, |state| {
+            state.as_mut().expect("registry loaded above")
+        })
+    }
+
+    /// Returns all cached projects and when they were last scanned.
+    pub async fn cached(&self) -> (Vec<Project>, Option<String>) {
+        let registry = self.lock_loaded().await;
+        (registry.index.projects(), registry.index.scanned_at.clone())
+    }
+
+    /// Returns the directory of a project by id, keeping its registered id.
+    pub async fn dir_for(&self, id: &str) -> Option<ProjectDir> {
+        let registry = self.lock_loaded().await;
+        let path = registry.ids.get(id)?;
+        let entry = registry.index.entries.get(path)?;
+
+        Some(ProjectDir {
+            id: entry.project.id.clone(),
+            name: entry.project.name.clone(),
+            path: PathBuf::from(path),
+            git_limit: scanner::git_limit_for(&ScanRoot::configured(), Path::new(path)),
+            listing: None,
+        })
+    }
+
+    /// Rescans the projects roots and repopulates the registry.
+    ///
+    /// The scan runs on a copy of the index so readers are not blocked
+    /// meanwhile; writes other paths make to the registry in the meantime
+    /// are merged back in rather than overwritten.
+    pub async fn rescan(&self, roots: &[ScanRoot], force: bool) -> Result<Vec<Project>> {
+        self.rescan_observed(roots, force, &|_| {}).await
+    }
+
+    /// Rescans like `rescan`, reporting progress to `observer`.
+    ///
+    /// A caller arriving while a scan is in flight shares its result instead
+    /// of starting another, unless it asks for `force` and the running scan
+    /// does not. The forced scan then supersedes it: the older scan's queued
+    /// git jobs are cancelled, its result is discarded, and its callers get
+    /// the newer scan's projects. Followers see no progress, only one final
+    /// batch of records.
+    pub async fn rescan_observed(
+        &self,
+        roots: &[ScanRoot],
+        force: bool,
+        observer: &(dyn Fn(ScanEvent<'_>) + Send + Sync),
+    ) -> Result<Vec<Project>> {
+        loop {
+            let outcome = match self.join_or_lead(force) {
+                Role::Lead {
+                    generation,
+                    done,
+                    superseded,
+                } => {
+                    if superseded {
+                        let ids: Vec<String> =
+                            self.lock_loaded().await.ids.keys().cloned().collect();
+                        git_pool::global().cancel(&ids);
+                    }
+                    match self.lead_scan(roots, force, observer, generation).await {
+                        Some(outcome) => {
+                            let _ = done.send(Some(outcome.clone()));
+                            return outcome.map(unshare).map_err(anyhow::Error::msg);
+                        }
+                        // Superseded while running; wait for the newer scan
+                        None => continue,
+                    }
+                }
+                Role::Follow(done) => wait_for(done).await,
+            };
+
+            // The leader went away without a result; try again
+            let Some(outcome) = outcome else {
+                continue;
+            };
+            let projects = outcome.map_err(anyhow::Error::msg)?;
+            observer(ScanEvent::Listed {
+                total: projects.len(),
+                pending_git: 0,
+            });
+            observer(ScanEvent::Records(&projects));
+            return Ok(unshare(projects));
+        }
+    }
+
+    /// Joins the scan in flight, or registers a new one for this caller to run.
+    fn join_or_lead(&self, force: bool) -> Role {
+        let mut flights = self.flights.lock().unwrap_or_else(|e| e.into_inner());
+
+        let mut superseded = false;
+        if let Some(flight) = &flights.current {
+            // A closed channel means the leader was dropped mid-scan
+            let running = flight.done.has_changed().is_ok();
+            if running && (flight.force || !force) {
+                return Role::Follow(flight.done.clone());
+            }
+            superseded = running;
+        }
+
+        flights.next_generation += 1;
+        let generation = flights.next_generation;
+        let (done, receiver) = watch::channel(None);
+        flights.current = Some(Flight {
+            generation,
+            force,
+            done: receiver,
+        });
+        Role::Lead {
+            generation,
+            done,
+            superseded,
+        }
+    }
+
+    /// Whether `generation` is still the scan callers are waiting on.
+    fn is_current(&self, generation: u64) -> bool {
+        let flights = self.flights.lock().unwrap_or_else(|e| e.into_inner());
+        flights
+            .current
+            .as_ref()
+            .is_some_and(|flight| flight.generation == generation)
+    }
+
+    /// Runs a scan and installs its index, or returns None if a newer scan
+    /// superseded it meanwhile.
+    async fn lead_scan(
+        &self,
+        roots: &[ScanRoot],
+        force: bool,
+        observer: &(dyn Fn(ScanEvent<'_>) + Send + Sync),
+        generation: u64,
+    ) -> Option<ScanOutcome> {
+        let _recording = diagnostics::record_scan();
+        let mut index = self.lock_loaded().await.index.clone();
+        let snapshot: HashSet<String> = index.entries.keys().cloned().collect();
+        let started_ms = chrono::Utc::now().timestamp_millis();
+        let result = index.rescan_observed(roots, force, observer).await;
+
+        if !self.is_current(generation) {
+            return None;
+        }
+        let outcome = match result {
+            Ok(mut projects) => {
+                let mut registry = self.lock_loaded().await;
+                // The watcher, scheduler and late git results may have written
+                // while the scan ran; keep whatever they probed more recently
+                let merged = index.merge_live(&registry.index, &snapshot, started_ms);
+                projects.retain(|project| !merged.removed.contains(&project.path));
+                let mut newer = merged.newer;
+                for project in &mut projects {
+                    if let Some(live) = newer.remove(&project.path) {
+                        *project = live;
+                    }
+                }
+                projects.extend(newer.into_values());
+
+                *registry = Registry::new(index);
+                // The index is only a cache; a failed write just means a slower next scan
+                let _ = registry.index.save().await;
+                Ok(Arc::new(projects))
+            }
+            Err(e) => Err(e.to_string()),
+        };
+
+        let mut flights = self.flights.lock().unwrap_or_else(|e| e.into_inner());
+        if flights
+            .current
+            .as_ref()
+            .is_some_and(|flight| flight.generation == generation)
+        {
+            flights.current = None;
+        }
+        Some(outcome)
+    }
+
+    /// Re-probes changed directories and drops removed ones.
+    pub async fn apply_dir_changes(
+        &self,
+        dirs: Vec<ProjectDir>,
+        removed_paths: Vec<String>,
+    ) -> ProjectsChangedEvent {
+        let mut registry = self.lock_loaded().await;
+        let mut event = ProjectsChangedEvent::default();
+
+        for path in removed_paths {
+            repo_pool::evict(&path);
+            activity::forget(&path);
+            history::forget(&path);
+            git::forget(&path);
+            if let Some(id) = registry.index.remove_path(&path) {
+                registry.ids.remove(&id);
+                event.removed.push(id);
+            }
+        }
+
+        let known: HashSet<String> = dirs
+            .iter()
+            .map(|dir| dir.path.to_string_lossy().to_string())
+            .filter(|path| registry.index.entries.contains_key(path))
+            .collect();
+
+        for project in registry.index.refresh_dirs(dirs, true).await {
+            registry
+                .ids
+                .insert(project.id.clone(), project.path.clone());
+            if known.contains(&project.path) {
+                event.changed.push(project);
+            } else {
+                event.added.push(project);
+            }
+        }
+
+        let _ = registry.index.save().await;
+        event
+    }
+
+    /// Re-probes projects with a fresh git status walk and returns the
+    /// records that changed.
+    ///
+    /// The probes run without the registry locked, so commands and the
+    /// watcher are not held up by the status walks.
+    pub async fn recheck(&self, dirs: Vec<ProjectDir>) -> Vec<Project> {
+        let before: HashMap<String, Project> = {
+            let registry = self.lock_loaded().await;
+            dirs.iter()
+                .filter_map(|dir| {
+                    let path = dir.path.to_string_lossy().to_string();
+                    let entry = registry.index.entries.get(&path)?;
+                    Some((path, entry.project.clone()))
+                })
+                .collect()
+        };
+
+        let probed = ScanIndex::probe_dirs(dirs, false).await;
+        let changed: Vec<Project> = probed
+            .projects
+            .into_iter()
+            .filter(|project| {
+                before
+                    .get(&project.path)
+                    .map_or(true, |old| !same_state(old, project))
+            })
+            .collect();
+
+        let mut registry = self.lock_loaded().await;
+        // A project removed while it was being probed stays removed
+        let entries = probed
+            .entries
+            .into_iter()
+            .filter(|entry| registry.index.entries.contains_key(&entry.project.path))
+            .collect();
+        registry.index.insert_newer(entries);
+        if !changed.is_empty() {
+            let _ = registry.index.save().await;
+        }
+        changed
+    }
+}
+
+/// Whether two records of a project show the same filesystem and git state.
+fn same_state(a: &Project, b: &Project) -> bool {
+    a.last_modified == b.last_modified
+        && a.git_info == b.git_info
+        && a.description == b.description
+        && a.has_package_json == b.has_package_json
+        && a.has_readme == b.has_readme
+}
+
+/// Takes the projects out of a shared result, copying them only if other
+/// callers still hold it.
+fn unshare(projects: Arc<Vec<Project>>) -> Vec<Project> {
+    Arc::try_unwrap(projects).unwrap_or_else(|shared| shared.to_vec())
+}
+
+/// Waits for a scan's result, or None if its leader went away without one.
+async fn wait_for(mut done: watch::Receiver<Option<ScanOutcome>>) -> Option<ScanOutcome> {
+    loop {
+        if let Some(outcome) = done.borrow_and_update().clone() {
+            return Some(outcome);
+        }
+        if done.changed().await.is_err() {
+            return done.borrow().clone();
+        }
+    }
+}
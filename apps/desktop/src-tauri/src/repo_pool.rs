@@ -0,0 +1,116 @@
+use crate::diagnostics::{self, Counter};
+use git2::Repository;
+use std::collections::HashMap;
+use std::os::raw::c_int;
+use std::sync::{Mutex, MutexGuard, Once, OnceLock};
+
+/// Most repositories kept open at once.
+const REPO_POOL_CAPACITY: usize = 64;
+
+/// Size of each window mapped from a pack file.
+const MWINDOW_SIZE: usize = 32 * 1024 * 1024;
+
+/// Total pack memory mapped across all repositories before old windows are unmapped.
+const MWINDOW_MAPPED_LIMIT: usize = 256 * 1024 * 1024;
+
+/// Pack files kept open across all repositories.
+const MWINDOW_FILE_LIMIT: usize = 128;
+
+/// Bytes of parsed objects cached across all repositories.
+///
+/// libgit2's object cache limit is a single process-wide total (256 MiB by
+/// default), shared by every pooled handle and every concurrent status or
+/// history walk. Half the default still bounds memory while leaving each of
+/// the `REPO_POOL_CAPACITY` open repositories room for its hot commits and
+/// trees.
+const CACHE_MAX_SIZE: isize = 128 * 1024 * 1024;
+
+struct PooledRepo {
+    repo: Repository,
+    last_used: u64,
+}
+
+#[derive(Default)]
+struct Pool {
+    repos: HashMap<String, PooledRepo>,
+    tick: u64,
+}
+
+static POOL: OnceLock<Mutex<Pool>> = OnceLock::new();
+
+/// Lowers libgit2's process-wide memory and file limits, which default to
+/// sizes meant for a single large repository.
+fn configure_libgit2() {
+    static CONFIGURE: Once = Once::new();
+    CONFIGURE.call_once(|| unsafe {
+        // Safe here: nothing else touches libgit2 before the first repository is opened
+        let _ = git2::opts::set_mwindow_size(MWINDOW_SIZE);
+        let _ = git2::opts::set_mwindow_mapped_limit(MWINDOW_MAPPED_LIMIT);
+        let _ = git2::opts::set_mwindow_file_limit(MWINDOW_FILE_LIMIT);
+        libgit2_sys::init();
+        libgit2_sys::git_libgit2_opts(
+            libgit2_sys::GIT_OPT_SET_CACHE_MAX_SIZE as c_int,
+            CACHE_MAX_SIZE,
+        );
+    });
+}
+
+fn pool() -> MutexGuard<'static, Pool> {
+    POOL.get_or_init(|| {
+        configure_libgit2();
+        Mutex::new(Pool::default())
+    })
+    .lock()
+    .unwrap_or_else(|e| e.into_inner())
+}
+
+/// Takes a pooled handle for the path out of the pool, if one is still valid.
+fn checkout(path: &str) -> Option<Repository> {
+    let pooled = pool().repos.remove(path)?;
+    // A repository deleted since it was pooled must not be served from memory
+    pooled.repo.path().exists().then_some(pooled.repo)
+}
+
+/// Puts a handle back into the pool, evicting the least recently used one when full.
+fn checkin(path: &str, repo: Repository) {
+    let mut pool = pool();
+    pool.tick += 1;
+    let last_used = pool.tick;
+
+    if pool.repos.len() >= REPO_POOL_CAPACITY && !pool.repos.contains_key(path) {
+        let oldest = pool
+            .repos
+            .iter()
+            .min_by_key(|(_, pooled)| pooled.last_used)
+            .map(|(path, _)| path.clone());
+        if let Some(oldest) = oldest {
+            pool.repos.remove(&oldest);
+        }
+    }
+    pool.repos
+        .insert(path.to_string(), PooledRepo { repo, last_used });
+}
+
+/// Runs `f` with an open repository for the path, reusing a pooled handle
+/// when there is one. Returns None if the path is not a repository.
+///
+/// Concurrent callers for the same path each get their own handle; only one
+/// goes back into the pool.
+pub fn with_repo<T>(path: &str, f: impl FnOnce(&Repository) -> T) -> Option<T> {
+    let repo = match checkout(path) {
+        Some(repo) => repo,
+        None => {
+            configure_libgit2();
+            diagnostics::count(Counter::RepoOpens, 1);
+            Repository::open(path).ok()?
+        }
+    };
+    let result = f(&repo);
+    checkin(path, repo);
+    Some(result)
+}
+
+/// Drops the pooled handle for a path, e.g. once its project is removed.
+pub fn evict(path: &str) {
+    pool().repos.remove(path);
+}
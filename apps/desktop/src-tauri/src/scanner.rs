@@ -1,9 +1,20 @@
+use crate::activity;
+use crate::config;
+use crate::detect::{DirListing, README_FILES};
+use crate::diagnostics::{self, Counter};
 use anyhow::Result;
+use ignore::overrides::OverrideBuilder;
+use ignore::{WalkBuilder, WalkState};
 use serde::{Deserialize, Serialize};
-use std::path::Path;
+use std::collections::{HashMap, HashSet};
+use std::io;
+use std::path::{Component, Path, PathBuf};
+use std::sync::{Arc, Mutex, OnceLock};
 use tokio::fs;
+use tokio::io::AsyncReadExt;
+use tokio::sync::Semaphore;
 
-const IGNORED_DIRECTORIES: &[&str] = &[
+pub(crate) const IGNORED_DIRECTORIES: &[&str] = &[
     "node_modules",
     ".git",
     ".next",
@@ -19,31 +30,9 @@ const IGNORED_DIRECTORIES: &[&str] = &[
     ".vscode",
 ];
 
-const PROJECT_INDICATORS: &[&str] = &[
-    "package.json",
-    ".git",
-    "README.md",
-    "README.txt",
-    "README",
-    "pyproject.toml",
-    "Cargo.toml",
-    "go.mod",
-    "pom.xml",
-    "build.gradle",
-    "Makefile",
-];
-
-const README_FILES: &[&str] = &[
-    "README.md",
-    "README.txt",
-    "README",
-    "readme.md",
-    "Readme.md",
-];
-
 const MAX_README_LENGTH: usize = 50000;
 
-#[derive(Debug, Clone, Serialize, Deserialize)]
+#[derive(Debug, Clone, PartialEq, Serialize, Deserialize)]
 #[serde(rename_all = "camelCase")]
 pub struct GitInfoData {
     pub branch: String,
@@ -53,6 +42,9 @@ pub struct GitInfoData {
     pub behind_by: usize,
     pub last_commit_date: Option<String>,
     pub last_commit_message: Option<String>,
+    /// Some fields are missing because the read overran its time budget.
+    #[serde(default, skip_serializing_if = "std::ops::Not::not")]
+    pub partial: bool,
 }
 
 #[derive(Debug, Clone, Serialize, Deserialize)]
@@ -72,19 +64,168 @@ pub struct Project {
     pub tags: Option<Vec<String>>,
 }
 
-#[derive(Debug)]
+#[derive(Debug, Clone)]
 pub struct ScanOptions {
     pub include_hidden: bool,
+    /// How many levels below the projects root to search for projects.
+    pub max_depth: usize,
+    /// Skip directories matched by `.gitignore` files along the way.
+    pub respect_gitignore: bool,
+    /// Glob patterns of directories to skip.
+    pub exclude: Vec<String>,
 }
 
 impl Default for ScanOptions {
     fn default() -> Self {
         Self {
             include_hidden: false,
+            max_depth: 1,
+            respect_gitignore: true,
+            exclude: Vec::new(),
+        }
+    }
+}
+
+/// A projects root together with the options used to search it.
+#[derive(Debug, Clone)]
+pub struct ScanRoot {
+    pub path: String,
+    /// Prefix for ids of projects under this root; None for the primary root.
+    pub id_prefix: Option<String>,
+    pub options: ScanOptions,
+    /// Maximum repositories under this root inspected at once.
+    pub git_concurrency: Option<usize>,
+}
+
+impl ScanRoot {
+    /// Builds the scan roots from settings.
+    pub fn configured() -> Vec<ScanRoot> {
+        let mut prefixes = HashSet::new();
+
+        config::get_project_roots()
+            .into_iter()
+            .enumerate()
+            .map(|(i, root)| {
+                // Secondary roots prefix their ids so equal folder names stay distinct
+                let id_prefix = (i > 0).then(|| {
+                    let label = root.label.clone().unwrap_or_else(|| {
+                        Path::new(&root.path)
+                            .file_name()
+                            .map(|n| n.to_string_lossy().to_string())
+                            .unwrap_or_else(|| format!("root-{}", i + 1))
+                    });
+                    let mut prefix = create_project_id(&label);
+                    if !prefixes.insert(prefix.clone()) {
+                        prefix = format!("{}-{}", prefix, i + 1);
+                        prefixes.insert(prefix.clone());
+                    }
+                    prefix
+                });
+
+                ScanRoot {
+                    options: ScanOptions {
+                        max_depth: root.scan_depth.unwrap_or(config::DEFAULT_SCAN_DEPTH),
+                        exclude: root.exclude,
+                        ..ScanOptions::default()
+                    },
+                    path: root.path,
+                    id_prefix,
+                    git_concurrency: root.git_concurrency,
+                }
+            })
+            .collect()
+    }
+}
+
+/// Per-root caps on concurrent git work, shared by every scan and background
+/// re-check so a root's limit holds across all of them.
+static ROOT_GIT_LIMITS: OnceLock<Mutex<HashMap<String, (usize, Arc<Semaphore>)>>> = OnceLock::new();
+
+impl ScanRoot {
+    /// Returns the root's shared cap on concurrent git work, if it has one.
+    pub fn git_limit(&self) -> Option<Arc<Semaphore>> {
+        let permits = self.git_concurrency.filter(|n| *n > 0)?;
+        let mut limits = ROOT_GIT_LIMITS
+            .get_or_init(Default::default)
+            .lock()
+            .unwrap_or_else(|e| e.into_inner());
+        let (size, limit) = limits
+            .entry(self.path.clone())
+            .or_insert_with(|| (permits, Arc::new(Semaphore::new(permits))));
+        // A changed setting takes effect for work started from now on
+        if *size != permits {
+            *size = permits;
+            *limit = Arc::new(Semaphore::new(permits));
         }
+        Some(Arc::clone(limit))
     }
 }
 
+/// Returns the git cap of the innermost root containing `path`, if any.
+pub fn git_limit_for(roots: &[ScanRoot], path: &Path) -> Option<Arc<Semaphore>> {
+    roots
+        .iter()
+        .filter(|root| path.starts_with(&root.path))
+        .max_by_key(|root| root.path.len())?
+        .git_limit()
+}
+
+/// A candidate project directory found under a projects root.
+#[derive(Debug, Clone)]
+pub struct ProjectDir {
+    pub id: String,
+    pub name: String,
+    pub path: PathBuf,
+    /// Shared cap on concurrent git work for the root this directory is under.
+    pub git_limit: Option<Arc<Semaphore>>,
+    /// Entries read when the directory was discovered, reused by its probe.
+    pub listing: Option<Arc<DirListing>>,
+}
+
+impl ProjectDir {
+    /// Creates a project directory, deriving its id from the path below `root`.
+    ///
+    /// Top-level projects keep their name-based ids; nested ones are prefixed
+    /// with their parent folders so `a/app` and `b/app` stay distinct.
+    pub fn new(root: &Path, path: PathBuf) -> Self {
+        let name = path
+            .file_name()
+            .map(|n| n.to_string_lossy().to_string())
+            .unwrap_or_default();
+        let relative = path
+            .strip_prefix(root)
+            .map(|rel| {
+                rel.to_string_lossy()
+                    .replace(std::path::MAIN_SEPARATOR, "-")
+            })
+            .unwrap_or_else(|_| name.clone());
+
+        Self {
+            id: create_project_id(&relative),
+            name,
+            path,
+            git_limit: None,
+            listing: None,
+        }
+    }
+
+    /// Returns the directory's entries, listing it only if discovery did not.
+    pub async fn listing(&self) -> io::Result<Arc<DirListing>> {
+        match &self.listing {
+            Some(listing) => Ok(Arc::clone(listing)),
+            None => DirListing::read_async(&self.path).await.map(Arc::new),
+        }
+    }
+}
+
+/// Directories found while discovering projects.
+#[derive(Debug, Default)]
+pub struct Discovery {
+    pub projects: Vec<ProjectDir>,
+    /// Non-project folders that were descended into looking for projects.
+    pub containers: Vec<PathBuf>,
+}
+
 /// Creates a URL-safe identifier from a project name.
 fn create_project_id(name: &str) -> String {
     let mapped: String = name
@@ -120,20 +261,27 @@ fn determine_initial_status(last_modified: &chrono::DateTime<chrono::Utc>) -> St
     }
 }
 
-/// Checks if a directory appears to be a project based on common indicators.
-async fn is_project_directory(dir_path: &Path) -> bool {
-    for indicator in PROJECT_INDICATORS {
-        if dir_path.join(indicator).exists() {
-            return true;
-        }
+/// Recomputes the status of a project that has no git info.
+///
+/// Status is time-relative, so records restored from the scan index are
+/// re-stamped rather than trusted.
+pub fn initial_status(last_modified: &str, is_project: bool) -> String {
+    if !is_project {
+        return "unknown".to_string();
+    }
+    match chrono::DateTime::parse_from_rfc3339(last_modified) {
+        Ok(date) => determine_initial_status(&date.with_timezone(&chrono::Utc)),
+        Err(_) => "unknown".to_string(),
     }
-    false
 }
 
 /// Extracts the project description from package.json if available.
+#[tracing::instrument(skip_all)]
 async fn get_project_description(dir_path: &Path) -> Option<String> {
     let package_json_path = dir_path.join("package.json");
     if let Ok(content) = fs::read_to_string(&package_json_path).await {
+        diagnostics::count(Counter::FileReads, 1);
+        diagnostics::count(Counter::BytesRead, content.len() as u64);
         if let Ok(json) = serde_json::from_str::<serde_json::Value>(&content) {
             return json
                 .get("description")
@@ -145,17 +293,33 @@ async fn get_project_description(dir_path: &Path) -> Option<String> {
 }
 
 /// Scans a single directory and creates a Project struct.
-async fn scan_project(dir_path: &Path, name: &str) -> Result<Project> {
+///
+/// File checks are answered from `listing` rather than the filesystem.
+#[tracing::instrument(skip_all, fields(project = name))]
+async fn scan_project(
+    dir_path: &Path,
+    listing: &DirListing,
+    name: &str,
+    project_id: &str,
+) -> Result<Project> {
+    diagnostics::count(Counter::Stats, 1);
     let metadata = fs::metadata(dir_path).await?;
-    let last_modified: chrono::DateTime<chrono::Utc> = metadata.modified()?.into();
-    let project_id = create_project_id(name);
+    // The folder's own mtime only moves when its top-level entries change
+    let last_modified = match activity::last_activity(dir_path).await {
+        Some(last_activity) => last_activity,
+        None => metadata.modified()?.into(),
+    };
 
-    let has_package_json = dir_path.join("package.json").exists();
-    let has_readme = README_FILES.iter().any(|f| dir_path.join(f).exists());
-    let description = get_project_description(dir_path).await;
+    let has_package_json = listing.contains("package.json");
+    let has_readme = listing.has_readme();
+    let description = if has_package_json {
+        get_project_description(dir_path).await
+    } else {
+        None
+    };
 
     Ok(Project {
-        id: project_id,
+        id: project_id.to_string(),
         name: name.to_string(),
         path: dir_path.to_string_lossy().to_string(),
         description,
@@ -170,68 +334,431 @@ async fn scan_project(dir_path: &Path, name: &str) -> Result<Project> {
     })
 }
 
-/// Scans a directory for project subdirectories.
-pub async fn scan_directory(projects_path: &str, options: &ScanOptions) -> Result<Vec<Project>> {
-    let path = Path::new(projects_path);
+/// Scans a project directory, returning the project and whether it looks like a project.
+///
+/// Every check is matched against one listing of the directory, the one
+/// taken at discovery when there is one.
+#[tracing::instrument(skip_all, fields(project = %dir.name))]
+pub async fn probe_project(dir: &ProjectDir) -> Result<(Project, bool)> {
+    let listing = dir.listing().await?;
+    let mut project = scan_project(&dir.path, &listing, &dir.name, &dir.id).await?;
+    let is_project = listing.is_project();
+    if !is_project {
+        project.status = "unknown".to_string();
+    }
+    Ok((project, is_project))
+}
+
+/// Checks whether a directory name may hold a project (not ignored or hidden).
+pub fn is_candidate_name(name: &str, options: &ScanOptions) -> bool {
+    if IGNORED_DIRECTORIES.contains(&name) {
+        return false;
+    }
+
+    options.include_hidden || !name.starts_with('.')
+}
 
-    if !path.is_dir() {
+/// Walks the projects root in parallel looking for project directories.
+///
+/// Descends up to `max_depth` levels, stops at the first directory that looks
+/// like a project and skips ignored, hidden and gitignored folders. Top-level
+/// folders are always listed unless a project was found inside them, which
+/// keeps a depth of 1 identical to a flat listing.
+pub async fn discover_projects(projects_path: &str, options: &ScanOptions) -> Result<Discovery> {
+    let root = PathBuf::from(projects_path);
+
+    if !root.is_dir() {
         return Err(anyhow::anyhow!(
             "Path is not a directory: {}",
             projects_path
         ));
     }
 
-    let mut entries = fs::read_dir(path).await?;
-    let mut projects = Vec::new();
+    let options = options.clone();
+    tokio::task::spawn_blocking(move || discover_blocking(&root, &options))
+        .await
+        .map_err(|e| anyhow::anyhow!("Project discovery failed: {}", e))
+}
+
+#[tracing::instrument(skip_all, fields(root = %root.display()))]
+fn discover_blocking(root: &Path, options: &ScanOptions) -> Discovery {
+    let include_hidden = options.include_hidden;
+    let max_depth = options.max_depth.max(1);
+
+    // Exclusions are gitignore-style globs relative to the root
+    let mut overrides = OverrideBuilder::new(root);
+    for pattern in &options.exclude {
+        let _ = overrides.add(&format!("!{}", pattern));
+    }
+
+    let mut builder = WalkBuilder::new(root);
+    builder
+        .max_depth(Some(max_depth))
+        .hidden(false)
+        .parents(false)
+        .ignore(false)
+        .git_global(false)
+        .git_ignore(options.respect_gitignore)
+        .git_exclude(options.respect_gitignore)
+        .require_git(false)
+        .follow_links(false)
+        .filter_entry(move |entry| {
+            if entry.depth() == 0 {
+                return true;
+            }
+            let name = entry.file_name().to_string_lossy();
+            entry.file_type().is_some_and(|t| t.is_dir())
+                && !IGNORED_DIRECTORIES.contains(&name.as_ref())
+                && (include_hidden || !name.starts_with('.'))
+        });
+    if let Ok(overrides) = overrides.build() {
+        builder.overrides(overrides);
+    }
+
+    let projects = Mutex::new(Vec::new());
+    let containers = Mutex::new(Vec::new());
+    // Top-level folders may become projects below, keeping their listing
+    let top_listings = Mutex::new(HashMap::new());
+    diagnostics::count(Counter::DirReads, 1);
+
+    builder.build_parallel().run(|| {
+        Box::new(|result| {
+            let entry = match result {
+                Ok(entry) => entry,
+                Err(_) => return WalkState::Continue,
+            };
+            // The root itself is never a project
+            if entry.depth() == 0 {
+                return WalkState::Continue;
+            }
+
+            let entry_depth = entry.depth();
+            let path = entry.into_path();
+            let listing = DirListing::read(&path).ok();
+            if listing.as_ref().is_some_and(DirListing::is_project) {
+                let mut dir = ProjectDir::new(root, path);
+                dir.listing = listing.map(Arc::new);
+                projects.lock().unwrap().push(dir);
+                WalkState::Skip
+            } else {
+                if let (1, Some(listing)) = (entry_depth, listing) {
+                    top_listings.lock().unwrap().insert(path.clone(), listing);
+                }
+                // The walker lists a container again only while it is above the depth limit
+                if entry_depth < max_depth {
+                    diagnostics::count(Counter::DirReads, 1);
+                }
+                containers.lock().unwrap().push(path);
+                WalkState::Continue
+            }
+        })
+    });
+
+    let mut projects = projects.into_inner().unwrap();
+    let containers = containers.into_inner().unwrap();
+    let mut top_listings = top_listings.into_inner().unwrap();
 
-    while let Some(entry) = entries.next_entry().await? {
-        let file_type = entry.file_type().await?;
-        if !file_type.is_dir() {
-            continue;
+    // A top-level folder holding projects is a grouping folder, not a project
+    let groups: HashSet<PathBuf> = projects
+        .iter()
+        .filter_map(
+            |dir| match dir.path.strip_prefix(root).ok()?.components().next()? {
+                Component::Normal(name) => Some(root.join(name)),
+                _ => None,
+            },
+        )
+        .collect();
+    for path in &containers {
+        if path.parent() == Some(root) && !groups.contains(path) {
+            let mut dir = ProjectDir::new(root, path.clone());
+            dir.listing = top_listings.remove(path).map(Arc::new);
+            projects.push(dir);
         }
+    }
+
+    projects.sort_by(|a, b| a.path.cmp(&b.path));
+    Discovery {
+        projects,
+        containers,
+    }
+}
+
+/// Short hash of a project's path below its root, telling apart ids that
+/// collide. Independent of discovery order and of the build (32-bit FNV-1a),
+/// and mirrored by the web scanner so both apps agree on ids.
+fn path_suffix(relative: &Path) -> String {
+    let relative = relative
+        .to_string_lossy()
+        .replace(std::path::MAIN_SEPARATOR, "/");
+    let hash = relative.bytes().fold(0x811c_9dc5_u32, |hash, byte| {
+        (hash ^ byte as u32).wrapping_mul(0x0100_0193)
+    });
+    format!("{:06x}", hash >> 8)
+}
+
+/// Discovers projects under every root in parallel and merges the results.
+///
+/// Ids are made unique across roots, and a directory reachable from two
+/// overlapping roots is listed once. Fails only if no root could be read.
+pub async fn discover_roots(roots: &[ScanRoot]) -> Result<Discovery> {
+    let results = futures::future::join_all(
+        roots
+            .iter()
+            .map(|root| discover_projects(&root.path, &root.options)),
+    )
+    .await;
 
-        let name = entry.file_name().to_string_lossy().to_string();
+    let mut merged = Discovery::default();
+    let mut ids = HashSet::new();
+    let mut paths = HashSet::new();
+    let mut last_error = None;
+    let mut any_ok = false;
 
-        if IGNORED_DIRECTORIES.contains(&name.as_str()) {
-            continue;
+    for (root, result) in roots.iter().zip(results) {
+        let discovery = match result {
+            Ok(discovery) => discovery,
+            Err(e) => {
+                last_error = Some(e);
+                continue;
+            }
+        };
+        any_ok = true;
+
+        let git_limit = root.git_limit();
+        let mut dirs: Vec<ProjectDir> = discovery
+            .projects
+            .into_iter()
+            .filter(|dir| paths.insert(dir.path.clone()))
+            .collect();
+        if let Some(prefix) = &root.id_prefix {
+            for dir in &mut dirs {
+                dir.id = create_project_id(&format!("{}-{}", prefix, dir.id));
+            }
+        }
+        // Distinct paths can still flatten to one id, e.g. `a-b/c` and `a/b-c`.
+        // Every one of them is suffixed, so none takes over the plain id
+        // depending on which sorts first
+        let mut counts: HashMap<String, usize> = HashMap::new();
+        for dir in &dirs {
+            *counts.entry(dir.id.clone()).or_default() += 1;
         }
 
-        if !options.include_hidden && name.starts_with('.') {
-            continue;
+        for mut dir in dirs {
+            if counts[&dir.id] > 1 || ids.contains(&dir.id) {
+                let relative = dir.path.strip_prefix(&root.path).unwrap_or(&dir.path);
+                dir.id = format!("{}-{}", dir.id, path_suffix(relative));
+            }
+            // Only two paths whose hashes collide too get a counter
+            let base = dir.id.clone();
+            let mut n = 2;
+            while !ids.insert(dir.id.clone()) {
+                dir.id = format!("{}-{}", base, n);
+                n += 1;
+            }
+            dir.git_limit = git_limit.clone();
+            merged.projects.push(dir);
         }
+        merged.containers.extend(discovery.containers);
+    }
 
-        let full_path = entry.path();
+    match last_error {
+        Some(e) if !any_ok => Err(e),
+        _ => Ok(merged),
+    }
+}
 
-        match scan_project(&full_path, &name).await {
-            Ok(mut project) => {
-                if !is_project_directory(&full_path).await {
-                    project.status = "unknown".to_string();
-                }
-                projects.push(project);
-            }
-            Err(_) => continue,
+/// Lists the candidate project directories under the projects root.
+pub async fn list_project_dirs(
+    projects_path: &str,
+    options: &ScanOptions,
+) -> Result<Vec<ProjectDir>> {
+    Ok(discover_projects(projects_path, options).await?.projects)
+}
+
+/// Scans a directory for project subdirectories.
+pub async fn scan_directory(projects_path: &str, options: &ScanOptions) -> Result<Vec<Project>> {
+    let mut projects = Vec::new();
+
+    for dir in list_project_dirs(projects_path, options).await? {
+        if let Ok((project, _)) = probe_project(&dir).await {
+            projects.push(project);
         }
     }
 
     Ok(projects)
 }
 
+/// Most READMEs kept in memory by `get_readme_content`.
+const README_CACHE_CAPACITY: usize = 256;
+
+/// A README read, valid while the file keeps the same mtime and size.
+struct CachedReadme {
+    mtime: Option<std::time::SystemTime>,
+    size: u64,
+    content: String,
+}
+
+static README_CACHE: OnceLock<Mutex<HashMap<PathBuf, CachedReadme>>> = OnceLock::new();
+
+fn readme_cache() -> std::sync::MutexGuard<'static, HashMap<PathBuf, CachedReadme>> {
+    README_CACHE
+        .get_or_init(|| Mutex::new(HashMap::new()))
+        .lock()
+        .unwrap_or_else(|e| e.into_inner())
+}
+
+/// Reads at most `MAX_README_LENGTH` bytes of a file as UTF-8, cutting any
+/// truncated content at a character boundary.
+///
+/// Returns None if the file can't be read or isn't valid UTF-8.
+async fn read_bounded(file_path: &Path) -> Option<String> {
+    let file = fs::File::open(file_path).await.ok()?;
+    diagnostics::count(Counter::FileReads, 1);
+    let mut bytes = Vec::new();
+    // One extra byte tells a file of exactly the limit from a longer one
+    file.take(MAX_README_LENGTH as u64 + 1)
+        .read_to_end(&mut bytes)
+        .await
+        .ok()?;
+    diagnostics::count(Counter::BytesRead, bytes.len() as u64);
+
+    let truncated = bytes.len() > MAX_README_LENGTH;
+    bytes.truncate(MAX_README_LENGTH);
+
+    let content = match String::from_utf8(bytes) {
+        Ok(content) => content,
+        // The limit split a multi-byte character; drop its partial bytes
+        Err(e) if truncated && e.utf8_error().error_len().is_none() => {
+            let valid = e.utf8_error().valid_up_to();
+            let mut bytes = e.into_bytes();
+            bytes.truncate(valid);
+            String::from_utf8(bytes).ok()?
+        }
+        Err(_) => return None,
+    };
+
+    if truncated {
+        Some(format!("{}\n\n... (truncated)", content))
+    } else {
+        Some(content)
+    }
+}
+
 /// Reads README content from a project directory.
+///
+/// Reads are bounded to `MAX_README_LENGTH` and cached by path, mtime and
+/// size, so reopening a project only stats the file.
+#[tracing::instrument(skip_all)]
 pub async fn get_readme_content(project_path: &str) -> Result<Option<String>> {
     let path = Path::new(project_path);
+    // One listing finds the README instead of trying each name in turn
+    let listing = match DirListing::read_async(path).await {
+        Ok(listing) => listing,
+        Err(_) => return Ok(None),
+    };
+    read_readme(path, &listing).await
+}
 
-    for file_name in README_FILES {
+/// Reads README content like `get_readme_content`, finding the file in a
+/// listing the caller already has.
+pub async fn read_readme(path: &Path, listing: &DirListing) -> Result<Option<String>> {
+    for file_name in listing.present(README_FILES) {
         let file_path = path.join(file_name);
-        if let Ok(content) = fs::read_to_string(&file_path).await {
-            if content.len() > MAX_README_LENGTH {
-                return Ok(Some(format!(
-                    "{}\n\n... (truncated)",
-                    &content[..MAX_README_LENGTH]
-                )));
+        diagnostics::count(Counter::Stats, 1);
+        let metadata = match fs::metadata(&file_path).await {
+            Ok(metadata) if metadata.is_file() => metadata,
+            _ => continue,
+        };
+        let mtime = metadata.modified().ok();
+        let size = metadata.len();
+
+        if let Some(cached) = readme_cache().get(&file_path) {
+            if cached.mtime == mtime && cached.size == size {
+                return Ok(Some(cached.content.clone()));
             }
+        }
+
+        if let Some(content) = read_bounded(&file_path).await {
+            let mut cache = readme_cache();
+            if cache.len() >= README_CACHE_CAPACITY && !cache.contains_key(&file_path) {
+                // Any entry will do; the cache only spares repeat reads
+                if let Some(evicted) = cache.keys().next().cloned() {
+                    cache.remove(&evicted);
+                }
+            }
+            cache.insert(
+                file_path,
+                CachedReadme {
+                    mtime,
+                    size,
+                    content: content.clone(),
+                },
+            );
             return Ok(Some(content));
         }
     }
 
     Ok(None)
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn root(path: &Path) -> ScanRoot {
+        ScanRoot {
+            path: path.to_string_lossy().to_string(),
+            id_prefix: None,
+            options: ScanOptions {
+                max_depth: 2,
+                ..ScanOptions::default()
+            },
+            git_concurrency: None,
+        }
+    }
+
+    fn add_project(root: &Path, relative: &str) {
+        let dir = root.join(relative);
+        std::fs::create_dir_all(&dir).unwrap();
+        std::fs::write(dir.join("package.json"), "{}").unwrap();
+    }
+
+    async fn ids(root_path: &Path) -> HashMap<String, String> {
+        discover_roots(&[root(root_path)])
+            .await
+            .unwrap()
+            .projects
+            .into_iter()
+            .map(|dir| {
+                let relative = dir.path.strip_prefix(root_path).unwrap();
+                (relative.to_string_lossy().replace('\\', "/"), dir.id)
+            })
+            .collect()
+    }
+
+    #[tokio::test]
+    async fn new_colliding_path_that_sorts_first_takes_no_plain_id() {
+        let temp = tempfile::tempdir().unwrap();
+        add_project(temp.path(), "a/b-c");
+        assert_eq!(ids(temp.path()).await["a/b-c"], "a-b-c");
+
+        // `a-b/c` sorts before `a/b-c` ('-' < '/') and flattens to the same id
+        add_project(temp.path(), "a-b/c");
+        let ids = ids(temp.path()).await;
+        assert_eq!(
+            ids["a/b-c"],
+            format!("a-b-c-{}", path_suffix(Path::new("a/b-c")))
+        );
+        assert_eq!(
+            ids["a-b/c"],
+            format!("a-b-c-{}", path_suffix(Path::new("a-b/c")))
+        );
+    }
+
+    #[test]
+    fn path_suffix_matches_the_web_scanner() {
+        // Values of `pathSuffix` in apps/web/src/lib/project-scanner.ts
+        assert_eq!(path_suffix(Path::new("a/b-c")), "3f7971");
+        assert_eq!(path_suffix(Path::new("a-b/c")), "508f05");
+    }
+}
@@ -0,0 +1,257 @@
+use crate::registry::ProjectRegistry;
+use crate::scanner::{self, Project, ProjectDir, ScanRoot};
+use crate::tags::TagStore;
+use crate::watcher::{ProjectsChangedEvent, PROJECTS_CHANGED_EVENT};
+use std::collections::hash_map::DefaultHasher;
+use std::collections::{HashMap, HashSet};
+use std::hash::{Hash, Hasher};
+use std::path::{Path, PathBuf};
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::Arc;
+use std::time::{Duration, Instant};
+use tauri::{AppHandle, Emitter, Manager};
+
+/// How often the scheduler looks for projects that are due.
+const TICK: Duration = Duration::from_secs(5);
+
+/// Most projects re-checked in one tick, so a backlog never turns into a full rescan.
+const MAX_BATCH: usize = 16;
+
+/// How long a power source reading is trusted.
+const POWER_CHECK_INTERVAL: Duration = Duration::from_secs(60);
+
+/// How often a repository is re-checked, by how likely it is to change.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+enum Tier {
+    /// Dirty or recently active.
+    Hot,
+    /// Clean and touched within the stale threshold.
+    Warm,
+    /// Not touched in a long time.
+    Cold,
+}
+
+impl Tier {
+    /// Returns the tier of a project, or None if it has no git status to refresh.
+    fn of(project: &Project) -> Option<Self> {
+        let git_info = project.git_info.as_ref()?;
+        Some(if git_info.is_dirty || project.status == "active" {
+            Tier::Hot
+        } else if project.status == "stale" {
+            Tier::Cold
+        } else {
+            Tier::Warm
+        })
+    }
+
+    /// Interval right after a change, and the longest it backs off to.
+    fn intervals(self) -> (Duration, Duration) {
+        match self {
+            Tier::Hot => (Duration::from_secs(30), Duration::from_secs(5 * 60)),
+            Tier::Warm => (Duration::from_secs(5 * 60), Duration::from_secs(60 * 60)),
+            Tier::Cold => (
+                Duration::from_secs(60 * 60),
+                Duration::from_secs(24 * 60 * 60),
+            ),
+        }
+    }
+}
+
+struct Schedule {
+    tier: Tier,
+    /// Consecutive re-checks that found nothing new.
+    unchanged: u32,
+    next_due: Instant,
+}
+
+impl Schedule {
+    /// Schedules a newly seen project at a stable offset within its first
+    /// interval, so projects loaded together are not all due together.
+    fn new(project_id: &str, tier: Tier, now: Instant) -> Self {
+        let mut hasher = DefaultHasher::new();
+        project_id.hash(&mut hasher);
+        let offset = (hasher.finish() % 1000) as f64 / 1000.0;
+
+        Self {
+            tier,
+            unchanged: 0,
+            next_due: now + tier.intervals().0.mul_f64(offset),
+        }
+    }
+
+    /// Doubles the base interval for every unchanged result, up to the tier's maximum.
+    fn interval(&self) -> Duration {
+        let (base, max) = self.tier.intervals();
+        base.saturating_mul(1 << self.unchanged.min(16)).min(max)
+    }
+}
+
+/// Checks whether the machine is running on battery (Linux and macOS only).
+#[cfg(target_os = "linux")]
+fn on_battery() -> bool {
+    let Ok(supplies) = std::fs::read_dir("/sys/class/power_supply") else {
+        return false;
+    };
+
+    // Any online mains adapter means AC power; no adapter at all is a desktop
+    let mut has_mains = false;
+    for supply in supplies.filter_map(|entry| entry.ok()) {
+        let path: PathBuf = supply.path();
+        let kind = std::fs::read_to_string(path.join("type")).unwrap_or_default();
+        if kind.trim() == "Mains" {
+            has_mains = true;
+            let online = std::fs::read_to_string(path.join("online")).unwrap_or_default();
+            if online.trim() == "1" {
+                return false;
+            }
+        }
+    }
+    has_mains
+}
+
+#[cfg(target_os = "macos")]
+fn on_battery() -> bool {
+    std::process::Command::new("pmset")
+        .args(["-g", "batt"])
+        .output()
+        .map(|output| String::from_utf8_lossy(&output.stdout).contains("'Battery Power'"))
+        .unwrap_or(false)
+}
+
+#[cfg(not(any(target_os = "linux", target_os = "macos")))]
+fn on_battery() -> bool {
+    false
+}
+
+/// Power source reading, refreshed at most every `POWER_CHECK_INTERVAL`.
+#[derive(Default)]
+struct PowerState {
+    on_battery: bool,
+    checked_at: Option<Instant>,
+}
+
+impl PowerState {
+    async fn on_battery(&mut self) -> bool {
+        let fresh = self
+            .checked_at
+            .is_some_and(|at| at.elapsed() < POWER_CHECK_INTERVAL);
+        if !fresh {
+            self.on_battery = tokio::task::spawn_blocking(on_battery)
+                .await
+                .unwrap_or(false);
+            self.checked_at = Some(Instant::now());
+        }
+        self.on_battery
+    }
+}
+
+/// Handle to the background refresh scheduler held in Tauri managed state.
+///
+/// Keeps git status in the index fresh without full rescans: dirty and
+/// recently active repositories are re-checked every few minutes, clean
+/// ones hourly and stale ones daily, each backing off while nothing
+/// changes. Paused while the window is hidden or the machine is on battery.
+pub struct RefreshScheduler {
+    hidden: Arc<AtomicBool>,
+}
+
+impl RefreshScheduler {
+    /// Starts the scheduler in the background.
+    pub fn spawn(app: AppHandle) -> Self {
+        let hidden = Arc::new(AtomicBool::new(false));
+        let paused = Arc::clone(&hidden);
+        tauri::async_runtime::spawn(async move { run(app, paused).await });
+        Self { hidden }
+    }
+
+    /// Records whether the app window is visible; re-checks pause while hidden.
+    pub fn set_visible(&self, visible: bool) {
+        self.hidden.store(!visible, Ordering::Relaxed);
+    }
+}
+
+async fn run(app: AppHandle, hidden: Arc<AtomicBool>) {
+    let mut schedules: HashMap<String, Schedule> = HashMap::new();
+    let mut power = PowerState::default();
+    let mut ticker = tokio::time::interval(TICK);
+
+    loop {
+        ticker.tick().await;
+        if hidden.load(Ordering::Relaxed) || power.on_battery().await {
+            continue;
+        }
+
+        let registry = app.state::<ProjectRegistry>();
+        let (projects, _) = registry.cached().await;
+        let roots = ScanRoot::configured();
+        let now = Instant::now();
+
+        let mut due = Vec::new();
+        let mut present = HashSet::new();
+        for project in &projects {
+            let Some(tier) = Tier::of(project) else {
+                continue;
+            };
+            present.insert(project.id.as_str());
+
+            let schedule = schedules
+                .entry(project.id.clone())
+                .or_insert_with(|| Schedule::new(&project.id, tier, now));
+            // A project that became dirty or went stale starts over in its new tier
+            if schedule.tier != tier {
+                schedule.tier = tier;
+                schedule.unchanged = 0;
+                schedule.next_due = schedule.next_due.min(now + schedule.interval());
+            }
+
+            if schedule.next_due <= now {
+                due.push((
+                    schedule.next_due,
+                    ProjectDir {
+                        id: project.id.clone(),
+                        name: project.name.clone(),
+                        path: PathBuf::from(&project.path),
+                        git_limit: scanner::git_limit_for(&roots, Path::new(&project.path)),
+                        listing: None,
+                    },
+                ));
+            }
+        }
+        schedules.retain(|id, _| present.contains(id.as_str()));
+
+        if due.is_empty() {
+            continue;
+        }
+        due.sort_by_key(|(next_due, _)| *next_due);
+        due.truncate(MAX_BATCH);
+
+        let ids: Vec<String> = due.iter().map(|(_, dir)| dir.id.clone()).collect();
+        let mut changed = registry
+            .recheck(due.into_iter().map(|(_, dir)| dir).collect())
+            .await;
+
+        let changed_ids: HashSet<&str> = changed.iter().map(|p| p.id.as_str()).collect();
+        let now = Instant::now();
+        for id in &ids {
+            if let Some(schedule) = schedules.get_mut(id) {
+                if changed_ids.contains(id.as_str()) {
+                    schedule.unchanged = 0;
+                } else {
+                    schedule.unchanged = schedule.unchanged.saturating_add(1);
+                }
+                schedule.next_due = now + schedule.interval();
+            }
+        }
+
+        if !changed.is_empty() {
+            app.state::<TagStore>().attach(&mut changed).await;
+            let _ = app.emit(
+                PROJECTS_CHANGED_EVENT,
+                ProjectsChangedEvent {
+                    changed,
+                    ..Default::default()
+                },
+            );
+        }
+    }
+}
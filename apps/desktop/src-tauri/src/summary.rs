@@ -0,0 +1,194 @@
+use crate::scanner::Project;
+use serde::{Serialize, Serializer};
+use std::collections::HashMap;
+
+/// Project has a package.json.
+pub const FLAG_PACKAGE_JSON: u8 = 1;
+/// Project has a README.
+pub const FLAG_README: u8 = 1 << 1;
+/// Project is a git repository.
+pub const FLAG_GIT: u8 = 1 << 2;
+/// Git working directory has uncommitted changes.
+pub const FLAG_DIRTY: u8 = 1 << 3;
+/// Git info is partial; the full read is still running.
+pub const FLAG_PARTIAL: u8 = 1 << 4;
+
+/// Project status sent as a small integer.
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+#[repr(u8)]
+pub enum StatusCode {
+    Active = 0,
+    Stale = 1,
+    Clean = 2,
+    Dirty = 3,
+    Unknown = 4,
+}
+
+impl StatusCode {
+    pub fn from_status(status: &str) -> Self {
+        match status {
+            "active" => StatusCode::Active,
+            "stale" => StatusCode::Stale,
+            "clean" => StatusCode::Clean,
+            "dirty" => StatusCode::Dirty,
+            _ => StatusCode::Unknown,
+        }
+    }
+}
+
+impl Serialize for StatusCode {
+    fn serialize<S: Serializer>(&self, serializer: S) -> Result<S::Ok, S::Error> {
+        serializer.serialize_u8(*self as u8)
+    }
+}
+
+/// One row of the dashboard grid, referencing the interned tables of its list.
+#[derive(Debug, Clone, Serialize)]
+#[serde(rename_all = "camelCase")]
+pub struct SummaryRow {
+    pub id: String,
+    pub name: String,
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub description: Option<String>,
+    /// Index into `roots`; the full path is the root followed by `path`.
+    pub root: u32,
+    pub path: String,
+    pub status: StatusCode,
+    /// Milliseconds since the Unix epoch.
+    pub last_modified: i64,
+    /// Bit set of the `FLAG_*` constants.
+    pub flags: u8,
+    /// Index into `branches`.
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub branch: Option<u32>,
+    #[serde(skip_serializing_if = "is_zero")]
+    pub changes: usize,
+    /// Indexes into `tags`.
+    #[serde(skip_serializing_if = "Vec::is_empty")]
+    pub tags: Vec<u32>,
+}
+
+fn is_zero(value: &usize) -> bool {
+    *value == 0
+}
+
+/// Compact project list for the dashboard.
+///
+/// Carries only what the grid and table render. Repeated strings (roots,
+/// branch names, tags) are sent once and referenced by index; everything
+/// else is fetched per project with `get_project`.
+#[derive(Debug, Clone, Default, Serialize)]
+#[serde(rename_all = "camelCase")]
+pub struct ProjectSummaryList {
+    pub roots: Vec<String>,
+    pub branches: Vec<String>,
+    pub tags: Vec<String>,
+    pub projects: Vec<SummaryRow>,
+    pub total: usize,
+    /// Milliseconds since the Unix epoch, if the projects were ever scanned.
+    pub scanned_at: Option<i64>,
+}
+
+/// Assigns stable indexes to repeated strings.
+#[derive(Default)]
+struct Interner {
+    values: Vec<String>,
+    indexes: HashMap<String, u32>,
+}
+
+impl Interner {
+    fn intern(&mut self, value: &str) -> u32 {
+        if let Some(index) = self.indexes.get(value) {
+            return *index;
+        }
+        let index = self.values.len() as u32;
+        self.values.push(value.to_string());
+        self.indexes.insert(value.to_string(), index);
+        index
+    }
+}
+
+/// Parses an RFC 3339 timestamp into epoch milliseconds, 0 if invalid.
+pub fn epoch_ms(timestamp: &str) -> i64 {
+    chrono::DateTime::parse_from_rfc3339(timestamp)
+        .map(|date| date.timestamp_millis())
+        .unwrap_or(0)
+}
+
+/// Builds a summary list from projects whose tags are already attached.
+///
+/// `roots` are the scanned roots; paths outside them are sent whole under an
+/// empty root.
+pub fn summarize(
+    projects: &[Project],
+    roots: &[String],
+    scanned_at: Option<&str>,
+) -> ProjectSummaryList {
+    let mut root_table = Interner::default();
+    let mut branches = Interner::default();
+    let mut tags = Interner::default();
+
+    let rows = projects
+        .iter()
+        .map(|project| {
+            let (root, path) = roots
+                .iter()
+                .find_map(|root| {
+                    let rest = project.path.strip_prefix(root.as_str())?;
+                    Some((root_table.intern(root), rest.to_string()))
+                })
+                .unwrap_or_else(|| (root_table.intern(""), project.path.clone()));
+
+            let mut flags = 0;
+            if project.has_package_json {
+                flags |= FLAG_PACKAGE_JSON;
+            }
+            if project.has_readme {
+                flags |= FLAG_README;
+            }
+            if let Some(git_info) = &project.git_info {
+                flags |= FLAG_GIT;
+                if git_info.is_dirty {
+                    flags |= FLAG_DIRTY;
+                }
+                if git_info.partial {
+                    flags |= FLAG_PARTIAL;
+                }
+            }
+
+            SummaryRow {
+                id: project.id.clone(),
+                name: project.name.clone(),
+                description: project.description.clone(),
+                root,
+                path,
+                status: StatusCode::from_status(&project.status),
+                last_modified: epoch_ms(&project.last_modified),
+                flags,
+                branch: project
+                    .git_info
+                    .as_ref()
+                    .map(|info| branches.intern(&info.branch)),
+                changes: project
+                    .git_info
+                    .as_ref()
+                    .map_or(0, |info| info.uncommitted_changes),
+                tags: project
+                    .tags
+                    .iter()
+                    .flatten()
+                    .map(|tag| tags.intern(tag))
+                    .collect(),
+            }
+        })
+        .collect::<Vec<_>>();
+
+    ProjectSummaryList {
+        roots: root_table.values,
+        branches: branches.values,
+        tags: tags.values,
+        total: rows.len(),
+        projects: rows,
+        scanned_at: scanned_at.map(epoch_ms),
+    }
+}
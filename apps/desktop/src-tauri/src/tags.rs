@@ -1,7 +1,16 @@
+use crate::scanner::Project;
 use anyhow::Result;
-use std::collections::{HashMap, HashSet};
+use std::collections::{BTreeMap, HashMap, HashSet};
 use std::path::PathBuf;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::Arc;
+use std::time::{Duration, SystemTime};
 use tokio::fs;
+use tokio::sync::{Mutex, RwLock, RwLockMappedWriteGuard, RwLockReadGuard, RwLockWriteGuard};
+
+/// How long tag changes are held before being written, so bursts of edits
+/// coalesce into a single write.
+const FLUSH_DELAY: Duration = Duration::from_millis(300);
 
 /// Returns the path to the organizeMe configuration directory.
 fn get_config_dir() -> PathBuf {
@@ -26,6 +35,7 @@ async fn ensure_config_directory() -> Result<()> {
 }
 
 /// Loads all project tags from the storage file.
+#[tracing::instrument(skip_all)]
 async fn load_project_tags() -> Result<ProjectTagsData> {
     let tags_file = get_tags_file();
 
@@ -39,62 +49,296 @@ async fn load_project_tags() -> Result<ProjectTagsData> {
     }
 }
 
-/// Saves all project tags to the storage file.
-async fn save_project_tags(data: &ProjectTagsData) -> Result<()> {
+/// Writes serialized tags to a temporary file and renames it into place.
+async fn save_project_tags(content: Vec<u8>) -> Result<()> {
     ensure_config_directory().await?;
     let tags_file = get_tags_file();
-    let content = serde_json::to_string_pretty(data)?;
-    fs::write(&tags_file, content).await?;
+    let tmp_file = tags_file.with_extension("json.tmp");
+    fs::write(&tmp_file, content).await?;
+    fs::rename(&tmp_file, &tags_file).await?;
     Ok(())
 }
 
-/// Gets the tags for a specific project.
-pub async fn get_project_tags(project_id: &str) -> Result<Vec<String>> {
-    let all_tags = load_project_tags().await?;
-    Ok(all_tags.get(project_id).cloned().unwrap_or_default())
+/// Modification time and size of the tags file, None if it does not exist.
+type FileStamp = Option<(SystemTime, u64)>;
+
+/// Returns the current stamp of the tags file.
+async fn tags_file_stamp() -> FileStamp {
+    let meta = fs::metadata(get_tags_file()).await.ok()?;
+    Some((meta.modified().ok()?, meta.len()))
+}
+
+/// A change made in the app that is not yet written to the tags file.
+enum TagEdit {
+    Add(String, String),
+    Remove(String, String),
 }
 
-/// Gets all unique tags across all projects, sorted alphabetically.
-pub async fn get_all_tags() -> Result<Vec<String>> {
-    let all_tags = load_project_tags().await?;
-    let mut tag_set = HashSet::new();
+/// Project tags plus an inverted tag → projects index.
+struct TagData {
+    by_project: ProjectTagsData,
+    by_tag: BTreeMap<String, HashSet<String>>,
+    /// Stamp of the tags file when it was last loaded or written.
+    stamp: FileStamp,
+    /// Edits not yet written, replayed over the file if something else,
+    /// e.g. the web app, changed it in the meantime.
+    pending: Vec<TagEdit>,
+}
 
-    for tags in all_tags.values() {
-        for tag in tags {
-            tag_set.insert(tag.clone());
+impl TagData {
+    fn new(by_project: ProjectTagsData, stamp: FileStamp) -> Self {
+        let mut by_tag: BTreeMap<String, HashSet<String>> = BTreeMap::new();
+        for (project_id, tags) in &by_project {
+            for tag in tags {
+                by_tag
+                    .entry(tag.clone())
+                    .or_default()
+                    .insert(project_id.clone());
+            }
+        }
+        Self {
+            by_project,
+            by_tag,
+            stamp,
+            pending: Vec::new(),
         }
     }
 
-    let mut tags: Vec<String> = tag_set.into_iter().collect();
-    tags.sort();
-    Ok(tags)
-}
+    /// Loads the tags file, taking its stamp first so a change made while
+    /// reading is picked up next time.
+    async fn load() -> Result<Self> {
+        let stamp = tags_file_stamp().await;
+        Ok(Self::new(load_project_tags().await?, stamp))
+    }
 
-/// Adds a tag to a project. Does not duplicate if already present.
-pub async fn add_tag_to_project(project_id: &str, tag: &str) -> Result<()> {
-    let mut all_tags = load_project_tags().await?;
-    let project_tags = all_tags
-        .entry(project_id.to_string())
-        .or_insert_with(Vec::new);
+    /// Reloads the tags file if it changed since it was last loaded or
+    /// written, keeping the edits not yet written on top of it.
+    async fn refresh(&mut self) {
+        if tags_file_stamp().await == self.stamp {
+            return;
+        }
+        // A file caught mid-write by another app is retried on the next access
+        let Ok(mut fresh) = Self::load().await else {
+            return;
+        };
+        for edit in &self.pending {
+            match edit {
+                TagEdit::Add(project_id, tag) => fresh.add(project_id, tag),
+                TagEdit::Remove(project_id, tag) => fresh.remove(project_id, tag),
+            };
+        }
+        fresh.pending = std::mem::take(&mut self.pending);
+        *self = fresh;
+    }
+
+    /// Adds a tag to a project, returning whether anything changed.
+    fn add(&mut self, project_id: &str, tag: &str) -> bool {
+        let project_tags = self.by_project.entry(project_id.to_string()).or_default();
+        if project_tags.iter().any(|t| t == tag) {
+            return false;
+        }
 
-    if !project_tags.contains(&tag.to_string()) {
         project_tags.push(tag.to_string());
+        self.by_tag
+            .entry(tag.to_string())
+            .or_default()
+            .insert(project_id.to_string());
+        true
+    }
+
+    /// Removes a tag from a project, returning whether anything changed.
+    fn remove(&mut self, project_id: &str, tag: &str) -> bool {
+        let Some(project_tags) = self.by_project.get_mut(project_id) else {
+            return false;
+        };
+        let before = project_tags.len();
+        project_tags.retain(|t| t != tag);
+        if project_tags.len() == before {
+            return false;
+        }
+        if project_tags.is_empty() {
+            self.by_project.remove(project_id);
+        }
+
+        if let Some(projects) = self.by_tag.get_mut(tag) {
+            projects.remove(project_id);
+            if projects.is_empty() {
+                self.by_tag.remove(tag);
+            }
+        }
+        true
     }
 
-    save_project_tags(&all_tags).await
+    fn project_tags(&self, project_id: &str) -> Vec<String> {
+        self.by_project.get(project_id).cloned().unwrap_or_default()
+    }
 }
 
-/// Removes a tag from a project.
-pub async fn remove_tag_from_project(project_id: &str, tag: &str) -> Result<()> {
-    let mut all_tags = load_project_tags().await?;
+struct Inner {
+    data: RwLock<Option<TagData>>,
+    flush_scheduled: AtomicBool,
+    /// Serializes file writes so a newer snapshot is never overwritten by an older one.
+    write_lock: Mutex<()>,
+}
 
-    if let Some(project_tags) = all_tags.get_mut(project_id) {
-        project_tags.retain(|t| t != tag);
+impl Inner {
+    /// Writes the current tags to disk, first merging in changes made to the
+    /// file by another app.
+    #[tracing::instrument(name = "flush_tags", skip_all)]
+    async fn flush(&self) -> Result<()> {
+        let _write = self.write_lock.lock().await;
+        let (content, written) = {
+            let mut guard = self.data.write().await;
+            let Some(data) = guard.as_mut() else {
+                return Ok(());
+            };
+            if data.pending.is_empty() {
+                return Ok(());
+            }
+            data.refresh().await;
+            let content = serde_json::to_vec(&data.by_project)?;
+            (content, std::mem::take(&mut data.pending))
+        };
 
-        if project_tags.is_empty() {
-            all_tags.remove(project_id);
+        let result = save_project_tags(content).await;
+        let stamp = tags_file_stamp().await;
+        if let Some(data) = self.data.write().await.as_mut() {
+            if result.is_ok() {
+                data.stamp = stamp;
+            } else {
+                // Kept for the next write, ahead of edits made since
+                let mut pending = written;
+                pending.append(&mut data.pending);
+                data.pending = pending;
+            }
         }
+        result
     }
+}
 
-    save_project_tags(&all_tags).await
+/// Long-lived tag store held in Tauri managed state.
+///
+/// Tags are loaded from project-tags.json and served from memory, reloaded
+/// whenever the file changes underneath, e.g. from the web app. Changes are
+/// written behind: edits made within `FLUSH_DELAY` of each other share a
+/// single atomic write, replayed over the file if it changed meanwhile.
+pub struct TagStore {
+    inner: Arc<Inner>,
+}
+
+impl Default for TagStore {
+    fn default() -> Self {
+        Self {
+            inner: Arc::new(Inner {
+                data: RwLock::new(None),
+                flush_scheduled: AtomicBool::new(false),
+                write_lock: Mutex::new(()),
+            }),
+        }
+    }
+}
+
+impl TagStore {
+    /// Locks the tags for writing, loading them from disk on first use and
+    /// whenever the file changed since.
+    async fn write(&self) -> Result<RwLockMappedWriteGuard<'_, TagData>> {
+        let mut guard = self.inner.data.write().await;
+        match guard.as_mut() {
+            Some(data) => data.refresh().await,
+            None => *guard = Some(TagData::load().await?),
+        }
+        Ok(RwLockWriteGuard::map(guard, |data| {
+            data.as_mut().expect("tags loaded above")
+        }))
+    }
+
+    /// Locks the tags for reading, loading them from disk on first use and
+    /// whenever the file changed since.
+    async fn read(&self) -> Result<RwLockReadGuard<'_, TagData>> {
+        let stamp = tags_file_stamp().await;
+        {
+            let guard = self.inner.data.read().await;
+            if guard.as_ref().is_some_and(|data| data.stamp == stamp) {
+                return Ok(RwLockReadGuard::map(guard, |data| {
+                    data.as_ref().expect("checked above")
+                }));
+            }
+        }
+
+        drop(self.write().await?);
+        let guard = self.inner.data.read().await;
+        Ok(RwLockReadGuard::map(guard, |data| {
+            data.as_ref().expect("tags loaded above")
+        }))
+    }
+
+    /// Schedules a write of the current tags unless one is already pending.
+    fn schedule_flush(&self) {
+        if self.inner.flush_scheduled.swap(true, Ordering::AcqRel) {
+            return;
+        }
+
+        let inner = Arc::clone(&self.inner);
+        tauri::async_runtime::spawn(async move {
+            tokio::time::sleep(FLUSH_DELAY).await;
+            inner.flush_scheduled.store(false, Ordering::Release);
+            // The in-memory tags stay authoritative; the next change retries the write
+            let _ = inner.flush().await;
+        });
+    }
+
+    /// Writes pending changes immediately, e.g. before the app exits.
+    pub async fn flush(&self) -> Result<()> {
+        self.inner.flush().await
+    }
+
+    /// Gets the tags for a specific project.
+    pub async fn project_tags(&self, project_id: &str) -> Result<Vec<String>> {
+        Ok(self.read().await?.project_tags(project_id))
+    }
+
+    /// Gets the tags of every project, keyed by project ID.
+    #[tracing::instrument(skip_all)]
+    pub async fn tags_by_project(&self) -> Result<HashMap<String, Vec<String>>> {
+        Ok(self.read().await?.by_project.clone())
+    }
+
+    /// Fills in the tags of each project in a single pass.
+    #[tracing::instrument(name = "attach_tags", skip_all, fields(projects = projects.len()))]
+    pub async fn attach(&self, projects: &mut [Project]) {
+        // Projects still list fine without tags if the file is unreadable
+        if let Ok(data) = self.read().await {
+            for project in projects {
+                project.tags = Some(data.project_tags(&project.id));
+            }
+        }
+    }
+
+    /// Gets all unique tags across all projects, sorted alphabetically.
+    pub async fn all_tags(&self) -> Result<Vec<String>> {
+        Ok(self.read().await?.by_tag.keys().cloned().collect())
+    }
+
+    /// Adds a tag to a project and returns its updated tags.
+    /// Does not duplicate if already present.
+    pub async fn add(&self, project_id: &str, tag: &str) -> Result<Vec<String>> {
+        let mut data = self.write().await?;
+        if data.add(project_id, tag) {
+            data.pending
+                .push(TagEdit::Add(project_id.to_string(), tag.to_string()));
+            self.schedule_flush();
+        }
+        Ok(data.project_tags(project_id))
+    }
+
+    /// Removes a tag from a project and returns its updated tags.
+    pub async fn remove(&self, project_id: &str, tag: &str) -> Result<Vec<String>> {
+        let mut data = self.write().await?;
+        if data.remove(project_id, tag) {
+            data.pending
+                .push(TagEdit::Remove(project_id.to_string(), tag.to_string()));
+            self.schedule_flush();
+        }
+        Ok(data.project_tags(project_id))
+    }
 }
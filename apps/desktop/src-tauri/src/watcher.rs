@@ -0,0 +1,340 @@
+use crate::git;
+use crate::registry::ProjectRegistry;
+use crate::scanner::{self, Project, ProjectDir, ScanRoot};
+use crate::tags::TagStore;
+use notify::{RecommendedWatcher, RecursiveMode, Watcher};
+use serde::{Deserialize, Serialize};
+use std::collections::{HashMap, HashSet};
+use std::path::{Path, PathBuf};
+use std::time::Duration;
+use tauri::{AppHandle, Emitter, Manager};
+use tokio::sync::mpsc;
+
+/// Event name the frontend listens on for incremental project updates.
+pub const PROJECTS_CHANGED_EVENT: &str = "projects-changed";
+
+/// Quiet period that must pass before a batch of changes is processed.
+const DEBOUNCE: Duration = Duration::from_millis(500);
+
+/// Upper bound on how long a continuous stream of changes can delay a batch.
+const MAX_BATCH_DELAY: Duration = Duration::from_secs(3);
+
+/// Incremental update pushed to the frontend after a debounced batch.
+#[derive(Debug, Default, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+pub struct ProjectsChangedEvent {
+    pub added: Vec<Project>,
+    pub changed: Vec<Project>,
+    pub removed: Vec<String>,
+}
+
+enum Message {
+    Fs(notify::Event),
+    Retarget,
+    /// A repository's git read finished after its time budget ran out.
+    Settled(PathBuf),
+}
+
+/// Handle to the background watcher held in Tauri managed state.
+pub struct ProjectWatcher {
+    tx: mpsc::UnboundedSender<Message>,
+}
+
+impl ProjectWatcher {
+    /// Starts watching the configured projects root in the background.
+    pub fn spawn(app: AppHandle) -> Self {
+        let (tx, rx) = mpsc::unbounded_channel();
+        let fs_tx = tx.clone();
+        let settled_tx = tx.clone();
+        git::on_late_result(move |path| {
+            let _ = settled_tx.send(Message::Settled(PathBuf::from(path)));
+        });
+
+        tauri::async_runtime::spawn(async move {
+            let watcher = notify::recommended_watcher(move |res: notify::Result<notify::Event>| {
+                if let Ok(event) = res {
+                    let _ = fs_tx.send(Message::Fs(event));
+                }
+            });
+
+            // Without a watcher the app still works; it just relies on manual refreshes
+            if let Ok(watcher) = watcher {
+                run(app, watcher, rx).await;
+            }
+        });
+
+        Self { tx }
+    }
+
+    /// Points the watcher at the currently configured projects roots.
+    pub fn retarget(&self) {
+        let _ = self.tx.send(Message::Retarget);
+    }
+}
+
+/// Watches the projects roots, the folders searched for projects, every
+/// project's top level and its `.git` directory.
+struct WatchSet {
+    roots: Vec<ScanRoot>,
+    /// Each root path paired with its canonical form.
+    root_paths: Vec<(PathBuf, PathBuf)>,
+    watched: HashSet<PathBuf>,
+    projects: HashMap<PathBuf, ProjectDir>,
+    containers: HashSet<PathBuf>,
+}
+
+impl WatchSet {
+    fn new(roots: Vec<ScanRoot>) -> Self {
+        let root_paths = roots
+            .iter()
+            .map(|root| {
+                let path = PathBuf::from(&root.path);
+                let canonical = std::fs::canonicalize(&path).unwrap_or_else(|_| path.clone());
+                (path, canonical)
+            })
+            .collect();
+        Self {
+            roots,
+            root_paths,
+            watched: HashSet::new(),
+            projects: HashMap::new(),
+            containers: HashSet::new(),
+        }
+    }
+
+    fn watch(&mut self, watcher: &mut RecommendedWatcher, path: &Path) {
+        if self.watched.contains(path) {
+            return;
+        }
+        if watcher.watch(path, RecursiveMode::NonRecursive).is_ok() {
+            self.watched.insert(path.to_path_buf());
+        }
+    }
+
+    fn unwatch(&mut self, watcher: &mut RecommendedWatcher, path: &Path) {
+        if self.watched.remove(path) {
+            let _ = watcher.unwatch(path);
+        }
+    }
+
+    fn watch_project(&mut self, watcher: &mut RecommendedWatcher, mut dir: ProjectDir) {
+        // The discovery listing is stale by the time a change re-probes the project
+        dir.listing = None;
+        let path = dir.path.clone();
+        self.projects.insert(path.clone(), dir);
+        self.watch(watcher, &path);
+        let git_dir = path.join(".git");
+        if git_dir.is_dir() {
+            self.watch(watcher, &git_dir);
+        }
+    }
+
+    fn unwatch_project(&mut self, watcher: &mut RecommendedWatcher, dir: &Path) {
+        self.projects.remove(dir);
+        self.unwatch(watcher, dir);
+        self.unwatch(watcher, &dir.join(".git"));
+    }
+
+    /// Replaces the watched search folders with a freshly discovered set.
+    fn set_containers(&mut self, watcher: &mut RecommendedWatcher, containers: Vec<PathBuf>) {
+        let containers: HashSet<PathBuf> = containers.into_iter().collect();
+        for old in std::mem::take(&mut self.containers) {
+            if !containers.contains(&old) {
+                self.unwatch(watcher, &old);
+            }
+        }
+        for path in &containers {
+            self.watch(watcher, path);
+        }
+        self.containers = containers;
+    }
+
+    fn unwatch_all(&mut self, watcher: &mut RecommendedWatcher) {
+        for path in self.watched.drain() {
+            let _ = watcher.unwatch(&path);
+        }
+        self.projects.clear();
+        self.containers.clear();
+    }
+
+    /// Maps a changed path to the known project directory containing it.
+    ///
+    /// Returns `Err` for changes outside any known project, which may mean a
+    /// project was added or removed somewhere below a root.
+    fn project_dir_for(&self, path: &Path) -> Result<PathBuf, ()> {
+        for (root, canonical_root) in &self.root_paths {
+            let relative = match path
+                .strip_prefix(root)
+                .or_else(|_| path.strip_prefix(canonical_root))
+            {
+                Ok(relative) => relative,
+                Err(_) => continue,
+            };
+            let path = root.join(relative);
+
+            let found = path
+                .ancestors()
+                .take_while(|ancestor| ancestor != root)
+                .find(|ancestor| self.projects.contains_key(*ancestor))
+                .map(Path::to_path_buf);
+            if let Some(dir) = found {
+                return Ok(dir);
+            }
+        }
+        Err(())
+    }
+}
+
+async fn run(
+    app: AppHandle,
+    mut watcher: RecommendedWatcher,
+    mut rx: mpsc::UnboundedReceiver<Message>,
+) {
+    let mut watch_set = WatchSet::new(ScanRoot::configured());
+    watch_all(&mut watcher, &mut watch_set).await;
+
+    while let Some(first) = rx.recv().await {
+        let mut pending = HashSet::new();
+        let mut rediscover = false;
+        let deadline = tokio::time::Instant::now() + MAX_BATCH_DELAY;
+        let mut next = Some(first);
+
+        // Collect events until the stream goes quiet or the batch deadline passes
+        loop {
+            match next.take() {
+                Some(Message::Fs(event)) => {
+                    for path in &event.paths {
+                        if path.extension().is_some_and(|ext| ext == "lock") {
+                            continue;
+                        }
+                        match watch_set.project_dir_for(path) {
+                            Ok(dir) => {
+                                pending.insert(dir);
+                            }
+                            Err(()) => rediscover = true,
+                        }
+                    }
+                }
+                Some(Message::Settled(path)) => {
+                    // The full result is in the git cache now; re-probing picks it up
+                    if watch_set.projects.contains_key(&path) {
+                        pending.insert(path);
+                    }
+                }
+                Some(Message::Retarget) => {
+                    watch_set.unwatch_all(&mut watcher);
+                    watch_set = WatchSet::new(ScanRoot::configured());
+                    watch_all(&mut watcher, &mut watch_set).await;
+                    pending.clear();
+                    rediscover = false;
+                }
+                None => {}
+            }
+
+            let wait =
+                DEBOUNCE.min(deadline.saturating_duration_since(tokio::time::Instant::now()));
+            match tokio::time::timeout(wait, rx.recv()).await {
+                Ok(Some(message)) => next = Some(message),
+                Ok(None) => return,
+                Err(_) => break,
+            }
+        }
+
+        if pending.is_empty() && !rediscover {
+            continue;
+        }
+
+        let event = apply_batch(&app, &mut watcher, &mut watch_set, pending, rediscover).await;
+        if !event.added.is_empty() || !event.changed.is_empty() || !event.removed.is_empty() {
+            let _ = app.emit(PROJECTS_CHANGED_EVENT, event);
+        }
+    }
+}
+
+/// Watches the roots, the folders searched for projects and every project.
+async fn watch_all(watcher: &mut RecommendedWatcher, watch_set: &mut WatchSet) {
+    let root_paths: Vec<PathBuf> = watch_set
+        .root_paths
+        .iter()
+        .map(|(p, _)| p.clone())
+        .collect();
+    for root in &root_paths {
+        watch_set.watch(watcher, root);
+    }
+
+    if let Ok(discovery) = scanner::discover_roots(&watch_set.roots).await {
+        watch_set.set_containers(watcher, discovery.containers);
+        for dir in discovery.projects {
+            watch_set.watch_project(watcher, dir);
+        }
+    }
+}
+
+/// Re-probes the changed project directories through the registry.
+///
+/// With `rediscover` the roots are searched again first, so projects created
+/// or deleted outside any known project are picked up too.
+async fn apply_batch(
+    app: &AppHandle,
+    watcher: &mut RecommendedWatcher,
+    watch_set: &mut WatchSet,
+    mut pending: HashSet<PathBuf>,
+    rediscover: bool,
+) -> ProjectsChangedEvent {
+    let mut dirs = Vec::new();
+    let mut removed_paths = Vec::new();
+
+    if rediscover {
+        if let Ok(discovery) = scanner::discover_roots(&watch_set.roots).await {
+            watch_set.set_containers(watcher, discovery.containers);
+
+            let found: HashSet<PathBuf> = discovery
+                .projects
+                .iter()
+                .map(|dir| dir.path.clone())
+                .collect();
+            let gone: Vec<PathBuf> = watch_set
+                .projects
+                .keys()
+                .filter(|path| !found.contains(*path))
+                .cloned()
+                .collect();
+            for path in gone {
+                pending.remove(&path);
+                watch_set.unwatch_project(watcher, &path);
+                removed_paths.push(path.to_string_lossy().to_string());
+            }
+
+            for dir in discovery.projects {
+                if !watch_set.projects.contains_key(&dir.path) {
+                    pending.remove(&dir.path);
+                    dirs.push(dir.clone());
+                    watch_set.watch_project(watcher, dir);
+                }
+            }
+        }
+    }
+
+    for path in pending {
+        let known = watch_set.projects.get(&path).cloned();
+        match known {
+            Some(dir) if path.is_dir() => {
+                watch_set.watch_project(watcher, dir.clone());
+                dirs.push(dir);
+            }
+            _ => {
+                watch_set.unwatch_project(watcher, &path);
+                removed_paths.push(path.to_string_lossy().to_string());
+            }
+        }
+    }
+
+    let registry = app.state::<ProjectRegistry>();
+    let mut event = registry.apply_dir_changes(dirs, removed_paths).await;
+
+    let tag_store = app.state::<TagStore>();
+    tag_store.attach(&mut event.added).await;
+    tag_store.attach(&mut event.changed).await;
+
+    event
+}
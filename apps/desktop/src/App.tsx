@@ -1,8 +1,20 @@
+import * as React from "react"
 import { Routes, Route } from "react-router-dom"
 import { DashboardPage } from "./pages/dashboard"
 import { ProjectDetailPage } from "./pages/project-detail"
+import { setAppVisible } from "./lib/tauri-data-provider"
 
 export function App() {
+  // Background status re-checks pause while the window is hidden
+  React.useEffect(() => {
+    const report = () => {
+      setAppVisible(document.visibilityState === "visible").catch(() => {})
+    }
+    report()
+    document.addEventListener("visibilitychange", report)
+    return () => document.removeEventListener("visibilitychange", report)
+  }, [])
+
   return (
     <Routes>
       <Route path="/" element={<DashboardPage />} />
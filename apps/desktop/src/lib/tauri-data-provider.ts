@@ -1,8 +1,9 @@
-import { invoke } from "@tauri-apps/api/core"
+import { Channel, invoke } from "@tauri-apps/api/core"
+import { listen, type UnlistenFn } from "@tauri-apps/api/event"
 import { open } from "@tauri-apps/plugin-dialog"
 import type { DataProvider, RefreshResult, AppResult, TagResult } from "@organizeme/shared/types/data-provider"
 import type { AppSettings } from "@organizeme/shared/types/app-settings"
-import type { Project, ProjectListResponse } from "@organizeme/shared/types/project"
+import type { GitInfo, Project, ProjectListResponse, ProjectStatus } from "@organizeme/shared/types/project"
 
 function errorResult(message: string): AppResult {
   return { success: false, message }
@@ -98,9 +99,24 @@ export const tauriDataProvider: DataProvider = {
     try {
       return await invoke<AppSettings>("update_app_settings", {
         projectsPath: updates.projectsPath,
+        gitConcurrency: updates.gitConcurrency,
+        excludeUntracked: updates.excludeUntracked,
+        gitTimeBudgetMs: updates.gitTimeBudgetMs,
+        writeCommitGraphs: updates.writeCommitGraphs,
+        scanDepth: updates.scanDepth,
+        projectRoots: updates.projectRoots,
       })
+    } catch (err) {
+      // e.g. config.json does not parse and the backend refused to overwrite it
+      throw new Error(errorMessage(err))
+    }
+  },
+
+  getConfigError: async (): Promise<string | null> => {
+    try {
+      return await invoke<string | null>("get_config_error")
     } catch {
-      return { projectsPath: '' }
+      return null
     }
   },
 
@@ -118,6 +134,14 @@ export const tauriDataProvider: DataProvider = {
   },
 }
 
+/**
+ * Fetch the project list straight from the on-disk scan index.
+ * Returns instantly and may be stale; an empty list means no index yet.
+ */
+export async function getCachedProjects(): Promise<ProjectListResponse> {
+  return await invoke<ProjectListResponse>("get_cached_projects")
+}
+
 /**
  * Fetch the full project list from the Rust backend.
  */
@@ -125,6 +149,159 @@ export async function getProjects(): Promise<ProjectListResponse> {
   return await invoke<ProjectListResponse>("get_projects")
 }
 
+/**
+ * Status codes used by the compact summary format, indexed by wire value.
+ */
+const SUMMARY_STATUSES: ProjectStatus[] = ["active", "stale", "clean", "dirty", "unknown"]
+
+const FLAG_PACKAGE_JSON = 1
+const FLAG_README = 1 << 1
+const FLAG_GIT = 1 << 2
+const FLAG_DIRTY = 1 << 3
+const FLAG_PARTIAL = 1 << 4
+
+/**
+ * One dashboard row in the compact summary format.
+ * String fields that repeat across rows are indexes into the list's tables.
+ */
+export interface SummaryRow {
+  id: string
+  name: string
+  description?: string
+  /** Index into `roots`; the full path is the root followed by `path` */
+  root: number
+  path: string
+  /** Index into SUMMARY_STATUSES */
+  status: number
+  /** Milliseconds since the Unix epoch */
+  lastModified: number
+  /** Bit set of FLAG_* values */
+  flags: number
+  /** Index into `branches` */
+  branch?: number
+  changes?: number
+  /** Indexes into `tags` */
+  tags?: number[]
+}
+
+/**
+ * Compact project list carrying only what the grid and table render.
+ */
+export interface ProjectSummaryList {
+  roots: string[]
+  branches: string[]
+  tags: string[]
+  projects: SummaryRow[]
+  total: number
+  scannedAt: number | null
+}
+
+/**
+ * Expand a compact summary list into dashboard-ready projects.
+ * Fields not carried by the summary (README, remote URL, ahead/behind counts)
+ * are left empty; `getProject` fetches them on demand.
+ */
+export function decodeSummaries(list: ProjectSummaryList): Project[] {
+  return list.projects.map((row) => {
+    const hasGit = (row.flags & FLAG_GIT) !== 0
+    return {
+      id: row.id,
+      name: row.name,
+      path: list.roots[row.root] + row.path,
+      description: row.description,
+      status: SUMMARY_STATUSES[row.status] ?? "unknown",
+      lastModified: new Date(row.lastModified),
+      hasPackageJson: (row.flags & FLAG_PACKAGE_JSON) !== 0,
+      hasReadme: (row.flags & FLAG_README) !== 0,
+      gitInfo: hasGit
+        ? {
+            branch: row.branch !== undefined ? list.branches[row.branch] : "",
+            isDirty: (row.flags & FLAG_DIRTY) !== 0,
+            uncommittedChanges: row.changes ?? 0,
+            aheadBy: 0,
+            behindBy: 0,
+            partial: (row.flags & FLAG_PARTIAL) !== 0,
+          }
+        : undefined,
+      tags: (row.tags ?? []).map((index) => list.tags[index]),
+    }
+  })
+}
+
+/**
+ * Fetch the dashboard list in the compact summary format.
+ * Serves the scan index as-is unless `refresh` asks for an incremental rescan.
+ */
+export async function getProjectSummaries(
+  refresh = false
+): Promise<{ projects: Project[]; total: number; scannedAt: Date | null }> {
+  const list = await invoke<ProjectSummaryList>("get_project_summaries", { refresh })
+  return {
+    projects: decodeSummaries(list),
+    total: list.total,
+    scannedAt: list.scannedAt !== null ? new Date(list.scannedAt) : null,
+  }
+}
+
+/**
+ * Git enrichment result for one project, streamed as each repository finishes.
+ */
+export interface GitPatch {
+  id: string
+  status: ProjectStatus
+  gitInfo?: GitInfo | null
+  /** Repositories finished so far in this scan */
+  done: number
+  /** Repositories that needed enrichment in this scan */
+  pending: number
+}
+
+/**
+ * Messages sent over the scan channel, in order: started, records (one or
+ * more batches), gitPatch (one per enriched repository), finished.
+ */
+export type ScanStreamEvent =
+  | { event: "started"; data: { total: number; pendingGit: number } }
+  | { event: "records"; data: ProjectSummaryList }
+  | { event: "gitPatch"; data: GitPatch }
+  | { event: "finished"; data: { total: number; scannedAt: string } }
+
+/**
+ * Scan projects, receiving records and git patches as they become available.
+ * With `force`, every directory is re-probed. Resolves when the scan finishes.
+ */
+export async function streamProjects(
+  force: boolean,
+  onEvent: (event: ScanStreamEvent) => void
+): Promise<void> {
+  const channel = new Channel<ScanStreamEvent>()
+  channel.onmessage = onEvent
+  await invoke("stream_projects", { force, onEvent: channel })
+}
+
+/**
+ * Merge streamed records into a project list, replacing entries by ID.
+ */
+export function mergeProjects(projects: Project[], incoming: Project[]): Project[] {
+  const byId = new Map(incoming.map((p) => [p.id, p]))
+  const merged = projects.map((p) => {
+    const next = byId.get(p.id)
+    if (next) byId.delete(p.id)
+    return next ?? p
+  })
+  return [...merged, ...byId.values()]
+}
+
+/**
+ * Apply a batch of git patches to a project list.
+ */
+export function applyGitPatches(projects: Project[], patches: Map<string, GitPatch>): Project[] {
+  return projects.map((p) => {
+    const patch = patches.get(p.id)
+    return patch ? { ...p, status: patch.status, gitInfo: patch.gitInfo ?? undefined } : p
+  })
+}
+
 /**
  * Fetch a single project by ID with full detail (README, remote URL, etc.)
  */
@@ -132,6 +309,121 @@ export async function getProject(id: string): Promise<Project | null> {
   return await invoke<Project | null>("get_project", { id })
 }
 
+/** Commits by one author. */
+export interface AuthorCommits {
+  /** Name on the author's most recent commit */
+  name: string
+  email: string
+  commits: number
+}
+
+/** Commit activity of a project's current branch. */
+export interface CommitActivity {
+  /** Monday the first week starts on (YYYY-MM-DD, UTC) */
+  startDate: string
+  /** Commits per week for the last year, oldest first */
+  weeklyCommits: number[]
+  topAuthors: AuthorCommits[]
+  firstCommitDate: string | null
+  totalCommits: number
+}
+
+/** Commit activity summed across every repository. */
+export interface PortfolioActivity {
+  /** Monday the first day falls on (YYYY-MM-DD, UTC) */
+  startDate: string
+  /** Commits per day from startDate through today */
+  dailyCommits: number[]
+  topAuthors: AuthorCommits[]
+  totalCommits: number
+  repositories: number
+}
+
+/**
+ * Fetch a project's commit activity. Only commits added since the last
+ * request are walked; null if the project has no commits.
+ */
+export async function getCommitActivity(id: string): Promise<CommitActivity | null> {
+  return await invoke<CommitActivity | null>("get_commit_activity", { id })
+}
+
+/**
+ * Fetch daily commit counts across all repositories for the portfolio heatmap.
+ */
+export async function getPortfolioActivity(): Promise<PortfolioActivity> {
+  return await invoke<PortfolioActivity>("get_portfolio_activity")
+}
+
+/**
+ * Tell the git pool which projects are on screen and favorited so their
+ * git work runs first. Best effort; failures are ignored.
+ */
+export async function setGitPriorities(visibleIds: string[], favoriteIds: string[]): Promise<void> {
+  try {
+    await invoke("set_git_priorities", { visibleIds, favoriteIds })
+  } catch {
+    // Prioritization is an optimization only
+  }
+}
+
+/**
+ * Cancel queued git work for projects that are no longer needed.
+ */
+export async function cancelGitJobs(projectIds: string[]): Promise<number> {
+  try {
+    return await invoke<number>("cancel_git_jobs", { projectIds })
+  } catch {
+    return 0
+  }
+}
+
+/**
+ * Cancel the queued git work of a project's detail page, leaving any scan
+ * work for the project queued.
+ */
+export async function cancelDetailJobs(id: string): Promise<number> {
+  try {
+    return await invoke<number>("cancel_detail_jobs", { id })
+  } catch {
+    return 0
+  }
+}
+
+/**
+ * Incremental update emitted by the backend filesystem watcher.
+ */
+export interface ProjectsChangedEvent {
+  added: Project[]
+  changed: Project[]
+  removed: string[]
+}
+
+/**
+ * Subscribe to debounced project updates from the backend watcher.
+ * Resolves to a function that removes the listener.
+ */
+export async function onProjectsChanged(
+  handler: (event: ProjectsChangedEvent) => void
+): Promise<UnlistenFn> {
+  return await listen<ProjectsChangedEvent>("projects-changed", (event) => handler(event.payload))
+}
+
+/**
+ * Apply a watcher update to a project list, preserving order for existing entries.
+ */
+export function applyProjectsChanged(projects: Project[], event: ProjectsChangedEvent): Project[] {
+  const removed = new Set(event.removed)
+  const changed = new Map(event.changed.map((p) => [p.id, p]))
+  const existing = new Set(projects.map((p) => p.id))
+
+  const patched = projects
+    .filter((p) => !removed.has(p.id))
+    .map((p) => changed.get(p.id) ?? p)
+  const added = event.added.filter((p) => !existing.has(p.id))
+
+  return [...added, ...patched]
+}
+
 /**
  * Fetch README content for a project.
  */
@@ -139,9 +431,104 @@ export async function getReadmeContent(projectPath: string): Promise<string | nu
   return await invoke<string | null>("get_readme_content", { projectPath })
 }
 
+/**
+ * Render a project's README to sanitized HTML in the backend.
+ * Returns null if the project has no README.
+ */
+export async function renderReadme(projectPath: string): Promise<string | null> {
+  return await invoke<string | null>("render_readme", { projectPath })
+}
+
+let markdownThemeCss: Promise<string> | null = null
+
+/**
+ * Get the stylesheet for highlighted code in rendered READMEs.
+ * Fetched once per session.
+ */
+export function getMarkdownThemeCss(): Promise<string> {
+  if (!markdownThemeCss) {
+    markdownThemeCss = invoke<string>("get_markdown_theme_css")
+  }
+  return markdownThemeCss
+}
+
+/**
+ * Tell the backend whether the window is visible, so background status
+ * re-checks pause while it is hidden.
+ */
+export async function setAppVisible(visible: boolean): Promise<void> {
+  await invoke("set_app_visible", { visible })
+}
+
 /**
  * Get git remote URL for a project.
  */
 export async function getGitRemoteUrl(projectPath: string): Promise<string | null> {
   return await invoke<string | null>("get_git_remote_url", { projectPath })
 }
+
+/** A repository's most recent git read, ranked in the slow-repo report. */
+export interface SlowRepo {
+  path: string
+  totalMs: number
+  /** Phase that took longest: fingerprint, lastCommit, aheadBehind or status */
+  slowestPhase: string | null
+  phases: { name: string; ms: number }[]
+  /** Whether the read overran its time budget and finished in the background */
+  overBudget: boolean
+  recordedAt: string
+}
+
+/** Aggregated timings of one backend span, e.g. a command or scan phase. */
+export interface PhaseStats {
+  target: string
+  name: string
+  count: number
+  totalMs: number
+  meanMs: number
+  minMs: number
+  maxMs: number
+  p50Ms: number
+  p95Ms: number
+  p99Ms: number
+}
+
+export interface Diagnostics {
+  phases: PhaseStats[]
+  counters: {
+    dirReads: number
+    stats: number
+    fileReads: number
+    bytesRead: number
+    repoOpens: number
+    statusWalks: number
+  }
+  /** Kernel I/O accounting for the backend process; null outside Linux. */
+  processIo: {
+    readSyscalls: number
+    writeSyscalls: number
+    charsRead: number
+    charsWritten: number
+    bytesRead: number
+    bytesWritten: number
+  } | null
+  lastScan: { startedAt: string; durationMs: number; events: number } | null
+  /** Slowest repositories by their most recent git read, slowest first */
+  slowRepos: SlowRepo[]
+}
+
+/**
+ * Get per-phase timing histograms and I/O counters from the backend.
+ */
+export async function getDiagnostics(): Promise<Diagnostics> {
+  return await invoke<Diagnostics>("get_diagnostics")
+}
+
+/**
+ * Write the last scan as Chrome trace JSON (chrome://tracing or Perfetto).
+ * Defaults to a timestamped file in ~/.organizeme/traces. Returns the path
+ * written, or null if no scan has finished yet.
+ */
+export async function dumpScanTrace(path?: string): Promise<string | null> {
+  return await invoke<string | null>("dump_scan_trace", { path: path ?? null })
+}
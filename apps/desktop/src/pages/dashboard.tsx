@@ -3,9 +3,24 @@ import { useSearchParams } from "react-router-dom"
 import { DashboardContent } from "@organizeme/ui/components/dashboard-content"
 import { Header } from "@organizeme/ui/components/header"
 import { DashboardSkeleton } from "@organizeme/ui/components/dashboard-skeleton"
-import { useDataProvider } from "@organizeme/shared/context/data-provider-context"
-import { getProjects } from "../lib/tauri-data-provider"
+import { CommitHeatmap } from "@organizeme/ui/components/commit-activity"
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@organizeme/ui/ui/card"
+import {
+  applyGitPatches,
+  applyProjectsChanged,
+  cancelGitJobs,
+  decodeSummaries,
+  getPortfolioActivity,
+  getProjectSummaries,
+  mergeProjects,
+  onProjectsChanged,
+  setGitPriorities,
+  streamProjects,
+  type GitPatch,
+  type PortfolioActivity,
+} from "../lib/tauri-data-provider"
 import type { Project, ProjectStatus } from "@organizeme/shared/types/project"
+import type { RefreshResult } from "@organizeme/shared/types/data-provider"
 import type { PaginationRouter } from "@organizeme/shared/hooks/use-pagination"
 
 function useReactRouterPaginationRouter(): PaginationRouter {
@@ -42,37 +57,107 @@ function getStatusSummary(
 }
 
 export function DashboardPage() {
-  const dataProvider = useDataProvider()
   const paginationRouter = useReactRouterPaginationRouter()
   const [projects, setProjects] = React.useState<Project[]>([])
   const [loading, setLoading] = React.useState(true)
   const [error, setError] = React.useState<string | null>(null)
+  const [scanProgress, setScanProgress] = React.useState<{ done: number; total: number } | null>(null)
+  const [portfolio, setPortfolio] = React.useState<PortfolioActivity | null>(null)
+
+  const fetchProjects = React.useCallback(async (force = false): Promise<RefreshResult> => {
+    const seen = new Set<string>()
+    // Git patches arrive one per repository; apply them at most once per frame
+    const patches = new Map<string, GitPatch>()
+    let frame: number | null = null
+    const flushPatches = () => {
+      frame = null
+      if (patches.size === 0) return
+      const batch = new Map(patches)
+      patches.clear()
+      setProjects((prev) => applyGitPatches(prev, batch))
+    }
 
-  const fetchProjects = React.useCallback(async () => {
     try {
-      setLoading(true)
+      // Keep any cached list on screen while the scan runs
       setError(null)
-      const response = await getProjects()
-      setProjects(response.projects)
+      let total = 0
+      await streamProjects(force, (message) => {
+        switch (message.event) {
+          case "started":
+            setScanProgress({ done: 0, total: message.data.pendingGit })
+            break
+          case "records": {
+            const records = decodeSummaries(message.data)
+            for (const project of records) seen.add(project.id)
+            setProjects((prev) => mergeProjects(prev, records))
+            setLoading(false)
+            break
+          }
+          case "gitPatch":
+            patches.set(message.data.id, message.data)
+            setScanProgress({ done: message.data.done, total: message.data.pending })
+            if (frame === null) frame = requestAnimationFrame(flushPatches)
+            break
+          case "finished":
+            total = message.data.total
+            break
+        }
+      })
+
+      if (frame !== null) cancelAnimationFrame(frame)
+      flushPatches()
+      // Drop cached entries for projects that no longer exist
+      setProjects((prev) => prev.filter((p) => seen.has(p.id)))
+      return { success: true, message: `Successfully refreshed ${total} projects`, projectCount: total }
     } catch (err) {
       const message = err instanceof Error ? err.message : String(err)
       setError(message)
       setProjects([])
+      return { success: false, message }
     } finally {
       setLoading(false)
+      setScanProgress(null)
     }
   }, [])
 
   React.useEffect(() => {
-    fetchProjects()
+    // Paint from the scan index first, then reconcile with an incremental scan
+    getProjectSummaries()
+      .then((response) => {
+        if (response.projects.length > 0) {
+          setProjects(response.projects)
+          setLoading(false)
+        }
+      })
+      .catch(() => {})
+      .finally(() => {
+        // The heatmap reads cached history, so fetch it once the list is known
+        fetchProjects().then(() => getPortfolioActivity().then(setPortfolio).catch(() => {}))
+      })
   }, [fetchProjects])
 
-  const handleRefresh = React.useCallback(async () => {
-    const result = await dataProvider.refreshProjects()
-    // Re-fetch projects after refresh
-    await fetchProjects()
-    return result
-  }, [dataProvider, fetchProjects])
+  React.useEffect(() => {
+    // Patch the list in place as the backend watcher reports changes
+    const unlisten = onProjectsChanged((event) => {
+      setProjects((prev) => applyProjectsChanged(prev, event))
+    })
+    return () => {
+      unlisten.then((fn) => fn())
+    }
+  }, [])
+
+  // An explicit refresh re-probes every directory in a single streamed scan
+  const handleRefresh = React.useCallback(() => fetchProjects(true), [fetchProjects])
+
+  // Queued git work for projects paged out of view is dropped, unless they are favorites
+  const visibleIds = React.useRef<string[]>([])
+  const handleVisibleProjectsChange = React.useCallback((ids: string[], favoriteIds: string[]) => {
+    setGitPriorities(ids, favoriteIds)
+    const wanted = new Set([...ids, ...favoriteIds])
+    const left = visibleIds.current.filter((id) => !wanted.has(id))
+    visibleIds.current = ids
+    if (left.length > 0) cancelGitJobs(left)
+  }, [])
 
   const statusSummary = React.useMemo(() => getStatusSummary(projects), [projects])
 
@@ -108,12 +193,30 @@ export function DashboardPage() {
         {loading ? (
           <DashboardSkeleton />
         ) : (
-          <DashboardContent
-            projects={projects}
-            statusSummary={statusSummary}
-            onRefresh={handleRefresh}
-            paginationRouter={paginationRouter}
-          />
+          <>
+            {portfolio && portfolio.repositories > 0 && (
+              <Card className="mb-6">
+                <CardHeader className="pb-2">
+                  <CardTitle className="text-base">Commit Activity</CardTitle>
+                  <CardDescription>
+                    {portfolio.dailyCommits.reduce((sum, count) => sum + count, 0)} commits in the last
+                    year across {portfolio.repositories} repositories
+                  </CardDescription>
+                </CardHeader>
+                <CardContent>
+                  <CommitHeatmap startDate={portfolio.startDate} dailyCommits={portfolio.dailyCommits} />
+                </CardContent>
+              </Card>
+            )}
+            <DashboardContent
+              projects={projects}
+              statusSummary={statusSummary}
+              onRefresh={handleRefresh}
+              paginationRouter={paginationRouter}
+              onVisibleProjectsChange={handleVisibleProjectsChange}
+              refreshProgress={scanProgress}
+            />
+          </>
         )}
       </div>
     </main>
@@ -5,9 +5,17 @@ import { StatusBadge } from "@organizeme/ui/components/status-badge"
 import { Separator } from "@organizeme/ui/ui/separator"
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@organizeme/ui/ui/card"
 import { MarkdownRenderer } from "@organizeme/ui/components/markdown-renderer"
+import { WeeklyCommitBars } from "@organizeme/ui/components/commit-activity"
 import { Button } from "@organizeme/ui/ui/button"
 import { useDataProvider } from "@organizeme/shared/context/data-provider-context"
-import { getProject } from "../lib/tauri-data-provider"
+import {
+  cancelDetailJobs,
+  getCommitActivity,
+  getMarkdownThemeCss,
+  getProject,
+  renderReadme,
+  type CommitActivity,
+} from "../lib/tauri-data-provider"
 import type { Project } from "@organizeme/shared/types/project"
 
 function formatDate(date: Date | string): string {
@@ -43,6 +51,10 @@ export function ProjectDetailPage() {
   const [loading, setLoading] = React.useState(true)
   const [error, setError] = React.useState<string | null>(null)
   const [actionError, setActionError] = React.useState<string | null>(null)
+  // undefined while the backend renders the README, null if it could not
+  const [readmeHtml, setReadmeHtml] = React.useState<string | null | undefined>(undefined)
+  const [readmeCss, setReadmeCss] = React.useState("")
+  const [activity, setActivity] = React.useState<CommitActivity | null>(null)
 
   React.useEffect(() => {
     if (!id) return
@@ -54,8 +66,54 @@ export function ProjectDetailPage() {
       })
       .catch((e) => setError(String(e)))
       .finally(() => setLoading(false))
+
+    // Drop queued git work if the user leaves before it runs
+    return () => {
+      cancelDetailJobs(id)
+    }
   }, [id])
 
+  const projectPath = project?.readmeContent ? project.path : null
+
+  React.useEffect(() => {
+    if (!projectPath) return
+    let cancelled = false
+    setReadmeHtml(undefined)
+    Promise.all([renderReadme(projectPath), getMarkdownThemeCss()])
+      .then(([html, css]) => {
+        if (cancelled) return
+        setReadmeHtml(html)
+        setReadmeCss(css)
+      })
+      .catch(() => {
+        // Fall back to rendering the Markdown in the webview
+        if (!cancelled) setReadmeHtml(null)
+      })
+
+    return () => {
+      cancelled = true
+    }
+  }, [projectPath])
+
+  const isRepo = Boolean(project?.gitInfo)
+
+  React.useEffect(() => {
+    if (!id || !isRepo) return
+    let cancelled = false
+    setActivity(null)
+    getCommitActivity(id)
+      .then((result) => {
+        if (!cancelled) setActivity(result)
+      })
+      .catch(() => {
+        // History is supplementary; the card just stays hidden
+      })
+
+    return () => {
+      cancelled = true
+    }
+  }, [id, isRepo])
+
   const handleAction = React.useCallback(
     async (action: () => Promise<{ success: boolean; message: string }>, errorPrefix: string) => {
       setActionError(null)
@@ -211,6 +269,40 @@ export function ProjectDetailPage() {
           </Card>
         </div>
 
+        {/* Commit Activity */}
+        {activity && (
+          <Card>
+            <CardHeader>
+              <CardTitle>Commit Activity</CardTitle>
+              <CardDescription>
+                {activity.totalCommits} commits
+                {activity.firstCommitDate && ` since ${formatDate(activity.firstCommitDate)}`}
+              </CardDescription>
+            </CardHeader>
+            <CardContent className="space-y-4">
+              <div>
+                <dt className="text-sm font-medium text-muted-foreground">Commits per week, last year</dt>
+                <dd className="mt-2">
+                  <WeeklyCommitBars startDate={activity.startDate} weeklyCommits={activity.weeklyCommits} />
+                </dd>
+              </div>
+              {activity.topAuthors.length > 0 && (
+                <div>
+                  <dt className="text-sm font-medium text-muted-foreground">Top Authors</dt>
+                  <dd className="mt-1 space-y-1">
+                    {activity.topAuthors.map((author) => (
+                      <div key={author.email || author.name} className="flex justify-between text-sm">
+                        <span title={author.email}>{author.name}</span>
+                        <span className="text-muted-foreground">{author.commits} commits</span>
+                      </div>
+                    ))}
+                  </dd>
+                </div>
+              )}
+            </CardContent>
+          </Card>
+        )}
+
         {/* README */}
         {project.readmeContent && (
           <Card>
@@ -219,7 +311,16 @@ export function ProjectDetailPage() {
               <CardDescription>Project documentation</CardDescription>
             </CardHeader>
             <CardContent>
-              <MarkdownRenderer content={project.readmeContent} />
+              {typeof readmeHtml === "string" ? (
+                <>
+                  <style>{readmeCss}</style>
+                  <MarkdownRenderer html={readmeHtml} />
+                </>
+              ) : readmeHtml === null ? (
+                <MarkdownRenderer content={project.readmeContent} />
+              ) : (
+                <p className="text-center py-6 text-muted-foreground text-sm">Loading README...</p>
+              )}
             </CardContent>
           </Card>
         )}
@@ -518,6 +518,7 @@ export async function getAllTags(): Promise<string[]> {
  */
 export interface AppSettingsResult {
   projectsPath: string
+  scanDepth?: number | null
 }
 
 /**
@@ -537,6 +538,7 @@ export async function getAppSettings(): Promise<AppSettingsResult> {
     const data = JSON.parse(content) as Record<string, unknown>
     return {
       projectsPath: typeof data.projectsPath === 'string' ? data.projectsPath : '',
+      scanDepth: typeof data.scanDepth === 'number' ? data.scanDepth : null,
     }
   } catch {
     return { projectsPath: '' }
@@ -572,6 +574,9 @@ export async function updateAppSettings(
   if (updates.projectsPath !== undefined) {
     existing.projectsPath = updates.projectsPath
   }
+  if (updates.scanDepth !== undefined) {
+    existing.scanDepth = updates.scanDepth
+  }
 
   // Write back
   await mkdir(configDir, { recursive: true })
@@ -583,6 +588,7 @@ export async function updateAppSettings(
 
   return {
     projectsPath: typeof existing.projectsPath === 'string' ? existing.projectsPath : '',
+    scanDepth: typeof existing.scanDepth === 'number' ? existing.scanDepth : null,
   }
 }
 
@@ -0,0 +1,97 @@
+/**
+ * Project Detectors Module
+ *
+ * Recognises project directories from a single listing of their entries,
+ * so classifying a directory costs one readdir instead of a stat per
+ * indicator file.
+ */
+
+import { readdir } from 'fs/promises'
+
+/**
+ * README file names to search for, in order of preference; matched ignoring case.
+ */
+export const README_FILES = ['README.md', 'README.txt', 'README']
+
+/**
+ * Recognises one kind of project from the entries at its top level.
+ */
+export interface ProjectDetector {
+  kind: string
+  /** The detector matches if any of these entries exists, ignoring case */
+  markers: string[]
+}
+
+/**
+ * Registered detectors; a directory matched by any of them is a project.
+ * Supporting a new kind of project only takes another entry here.
+ */
+export const PROJECT_DETECTORS: ProjectDetector[] = [
+  { kind: 'git', markers: ['.git'] },
+  { kind: 'node', markers: ['package.json'] },
+  { kind: 'rust', markers: ['Cargo.toml'] },
+  { kind: 'python', markers: ['pyproject.toml'] },
+  { kind: 'go', markers: ['go.mod'] },
+  { kind: 'java', markers: ['pom.xml', 'build.gradle'] },
+  { kind: 'make', markers: ['Makefile'] },
+  { kind: 'readme', markers: README_FILES },
+]
+
+/**
+ * Entry names of one directory, read with a single readdir, keyed by their
+ * lowercased form so markers match ignoring case (`makefile`, `ReadMe.md`).
+ */
+export type DirListing = ReadonlyMap<string, string>
+
+/**
+ * Lists a directory's entry names.
+ *
+ * @param dirPath - Full path to the directory
+ * @returns Promise resolving to the listing
+ */
+export async function readDirListing(dirPath: string): Promise<DirListing> {
+  const names = await readdir(dirPath)
+  return new Map(names.map(name => [name.toLowerCase(), name]))
+}
+
+/**
+ * Checks whether a listing has an entry with the given name, ignoring case.
+ *
+ * @param listing - Directory listing
+ * @param name - Entry name to look for
+ * @returns True if the entry exists
+ */
+export function hasEntry(listing: DirListing, name: string): boolean {
+  return listing.has(name.toLowerCase())
+}
+
+/**
+ * Returns the on-disk names of the `candidates` present in a listing, in order.
+ *
+ * @param listing - Directory listing
+ * @param candidates - Entry names to look for
+ * @returns Names that exist, as spelled on disk
+ */
+export function presentEntries(listing: DirListing, candidates: string[]): string[] {
+  return candidates.flatMap(name => listing.get(name.toLowerCase()) ?? [])
+}
+
+/**
+ * Checks whether any registered detector matches a listing.
+ *
+ * @param listing - Directory listing
+ * @returns True if the directory appears to be a project
+ */
+export function isProjectListing(listing: DirListing): boolean {
+  return PROJECT_DETECTORS.some(detector => detector.markers.some(marker => hasEntry(listing, marker)))
+}
+
+/**
+ * Checks whether a listing includes a README file.
+ *
+ * @param listing - Directory listing
+ * @returns True if any README variant exists
+ */
+export function hasReadme(listing: DirListing): boolean {
+  return README_FILES.some(name => hasEntry(listing, name))
+}
@@ -5,10 +5,20 @@
  * and extracting metadata from development projects in a directory.
  */
 
-import { readdir, stat, access } from 'fs/promises'
-import { join } from 'path'
+import { readdir, readFile, stat, open, type FileHandle } from 'fs/promises'
+import { basename, join, relative, sep } from 'path'
 import type { Project, ProjectStatus } from '@organizeme/shared/types/project'
+import type { ProjectRoot } from '@organizeme/shared/types/app-settings'
 import { getProjectTags } from '@/lib/tag-storage'
+import {
+  README_FILES,
+  hasEntry,
+  hasReadme,
+  isProjectListing,
+  presentEntries,
+  readDirListing,
+  type DirListing,
+} from '@/lib/project-detectors'
 
 /**
  * Directories to ignore when scanning for projects.
@@ -30,6 +40,11 @@ const IGNORED_DIRECTORIES = new Set([
   '.vscode',
 ])
 
+/**
+ * Deepest folder level searched for projects, whatever the caller asks for.
+ */
+const MAX_SCAN_DEPTH = 6
+
 /**
  * Result of scanning a single project directory.
  */
@@ -60,56 +75,198 @@ export interface ScanOptions {
   maxDepth?: number
   /** Include hidden directories (starting with .) in results (default: false) */
   includeHidden?: boolean
+  /** Skip directories matched by .gitignore files (default: true) */
+  respectGitignore?: boolean
+  /** Glob patterns of directory names to skip (default: none) */
+  exclude?: string[]
+  /** Prefix for generated project ids, used for secondary roots */
+  idPrefix?: string
+}
+
+/**
+ * A directory found while discovering projects.
+ */
+interface DiscoveredDir {
+  id: string
+  name: string
+  path: string
+  isProject: boolean
+  /** Entries of the directory, when discovery already listed it */
+  listing?: DirListing
+}
+
+/**
+ * A single directory-matching rule read from a .gitignore file.
+ */
+interface IgnoreRule {
+  /** Directory containing the .gitignore */
+  base: string
+  /** Only matches direct children of `base` (pattern started with /) */
+  anchored: boolean
+  pattern: RegExp
 }
 
 /**
- * Checks if a file exists at the given path.
+ * Shared state for one discovery walk.
+ */
+interface DiscoveryContext {
+  root: string
+  maxDepth: number
+  includeHidden: boolean
+  respectGitignore: boolean
+  idPrefix?: string
+}
+
+/**
+ * Lists a directory and checks it against the registered project detectors.
  *
- * @param filePath - Path to check
- * @returns Promise resolving to true if file exists, false otherwise
+ * @param dirPath - Full path to the directory
+ * @returns Promise resolving to the listing and whether it appears to be a project
  */
-async function fileExists(filePath: string): Promise<boolean> {
+async function probeDirectory(
+  dirPath: string
+): Promise<{ listing: DirListing; isProject: boolean }> {
+  const listing = await readDirListing(dirPath)
+  return { listing, isProject: isProjectListing(listing) }
+}
+
+/**
+ * Reads the name-based rules from a directory's .gitignore.
+ *
+ * Only plain and wildcard name patterns are supported; negations and
+ * patterns with inner slashes are skipped, which errs on scanning too much.
+ *
+ * @param dirPath - Directory that may contain a .gitignore
+ * @returns Promise resolving to the rules found (empty if none)
+ */
+async function readIgnoreRules(dirPath: string): Promise<IgnoreRule[]> {
+  let content: string
   try {
-    await access(filePath)
-    return true
+    content = await readFile(join(dirPath, '.gitignore'), 'utf-8')
   } catch {
-    return false
+    return []
   }
+
+  return content
+    .split(/\r?\n/)
+    .map(line => parseIgnoreRule(line, dirPath))
+    .filter((rule): rule is IgnoreRule => rule !== null)
 }
 
 /**
- * Determines if a directory is a valid project based on common indicators.
- * A valid project typically has at least one of:
- * - package.json (Node.js project)
- * - .git directory (Git repository)
- * - README file
- * - pyproject.toml (Python project)
- * - Cargo.toml (Rust project)
- * - go.mod (Go project)
+ * Parses one gitignore-style line into a directory-matching rule.
  *
- * @param dirPath - Full path to the directory
- * @returns Promise resolving to true if the directory appears to be a project
- */
-async function isProjectDirectory(dirPath: string): Promise<boolean> {
-  const projectIndicators = [
-    'package.json',
-    '.git',
-    'README.md',
-    'README.txt',
-    'README',
-    'pyproject.toml',
-    'Cargo.toml',
-    'go.mod',
-    'pom.xml',
-    'build.gradle',
-    'Makefile',
-  ]
-
-  const checks = await Promise.all(
-    projectIndicators.map(indicator => fileExists(join(dirPath, indicator)))
+ * @param rawLine - Pattern line
+ * @param base - Directory the pattern is relative to
+ * @returns The rule, or null for comments and unsupported patterns
+ */
+function parseIgnoreRule(rawLine: string, base: string): IgnoreRule | null {
+  const line = rawLine.trim()
+  if (!line || line.startsWith('#') || line.startsWith('!')) return null
+
+  const anchored = line.startsWith('/')
+  const name = line.replace(/^\//, '').replace(/\/$/, '')
+  if (!name || name.includes('/')) return null
+
+  const source = name
+    .replace(/[.+^${}()|[\]\\]/g, '\\$&')
+    .replace(/\*/g, '[^/]*')
+    .replace(/\?/g, '[^/]')
+  return { base, anchored, pattern: new RegExp(`^${source}$`) }
+}
+
+/**
+ * Checks whether a directory is matched by any inherited .gitignore rule.
+ *
+ * @param parent - Directory containing the entry
+ * @param name - Entry name
+ * @param rules - Rules from the parent and its ancestors
+ * @returns True if the directory should be skipped
+ */
+function isIgnored(parent: string, name: string, rules: IgnoreRule[]): boolean {
+  return rules.some(rule => (!rule.anchored || rule.base === parent) && rule.pattern.test(name))
+}
+
+/**
+ * Lists the subdirectories of a folder that may hold projects.
+ *
+ * @param dirPath - Folder to list
+ * @param rules - Inherited .gitignore rules
+ * @param ctx - Discovery context
+ * @returns Promise resolving to the candidate subdirectory names
+ */
+async function listCandidateDirs(
+  dirPath: string,
+  rules: IgnoreRule[],
+  ctx: DiscoveryContext
+): Promise<string[]> {
+  const entries = await readdir(dirPath, { withFileTypes: true })
+
+  return entries
+    .filter(entry => {
+      if (!entry.isDirectory()) return false
+      if (IGNORED_DIRECTORIES.has(entry.name)) return false
+      if (!ctx.includeHidden && entry.name.startsWith('.')) return false
+      return !isIgnored(dirPath, entry.name, rules)
+    })
+    .map(entry => entry.name)
+}
+
+/**
+ * Recursively finds projects below a non-project folder.
+ * Stops descending at the first folder that looks like a project.
+ *
+ * @param dirPath - Folder to search
+ * @param depth - Depth of `dirPath` below the root
+ * @param rules - Inherited .gitignore rules
+ * @param ctx - Discovery context
+ * @returns Promise resolving to the projects found
+ */
+async function findNestedProjects(
+  dirPath: string,
+  depth: number,
+  rules: IgnoreRule[],
+  ctx: DiscoveryContext
+): Promise<DiscoveredDir[]> {
+  if (depth >= ctx.maxDepth) return []
+
+  let names: string[]
+  try {
+    const ownRules = ctx.respectGitignore ? await readIgnoreRules(dirPath) : []
+    rules = [...rules, ...ownRules]
+    names = await listCandidateDirs(dirPath, rules, ctx)
+  } catch {
+    return []
+  }
+
+  const found = await Promise.all(
+    names.map(async (name): Promise<DiscoveredDir[]> => {
+      const fullPath = join(dirPath, name)
+      const probe = await probeDirectory(fullPath).catch(() => undefined)
+      if (probe?.isProject) {
+        return [toDiscoveredDir(fullPath, name, true, ctx, probe.listing)]
+      }
+      return findNestedProjects(fullPath, depth + 1, rules, ctx)
+    })
   )
+  return found.flat()
+}
 
-  return checks.some(exists => exists)
+/**
+ * Builds a discovered directory, deriving its id from the path below the root.
+ * Top-level folders keep their name-based ids; nested ones are prefixed with
+ * their parent folders so `a/app` and `b/app` stay distinct.
+ */
+function toDiscoveredDir(
+  fullPath: string,
+  name: string,
+  isProject: boolean,
+  ctx: DiscoveryContext,
+  listing?: DirListing
+): DiscoveredDir {
+  const relativePath = relative(ctx.root, fullPath).split(sep).join('-')
+  const idSource = ctx.idPrefix ? `${ctx.idPrefix}-${relativePath}` : relativePath
+  return { id: createProjectId(idSource), name, path: fullPath, isProject, listing }
 }
 
 /**
@@ -126,6 +283,22 @@ function createProjectId(name: string): string {
     .replace(/^-|-$/g, '')
 }
 
+/**
+ * Short hash of a project's path below its root, telling apart ids that
+ * collide. Independent of scan order (32-bit FNV-1a) and mirrored by the
+ * desktop scanner so both apps agree on ids.
+ *
+ * @param relativePath - Project path relative to its root, `/`-separated
+ * @returns Six hex digits
+ */
+function pathSuffix(relativePath: string): string {
+  let hash = 0x811c9dc5
+  for (const byte of new TextEncoder().encode(relativePath)) {
+    hash = Math.imul(hash ^ byte, 0x01000193) >>> 0
+  }
+  return (hash >>> 8).toString(16).padStart(6, '0')
+}
+
 /**
  * Determines the initial status of a project based on last modified time.
  * This is a preliminary status; Git status will refine it later.
@@ -156,11 +329,6 @@ async function getProjectDescription(dirPath: string): Promise<string | undefine
   const packageJsonPath = join(dirPath, 'package.json')
 
   try {
-    const hasPackageJson = await fileExists(packageJsonPath)
-    if (!hasPackageJson) return undefined
-
-    // Dynamic import to read JSON file
-    const { readFile } = await import('fs/promises')
     const content = await readFile(packageJsonPath, 'utf-8')
     const packageJson = JSON.parse(content) as { description?: string }
 
@@ -175,23 +343,27 @@ async function getProjectDescription(dirPath: string): Promise<string | undefine
  *
  * @param dirPath - Full path to the project directory
  * @param name - Name of the project (directory name)
+ * @param projectId - Identifier to use (defaults to one derived from the name)
+ * @param listing - Entries of the directory, if already listed
  * @returns Promise resolving to a Project object
  */
-async function scanProject(dirPath: string, name: string): Promise<Project> {
-  const stats = await stat(dirPath)
-  const projectId = createProjectId(name)
-
-  // Check for README files (any variant)
-  const readmeChecks = await Promise.all([
-    fileExists(join(dirPath, 'README.md')),
-    fileExists(join(dirPath, 'README.txt')),
-    fileExists(join(dirPath, 'README')),
+async function scanProject(
+  dirPath: string,
+  name: string,
+  projectId: string = createProjectId(name),
+  listing?: DirListing
+): Promise<Project> {
+  const [stats, entries] = await Promise.all([
+    stat(dirPath),
+    listing ?? readDirListing(dirPath),
   ])
-  const hasReadmeFile = readmeChecks.some(exists => exists)
 
-  const [hasPackageJson, description, tags] = await Promise.all([
-    fileExists(join(dirPath, 'package.json')),
-    getProjectDescription(dirPath),
+  // File checks are answered from the listing rather than the filesystem
+  const hasReadmeFile = hasReadme(entries)
+  const hasPackageJson = hasEntry(entries, 'package.json')
+
+  const [description, tags] = await Promise.all([
+    hasPackageJson ? getProjectDescription(dirPath) : undefined,
     getProjectTags(projectId),
   ])
 
@@ -233,7 +405,8 @@ export async function scanDirectory(
   projectsPath: string,
   options: ScanOptions = {}
 ): Promise<ScanResult[]> {
-  const { includeHidden = false } = options
+  const { includeHidden = false, respectGitignore = true, exclude = [], idPrefix } = options
+  const maxDepth = Math.min(Math.max(options.maxDepth ?? 1, 1), MAX_SCAN_DEPTH)
 
   // Verify the directory exists and is accessible
   try {
@@ -252,10 +425,26 @@ export async function scanDirectory(
     }]
   }
 
+  const ctx: DiscoveryContext = {
+    root: projectsPath,
+    maxDepth,
+    includeHidden,
+    respectGitignore,
+    idPrefix,
+  }
+
+  // Exclusions behave like unanchored .gitignore entries at the root
+  const excludeRules = exclude
+    .map(pattern => parseIgnoreRule(pattern.replace(/^\//, ''), projectsPath))
+    .filter((rule): rule is IgnoreRule => rule !== null)
+
   // Read directory contents
-  let entries
+  let rootRules: IgnoreRule[]
+  let directories: string[]
   try {
-    entries = await readdir(projectsPath, { withFileTypes: true })
+    const gitignoreRules = respectGitignore ? await readIgnoreRules(projectsPath) : []
+    rootRules = [...excludeRules, ...gitignoreRules]
+    directories = await listCandidateDirs(projectsPath, rootRules, ctx)
   } catch (error) {
     const errorMessage = error instanceof Error ? error.message : 'Unknown error'
     return [{
@@ -264,37 +453,36 @@ export async function scanDirectory(
     }]
   }
 
-  // Filter to only directories
-  const directories = entries.filter(entry => {
-    if (!entry.isDirectory()) return false
-    if (IGNORED_DIRECTORIES.has(entry.name)) return false
-    if (!includeHidden && entry.name.startsWith('.')) return false
-    return true
-  })
+  // Top-level folders are listed as-is unless they turn out to group nested
+  // projects, which keeps maxDepth 1 identical to a flat listing
+  const discovered = await Promise.all(
+    directories.map(async (name): Promise<DiscoveredDir[]> => {
+      const fullPath = join(projectsPath, name)
+      const probe = await probeDirectory(fullPath).catch(() => undefined)
+      if (probe?.isProject) return [toDiscoveredDir(fullPath, name, true, ctx, probe.listing)]
+
+      const nested = await findNestedProjects(fullPath, 1, rootRules, ctx)
+      return nested.length > 0
+        ? nested
+        : [toDiscoveredDir(fullPath, name, false, ctx, probe?.listing)]
+    })
+  )
 
-  // Scan each directory for project indicators
+  // Scan each discovered directory for metadata
   const results: ScanResult[] = await Promise.all(
-    directories.map(async (dir): Promise<ScanResult> => {
-      const fullPath = join(projectsPath, dir.name)
-
+    discovered.flat().map(async (dir): Promise<ScanResult> => {
       try {
-        const isProject = await isProjectDirectory(fullPath)
-
-        if (!isProject) {
-          // Skip directories that don't look like projects
-          // Return a project anyway but with unknown status
-          const project = await scanProject(fullPath, dir.name)
+        const project = await scanProject(dir.path, dir.name, dir.id, dir.listing)
+        if (!dir.isProject) {
+          // Not recognisably a project; list it anyway with unknown status
           project.status = 'unknown'
-          return { project }
         }
-
-        const project = await scanProject(fullPath, dir.name)
         return { project }
       } catch (error) {
         const errorMessage = error instanceof Error ? error.message : 'Unknown error'
         return {
           error: `Failed to scan project: ${errorMessage}`,
-          path: fullPath,
+          path: dir.path,
         }
       }
     })
@@ -304,38 +492,141 @@ export async function scanDirectory(
 }
 
 /**
- * Gets the configured projects path.
- * Priority: config.json → PROJECTS_PATH env → default ~/Documents/Projects
+ * Reads ~/.organizeme/config.json synchronously.
  *
- * @returns The path to scan for projects
+ * @returns The parsed config, or an empty object if missing or invalid
  */
-export function getProjectsPath(): string {
-  // Try reading from ~/.organizeme/config.json
+function readConfig(): Record<string, unknown> {
   try {
     const { readFileSync } = require('fs')
     const { homedir } = require('os')
     const configFile = join(homedir(), '.organizeme', 'config.json')
-    const content = readFileSync(configFile, 'utf-8')
-    const data = JSON.parse(content) as Record<string, unknown>
-    if (typeof data.projectsPath === 'string' && data.projectsPath.length > 0) {
-      return data.projectsPath
-    }
+    return JSON.parse(readFileSync(configFile, 'utf-8')) as Record<string, unknown>
   } catch {
-    // Config file doesn't exist or is invalid, continue to fallbacks
+    // Config file doesn't exist or is invalid
+    return {}
+  }
+}
+
+/**
+ * Gets the configured project roots, or an empty array if none are set.
+ *
+ * @returns Roots with a non-empty path, in configured order
+ */
+export function getProjectRoots(): ProjectRoot[] {
+  const roots = readConfig().projectRoots
+  if (!Array.isArray(roots)) return []
+
+  return roots.filter(
+    (root): root is ProjectRoot =>
+      typeof root === 'object' && root !== null && typeof root.path === 'string' && root.path.length > 0
+  )
+}
+
+/**
+ * Gets the configured projects path (the primary root when several are set).
+ * Priority: config.json → PROJECTS_PATH env → default ~/Documents/Projects
+ *
+ * @returns The path to scan for projects
+ */
+export function getProjectsPath(): string {
+  const [primary] = getProjectRoots()
+  if (primary) return primary.path
+
+  const data = readConfig()
+  if (typeof data.projectsPath === 'string' && data.projectsPath.length > 0) {
+    return data.projectsPath
   }
 
   return process.env.PROJECTS_PATH || join(process.env.HOME || '', 'Documents', 'Projects')
 }
 
 /**
- * Convenience function to scan the configured projects directory.
+ * Gets the configured project discovery depth from config.json.
+ *
+ * @returns The configured depth, or undefined to use the scanner default
+ */
+export function getScanDepth(): number | undefined {
+  const { scanDepth } = readConfig()
+  return typeof scanDepth === 'number' && scanDepth > 0 ? scanDepth : undefined
+}
+
+/**
+ * Convenience function to scan the configured projects roots.
+ *
+ * Roots are scanned in parallel and merged. Projects under secondary roots
+ * get ids prefixed with the root's label, and paths that flatten to the
+ * same id all get a suffix derived from their path. Explicit `options` override each
+ * root's own settings.
  *
  * @param options - Scan options (optional)
  * @returns Promise resolving to array of scan results
  */
-export async function scanProjects(options?: ScanOptions): Promise<ScanResult[]> {
-  const projectsPath = getProjectsPath()
-  return scanDirectory(projectsPath, options)
+export async function scanProjects(options: ScanOptions = {}): Promise<ScanResult[]> {
+  const configured = getProjectRoots()
+  const roots: ProjectRoot[] = configured.length > 0 ? configured : [{ path: getProjectsPath() }]
+  const defaultDepth = getScanDepth()
+
+  const usedPrefixes = new Set<string>()
+  const perRoot = await Promise.all(
+    roots.map((root, index) => {
+      let idPrefix: string | undefined
+      if (index > 0) {
+        idPrefix = createProjectId(root.label || basename(root.path) || `root-${index + 1}`)
+        if (usedPrefixes.has(idPrefix)) idPrefix = `${idPrefix}-${index + 1}`
+        usedPrefixes.add(idPrefix)
+      }
+
+      return scanDirectory(root.path, {
+        maxDepth: root.scanDepth ?? defaultDepth,
+        exclude: root.exclude,
+        idPrefix,
+        ...options,
+      })
+    })
+  )
+
+  const seenIds = new Set<string>()
+  const seenPaths = new Set<string>()
+  const merged: ScanResult[] = []
+  perRoot.forEach((results, index) => {
+    const found: ProjectScanResult[] = []
+    for (const result of results) {
+      if (!result.project) {
+        merged.push(result)
+        continue
+      }
+      // Overlapping roots can reach the same folder twice
+      if (seenPaths.has(result.project.path)) continue
+      seenPaths.add(result.project.path)
+      found.push(result)
+    }
+
+    // Distinct paths can still flatten to one id, e.g. `a-b/c` and `a/b-c`.
+    // Every one of them is suffixed, so none takes over the plain id
+    // depending on which sorts first
+    const counts = new Map<string, number>()
+    for (const { project } of found) {
+      counts.set(project.id, (counts.get(project.id) ?? 0) + 1)
+    }
+
+    for (const result of found) {
+      const { project } = result
+      if (counts.get(project.id)! > 1 || seenIds.has(project.id)) {
+        const relativePath = relative(roots[index].path, project.path).split(sep).join('/')
+        project.id = `${project.id}-${pathSuffix(relativePath)}`
+      }
+      // Only two paths whose hashes collide too get a counter
+      const baseId = project.id
+      let suffix = 2
+      while (seenIds.has(project.id)) {
+        project.id = `${baseId}-${suffix++}`
+      }
+      seenIds.add(project.id)
+      merged.push(result)
+    }
+  })
+  return merged
 }
 
 /**
@@ -361,20 +652,69 @@ export function filterScanErrors(results: ScanResult[]): ProjectScanError[] {
 }
 
 /**
- * README file names to search for, in order of preference.
+ * Maximum README bytes read from disk (to avoid huge payloads).
  */
-const README_FILES = ['README.md', 'README.txt', 'README', 'readme.md', 'Readme.md']
+const MAX_README_LENGTH = 50000
 
 /**
- * Maximum length of README content to return (to avoid huge payloads).
+ * Most READMEs kept in memory by getReadmeContent.
  */
-const MAX_README_LENGTH = 50000
+const README_CACHE_CAPACITY = 256
+
+/**
+ * README reads keyed by file path, valid while mtime and size are unchanged.
+ */
+const readmeCache = new Map<string, { mtimeMs: number; size: number; content: string }>()
+
+/**
+ * Finds the largest cut point at or before `end` that does not split a
+ * UTF-8 encoded character.
+ *
+ * @param bytes - UTF-8 encoded data
+ * @param end - Desired cut point
+ * @returns Cut point on a character boundary
+ */
+function utf8Boundary(bytes: Uint8Array, end: number): number {
+  // Step back over continuation bytes (10xxxxxx) to the character's lead byte
+  let start = end
+  while (start > 0 && end - start < 4 && (bytes[start - 1] & 0xc0) === 0x80) {
+    start--
+  }
+  if (start === 0) return end
+
+  const lead = bytes[start - 1]
+  const length = lead >= 0xf0 ? 4 : lead >= 0xe0 ? 3 : lead >= 0xc0 ? 2 : 1
+  return end - (start - 1) >= length ? end : start - 1
+}
+
+/**
+ * Reads at most MAX_README_LENGTH bytes of a file, cutting truncated content
+ * at a character boundary.
+ *
+ * @param handle - Open file handle
+ * @param size - File size in bytes
+ * @returns README content, with a marker appended when truncated
+ */
+async function readBounded(handle: FileHandle, size: number): Promise<string> {
+  const length = Math.min(size, MAX_README_LENGTH)
+  const buffer = new Uint8Array(length)
+  const { bytesRead } = await handle.read(buffer, 0, length, 0)
+
+  if (size <= MAX_README_LENGTH) {
+    return new TextDecoder().decode(buffer.subarray(0, bytesRead))
+  }
+
+  const end = utf8Boundary(buffer, bytesRead)
+  return new TextDecoder().decode(buffer.subarray(0, end)) + '\n\n... (truncated)'
+}
 
 /**
  * Reads the README content from a project directory.
  *
  * This function searches for common README file variants and returns
- * the content of the first one found.
+ * the content of the first one found. At most MAX_README_LENGTH bytes are
+ * read, and results are cached by path, mtime and size so reopening a
+ * project only stats the file.
  *
  * @param projectPath - Full path to the project directory
  * @returns Promise resolving to README content or null if not found
@@ -388,24 +728,42 @@ const MAX_README_LENGTH = 50000
  * ```
  */
 export async function getReadmeContent(projectPath: string): Promise<string | null> {
-  const { readFile } = await import('fs/promises')
+  // One listing finds the README instead of trying each name in turn
+  let listing: DirListing
+  try {
+    listing = await readDirListing(projectPath)
+  } catch {
+    return null
+  }
+
+  for (const fileName of presentEntries(listing, README_FILES)) {
+    const filePath = join(projectPath, fileName)
+    let handle: FileHandle | undefined
 
-  for (const fileName of README_FILES) {
     try {
-      const filePath = join(projectPath, fileName)
-      const exists = await fileExists(filePath)
-
-      if (exists) {
-        const content = await readFile(filePath, 'utf-8')
-        // Truncate if too large
-        if (content.length > MAX_README_LENGTH) {
-          return content.slice(0, MAX_README_LENGTH) + '\n\n... (truncated)'
-        }
-        return content
+      handle = await open(filePath, 'r')
+      const stats = await handle.stat()
+      if (!stats.isFile()) continue
+
+      const cached = readmeCache.get(filePath)
+      if (cached && cached.mtimeMs === stats.mtimeMs && cached.size === stats.size) {
+        return cached.content
+      }
+
+      const content = await readBounded(handle, stats.size)
+
+      // Map iteration order is insertion order, so the first key is the oldest
+      if (readmeCache.size >= README_CACHE_CAPACITY && !readmeCache.has(filePath)) {
+        const oldest = readmeCache.keys().next().value
+        if (oldest !== undefined) readmeCache.delete(oldest)
       }
+      readmeCache.set(filePath, { mtimeMs: stats.mtimeMs, size: stats.size, content })
+      return content
     } catch {
       // Continue to next file
       continue
+    } finally {
+      await handle?.close()
     }
   }
 
@@ -11,6 +11,35 @@
 export interface AppSettings {
   /** Custom projects directory path. Empty string means use default. */
   projectsPath: string
+  /** Maximum repositories inspected in parallel (desktop only). Null or 0 means auto. */
+  gitConcurrency?: number | null
+  /** Skip untracked files when computing dashboard git status (desktop only) */
+  excludeUntracked?: boolean
+  /** Milliseconds one repository's git status may take before a partial result is shown (desktop only). Null or 0 means the default. */
+  gitTimeBudgetMs?: number | null
+  /** Write a commit-graph for repositories without one, speeding up ahead/behind in large repositories (desktop only) */
+  writeCommitGraphs?: boolean
+  /** Folder levels below the projects path searched for projects (default: 1) */
+  scanDepth?: number | null
+  /** Roots to scan. When empty, projectsPath is the only root. */
+  projectRoots?: ProjectRoot[]
+}
+
+/**
+ * A folder scanned for projects, with its own discovery and git limits.
+ * The first root is the primary one; ids of projects under other roots are
+ * prefixed with the root's label.
+ */
+export interface ProjectRoot {
+  path: string
+  /** Id prefix for projects under this root (default: the folder name) */
+  label?: string | null
+  /** Folder levels searched below this root (default: scanDepth) */
+  scanDepth?: number | null
+  /** Glob patterns of folders to skip */
+  exclude?: string[]
+  /** Maximum repositories under this root inspected at once (desktop only) */
+  gitConcurrency?: number | null
 }
 
 /**
@@ -6,6 +6,7 @@
  */
 
 import type { AppSettings } from './app-settings'
+import type { Project } from './project'
 
 /**
  * Generic result type for operations.
@@ -20,6 +21,8 @@ export interface AppResult {
  */
 export interface RefreshResult extends AppResult {
   projectCount?: number
+  /** The refreshed projects, when the implementation returns them */
+  projects?: Project[]
 }
 
 /**
@@ -56,6 +59,8 @@ export interface DataProvider {
   getAppSettings(): Promise<AppSettings>
   /** Update application settings in config file */
   updateAppSettings(updates: Partial<AppSettings>): Promise<AppSettings>
+  /** Why the config file could not be read, if it can't; settings are not saved until it is fixed (desktop only) */
+  getConfigError?(): Promise<string | null>
   /** Open a native folder picker dialog, returns selected path or null if cancelled */
   browseForFolder(): Promise<string | null>
 }
@@ -24,6 +24,8 @@ export interface GitInfo {
   lastCommitDate?: Date
   /** Message of the most recent commit */
   lastCommitMessage?: string
+  /** Some fields are missing because reading the repository overran its time budget */
+  partial?: boolean
 }
 
 /**
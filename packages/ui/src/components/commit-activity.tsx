@@ -0,0 +1,101 @@
+/**
+ * Commit Activity Components
+ *
+ * Compact charts for commit history: a weekly bar strip for one project and
+ * a daily heatmap for the whole portfolio.
+ */
+
+import { cn } from "@organizeme/shared/lib/utils"
+
+const DAY_MS = 24 * 60 * 60 * 1000
+
+/**
+ * Heatmap cell shades from no commits to the busiest days.
+ */
+const levelClasses = [
+  "bg-muted",
+  "bg-green-200 dark:bg-green-900",
+  "bg-green-400 dark:bg-green-700",
+  "bg-green-600 dark:bg-green-500",
+  "bg-green-800 dark:bg-green-300",
+]
+
+/**
+ * Maps a count to a shade, scaled against the busiest day or week.
+ */
+function level(count: number, max: number): number {
+  if (count === 0 || max === 0) return 0
+  return Math.min(levelClasses.length - 1, Math.ceil((count / max) * (levelClasses.length - 1)))
+}
+
+function formatDay(startDate: string, offset: number): string {
+  return new Date(Date.parse(startDate) + offset * DAY_MS).toLocaleDateString("en-US", {
+    year: "numeric",
+    month: "short",
+    day: "numeric",
+    timeZone: "UTC",
+  })
+}
+
+interface WeeklyCommitBarsProps {
+  /** Monday the first week starts on (YYYY-MM-DD) */
+  startDate: string
+  /** Commits per week, oldest first */
+  weeklyCommits: number[]
+  className?: string
+}
+
+/**
+ * Bar strip of commits per week.
+ */
+export function WeeklyCommitBars({ startDate, weeklyCommits, className }: WeeklyCommitBarsProps) {
+  const max = Math.max(0, ...weeklyCommits)
+
+  return (
+    <div className={cn("flex h-16 items-end gap-px", className)}>
+      {weeklyCommits.map((count, week) => (
+        <div
+          key={week}
+          className={cn("flex-1 rounded-sm", count > 0 ? "bg-green-500" : "bg-muted")}
+          style={{ height: max > 0 ? `${Math.max(4, (count / max) * 100)}%` : "4%" }}
+          title={`Week of ${formatDay(startDate, week * 7)}: ${count} commits`}
+        />
+      ))}
+    </div>
+  )
+}
+
+interface CommitHeatmapProps {
+  /** Monday the first day falls on (YYYY-MM-DD) */
+  startDate: string
+  /** Commits per day, oldest first */
+  dailyCommits: number[]
+  className?: string
+}
+
+/**
+ * Calendar heatmap of commits per day, one column per week.
+ */
+export function CommitHeatmap({ startDate, dailyCommits, className }: CommitHeatmapProps) {
+  const max = Math.max(0, ...dailyCommits)
+  const weeks: number[][] = []
+  for (let day = 0; day < dailyCommits.length; day += 7) {
+    weeks.push(dailyCommits.slice(day, day + 7))
+  }
+
+  return (
+    <div className={cn("flex gap-[3px] overflow-x-auto", className)}>
+      {weeks.map((days, week) => (
+        <div key={week} className="flex flex-col gap-[3px]">
+          {days.map((count, weekday) => (
+            <div
+              key={weekday}
+              className={cn("h-2.5 w-2.5 rounded-sm", levelClasses[level(count, max)])}
+              title={`${formatDay(startDate, week * 7 + weekday)}: ${count} commits`}
+            />
+          ))}
+        </div>
+      ))}
+    </div>
+  )
+}
@@ -13,7 +13,7 @@ import { useNavigation } from "@organizeme/shared/context/navigation-context"
 import type { PaginationRouter } from "@organizeme/shared/hooks/use-pagination"
 import { ProjectCard } from "./project-card"
 import { ProjectTable } from "./project-table"
-import { RefreshButton, type RefreshResult } from "./refresh-button"
+import { RefreshButton, type RefreshProgress, type RefreshResult } from "./refresh-button"
 import { SearchBar } from "./search-bar"
 import { SortDropdown } from "./sort-dropdown"
 import { StatusBadge } from "./status-badge"
@@ -47,6 +47,10 @@ export interface DashboardContentProps {
   onRefresh: () => Promise<RefreshResult>
   /** Router adapter for pagination URL synchronization */
   paginationRouter?: PaginationRouter
+  /** Called with the ids on the current page and the favorite ids when either changes */
+  onVisibleProjectsChange?: (visibleIds: string[], favoriteIds: string[]) => void
+  /** Progress of a scan running in the background, shown on the refresh buttons */
+  refreshProgress?: RefreshProgress | null
 }
 
 /**
@@ -157,6 +161,8 @@ export function DashboardContent({
   statusSummary,
   onRefresh,
   paginationRouter,
+  onVisibleProjectsChange,
+  refreshProgress,
 }: DashboardContentProps) {
   const { navigate, refresh } = useNavigation()
   const [currentSort, setCurrentSort] = React.useState<SortOption>("modified-newest")
@@ -319,6 +325,14 @@ export function DashboardContent({
     [sortedProjects, startIndex, endIndex]
   )
 
+  // Report the visible page so the backend can prioritize work for it
+  React.useEffect(() => {
+    onVisibleProjectsChange?.(
+      paginatedProjects.map((p) => p.id),
+      Array.from(favorites)
+    )
+  }, [paginatedProjects, favorites, onVisibleProjectsChange])
+
   // Split paginated projects into favorites, non-favorites, and archived for grid view
   const { favoriteProjects, nonFavoriteProjects, archivedProjectsList } = React.useMemo(() => {
     const favSet = new Set(favorites)
@@ -376,6 +390,7 @@ export function DashboardContent({
         <RefreshButton
           onRefresh={onRefresh}
           onRefreshComplete={handleRefreshComplete}
+          progress={refreshProgress}
           label="Scan for Projects"
           loadingLabel="Scanning..."
         />
@@ -534,6 +549,7 @@ export function DashboardContent({
                 size="sm"
                 onRefresh={onRefresh}
                 onRefreshComplete={handleRefreshComplete}
+                progress={refreshProgress}
               />
             </div>
           </div>
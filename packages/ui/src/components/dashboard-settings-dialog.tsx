@@ -35,6 +35,7 @@ export function DashboardSettingsDialog({ open, onOpenChange }: DashboardSetting
   const [savedPath, setSavedPath] = React.useState('')
   const [pathSaving, setPathSaving] = React.useState(false)
   const [pathSaved, setPathSaved] = React.useState(false)
+  const [configError, setConfigError] = React.useState<string | null>(null)
 
   // Avoid hydration mismatch by only rendering after mount
   React.useEffect(() => {
@@ -49,6 +50,7 @@ export function DashboardSettingsDialog({ open, onOpenChange }: DashboardSetting
         setSavedPath(appSettings.projectsPath)
         setPathSaved(false)
       })
+      dataProvider.getConfigError?.().then(setConfigError)
     }
   }, [open, mounted, dataProvider])
 
@@ -57,8 +59,11 @@ export function DashboardSettingsDialog({ open, onOpenChange }: DashboardSetting
     try {
       const updated = await dataProvider.updateAppSettings({ projectsPath })
       setSavedPath(updated.projectsPath)
+      setConfigError(null)
       setPathSaved(true)
       setTimeout(() => setPathSaved(false), 2000)
+    } catch (err) {
+      setConfigError(err instanceof Error ? err.message : String(err))
     } finally {
       setPathSaving(false)
     }
@@ -185,6 +190,9 @@ export function DashboardSettingsDialog({ open, onOpenChange }: DashboardSetting
                 )}
               </Button>
             </div>
+            {configError && (
+              <p className="text-sm text-destructive">{configError}</p>
+            )}
           </div>
 
           <Separator />
@@ -10,7 +10,32 @@ import "highlight.js/styles/github-dark.css"
 export interface MarkdownRendererProps
   extends React.HTMLAttributes<HTMLDivElement> {
   /** The markdown content to render */
-  content: string
+  content?: string
+  /**
+   * Pre-rendered, already sanitized HTML to inject instead of rendering
+   * `content` in the browser
+   */
+  html?: string
+}
+
+/**
+ * Prefix the backend's sanitizer gives ids in rendered HTML, so README ids
+ * cannot clash with the app's.
+ */
+const USER_CONTENT_ID_PREFIX = "user-content-"
+
+/**
+ * Scrolls to the target of an in-page link (e.g. a footnote) inside
+ * backend-rendered HTML instead of opening it in a new window.
+ */
+function handleInPageLink(event: React.MouseEvent<HTMLDivElement>) {
+  const href = (event.target as Element).closest("a")?.getAttribute("href")
+  if (!href?.startsWith("#")) return
+  event.preventDefault()
+  const id = USER_CONTENT_ID_PREFIX + decodeURIComponent(href.slice(1))
+  event.currentTarget
+    .querySelector(`[id="${CSS.escape(id)}"]`)
+    ?.scrollIntoView({ behavior: "smooth" })
 }
 
 /**
@@ -30,28 +55,44 @@ export interface MarkdownRendererProps
  *
  * // With custom className
  * <MarkdownRenderer content={markdown} className="max-w-4xl" />
+ *
+ * // With HTML rendered by the backend
+ * <MarkdownRenderer html={readmeHtml} />
  * ```
  */
 const MarkdownRenderer = React.forwardRef<HTMLDivElement, MarkdownRendererProps>(
-  ({ className, content, ...props }, ref) => {
+  ({ className, content = "", html, onClick, ...props }, ref) => {
+    const proseClassName = cn(
+      "prose prose-slate dark:prose-invert max-w-none",
+      "prose-headings:font-semibold prose-headings:tracking-tight",
+      "prose-h1:text-3xl prose-h2:text-2xl prose-h3:text-xl",
+      "prose-a:text-primary prose-a:no-underline hover:prose-a:underline",
+      "prose-code:text-sm prose-code:bg-muted prose-code:px-1.5 prose-code:py-0.5 prose-code:rounded prose-code:before:content-none prose-code:after:content-none",
+      "prose-pre:bg-muted prose-pre:border prose-pre:border-border",
+      "prose-img:rounded-lg prose-img:shadow-md",
+      "prose-table:border-collapse prose-table:border prose-table:border-border",
+      "prose-th:border prose-th:border-border prose-th:bg-muted prose-th:px-4 prose-th:py-2",
+      "prose-td:border prose-td:border-border prose-td:px-4 prose-td:py-2",
+      className
+    )
+
+    if (html !== undefined) {
+      return (
+        <div
+          ref={ref}
+          className={proseClassName}
+          {...props}
+          onClick={(event) => {
+            handleInPageLink(event)
+            onClick?.(event)
+          }}
+          dangerouslySetInnerHTML={{ __html: html }}
+        />
+      )
+    }
+
     return (
-      <div
-        ref={ref}
-        className={cn(
-          "prose prose-slate dark:prose-invert max-w-none",
-          "prose-headings:font-semibold prose-headings:tracking-tight",
-          "prose-h1:text-3xl prose-h2:text-2xl prose-h3:text-xl",
-          "prose-a:text-primary prose-a:no-underline hover:prose-a:underline",
-          "prose-code:text-sm prose-code:bg-muted prose-code:px-1.5 prose-code:py-0.5 prose-code:rounded prose-code:before:content-none prose-code:after:content-none",
-          "prose-pre:bg-muted prose-pre:border prose-pre:border-border",
-          "prose-img:rounded-lg prose-img:shadow-md",
-          "prose-table:border-collapse prose-table:border prose-table:border-border",
-          "prose-th:border prose-th:border-border prose-th:bg-muted prose-th:px-4 prose-th:py-2",
-          "prose-td:border prose-td:border-border prose-td:px-4 prose-td:py-2",
-          className
-        )}
-        {...props}
-      >
+      <div ref={ref} className={proseClassName} onClick={onClick} {...props}>
         <ReactMarkdown
           remarkPlugins={[remarkGfm]}
           rehypePlugins={[rehypeHighlight]}
@@ -240,6 +240,11 @@ const ProjectCard = React.forwardRef<HTMLDivElement, ProjectCardProps>(
                         {project.gitInfo.uncommittedChanges} changes
                       </span>
                     )}
+                    {project.gitInfo.partial && (
+                      <span className="italic" title="Git status is still being read">
+                        checking…
+                      </span>
+                    )}
                   </div>
                 )}
                 {!project.gitInfo && (
@@ -363,6 +368,11 @@ const ProjectCard = React.forwardRef<HTMLDivElement, ProjectCardProps>(
                     {project.gitInfo.uncommittedChanges} changes
                   </span>
                 )}
+                {project.gitInfo?.partial && (
+                  <span className="italic" title="Git status is still being read">
+                    checking…
+                  </span>
+                )}
                 <div className="flex items-center gap-1.5">
                   {project.hasPackageJson && (
                     <span title="Has package.json" aria-label="Has package.json">
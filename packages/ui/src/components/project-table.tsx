@@ -316,6 +316,10 @@ const ProjectTable = React.forwardRef<HTMLDivElement, ProjectTableProps>(
                         <span className="inline-flex items-center justify-center min-w-[24px] px-1.5 py-0.5 text-xs font-medium rounded-full bg-amber-100 text-amber-800 dark:bg-amber-900/50 dark:text-amber-200">
                           {project.gitInfo.uncommittedChanges}
                         </span>
+                      ) : project.gitInfo?.partial ? (
+                        <span className="text-xs italic text-muted-foreground" title="Git status is still being read">
+                          …
+                        </span>
                       ) : project.gitInfo ? (
                         <span className="text-xs text-muted-foreground">—</span>
                       ) : (
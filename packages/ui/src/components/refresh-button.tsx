@@ -7,6 +7,14 @@ import type { RefreshResult } from "@organizeme/shared/types/data-provider"
 
 export type { RefreshResult }
 
+/**
+ * Progress of a scan, counted in repositories.
+ */
+export interface RefreshProgress {
+  done: number
+  total: number
+}
+
 /**
  * Spinner icon for loading state.
  * Uses CSS animation for smooth rotation.
@@ -76,6 +84,8 @@ export interface RefreshButtonProps
   label?: string
   /** Label to show while loading (defaults to "Refreshing...") */
   loadingLabel?: string
+  /** Progress of a running scan; while set, the button shows counts and stays disabled */
+  progress?: RefreshProgress | null
 }
 
 /**
@@ -115,12 +125,18 @@ function RefreshButton({
   onRefreshStart,
   onRefreshComplete,
   onRefreshError,
+  progress,
   ...props
 }: RefreshButtonProps) {
   const [isLoading, setIsLoading] = React.useState(false)
+  const isBusy = isLoading || progress != null
+  const busyLabel =
+    progress != null && progress.total > 0
+      ? `${loadingLabel} ${progress.done}/${progress.total}`
+      : loadingLabel
 
   const handleRefresh = React.useCallback(async () => {
-    if (isLoading) return
+    if (isBusy) return
 
     setIsLoading(true)
     onRefreshStart?.()
@@ -139,7 +155,7 @@ function RefreshButton({
     } finally {
       setIsLoading(false)
     }
-  }, [isLoading, onRefresh, onRefreshStart, onRefreshComplete, onRefreshError])
+  }, [isBusy, onRefresh, onRefreshStart, onRefreshComplete, onRefreshError])
 
   return (
     <Button
@@ -147,18 +163,18 @@ function RefreshButton({
       variant={variant}
       size={size}
       onClick={handleRefresh}
-      disabled={isLoading}
-      aria-busy={isLoading}
+      disabled={isBusy}
+      aria-busy={isBusy}
       {...props}
     >
       {showIcon && (
-        isLoading ? (
+        isBusy ? (
           <Spinner className="h-4 w-4" />
         ) : (
           <RefreshIcon className="h-4 w-4" />
         )
       )}
-      <span>{isLoading ? loadingLabel : label}</span>
+      <span>{isBusy ? busyLabel : label}</span>
     </Button>
   )
 }